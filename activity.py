@@ -0,0 +1,83 @@
+# activity.py - Niveau de simulation de chaque salle (LOD) selon les portes et la position du joueur
+from collections import deque
+import numpy as np
+
+# Niveaux d'activité d'une salle
+SUSPENDED = 0  # Salle verrouillée : ennemis figés
+REDUCED = 1    # Salle ouverte mais loin du joueur : un tick sur `far_interval`
+FULL = 2       # Salle du joueur et salles voisines : chaque tick
+
+
+class RoomActivity:
+    """Décide quelles salles sont simulées à chaque tick.
+    Les niveaux ne sont recalculés que si le joueur change de salle ou si l'état
+    de verrouillage des salles change (unlock_room, restart) : les ennemis d'une
+    salle se réveillent donc au tick qui suit son déverrouillage, sans dépendre
+    du temps réel. Le tour des salles lointaines suit l'horloge de simulation
+    (clock.ticks) : il ne dépend pas du moment où l'objet a été créé."""
+    def __init__(self, world, clock, near_hops=1, far_interval=4):
+        self.world = world
+        self.clock = clock
+        self.near_hops = near_hops        # Salles à au plus N portes ouvertes du joueur : pleine vitesse
+        self.far_interval = far_interval  # Les autres salles ouvertes tournent un tick sur N
+        self.levels = np.full(len(world.room_names), SUSPENDED, dtype=np.uint8)
+        self.player_rooms = None
+        self.unlocked = None
+        # Décalage de phase par salle : les salles lointaines ne tournent pas toutes au même tick
+        self.phase = np.arange(len(world.room_names)) % far_interval
+
+    def update(self, player_x, player_y):
+        """Retourne le masque (un booléen par salle) des salles à simuler au tick courant"""
+        rooms = self.rooms_at(player_x, player_y)
+        unlocked = tuple(room["unlocked"] for room in self.world.rooms.values())
+        if rooms != self.player_rooms or unlocked != self.unlocked:
+            self.player_rooms = rooms
+            self.unlocked = unlocked
+            self.compute_levels()
+
+        active = (self.levels == FULL) | ((self.levels == REDUCED) &
+                                          (self.phase == self.clock.ticks % self.far_interval))
+        return active
+
+    def rooms_at(self, x, y):
+        """Salles occupées par le joueur : la sienne, ou les deux salles du couloir où il se trouve"""
+        world = self.world
+        index = world.get_room_index(x, y)
+        if index >= 0:
+            return (index,)
+        door = world.get_door_at(x, y)
+        if door is not None:
+            return (world.room_names.index(door["from"]), world.room_names.index(door["to"]))
+        return ()
+
+    def compute_levels(self):
+        """Distance en portes ouvertes depuis la salle du joueur, puis niveau de chaque salle"""
+        world = self.world
+        names = world.room_names
+        neighbors = [[] for _ in names]
+        for door in world.doors:
+            if door["open"]:
+                a = names.index(door["from"])
+                b = names.index(door["to"])
+                neighbors[a].append(b)
+                neighbors[b].append(a)
+
+        hops = [None] * len(names)
+        queue = deque()
+        for room in self.player_rooms:
+            hops[room] = 0
+            queue.append(room)
+        while queue:
+            room = queue.popleft()
+            for other in neighbors[room]:
+                if hops[other] is None:
+                    hops[other] = hops[room] + 1
+                    queue.append(other)
+
+        for index, name in enumerate(names):
+            if not world.rooms[name]["unlocked"] and hops[index] != 0:
+                self.levels[index] = SUSPENDED
+            elif hops[index] is not None and hops[index] <= self.near_hops:
+                self.levels[index] = FULL
+            else:
+                self.levels[index] = REDUCED
@@ -0,0 +1,505 @@
+# benchmark.py - Mesures de performance du jeu (sans fenêtre visible)
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import gc
+import logging
+import math
+import time
+import random
+import pygame
+import numpy as np
+from world import World
+from player import Player
+from enemy import Enemy, EnemyStore
+from pathfinding import FlowField
+from activity import RoomActivity
+from boss import Boss, BossProjectile
+from player import PlayerProjectile
+from projectiles import ProjectileEngine, BULLET, BOSS, ARROW, TRAIL_LENGTH
+from particles import ParticleSystem
+from timing import SimClock
+from eventlog import setup
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900
+
+
+class BenchCamera:
+    """Caméra minimale : seule la position compte pour le rendu"""
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+def bench_render_world(frames=300):
+    """Temps moyen de World.draw_world, caméra en mouvement au-dessus de la salle 1"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    world = World()
+    world.unlock_room("room1")
+    camera = BenchCamera(600, 400)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        camera.x = 600 + (frame % 64)
+        world.draw_world(screen, camera)
+    elapsed = time.perf_counter() - start
+
+    return {"frames": frames, "ms_per_frame": elapsed / frames * 1000}
+
+
+def bench_chasers(count, use_flow_field, frames=60):
+    """Coût du déplacement de `count` poursuivants autour du joueur dans la grande salle
+    (sans collisions entre ennemis, pour isoler le coût du pathfinding)"""
+    clock = SimClock()
+    world = World()
+    world.unlock_room("big")
+    room = world.rooms["big"]
+    player = Player((room["x"] + room["w"] // 2) * world.tile_size,
+                    (room["y"] + room["h"] // 2) * world.tile_size, clock)
+    flow_field = FlowField(world) if use_flow_field else None
+
+    rng = random.Random(42)
+    store = EnemyStore(clock, random.Random(0), count)
+    enemies = []
+    while len(enemies) < count:
+        x = player.x + rng.uniform(-190, 190)
+        y = player.y + rng.uniform(-190, 190)
+        if not world.rect_hits_wall(x, y, 24, 24):
+            enemies.append(Enemy(x, y, "normal", store))
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Le joueur tourne en rond : le champ est recalculé à chaque changement de tuile
+        player.x += 4 if (frame // 15) % 2 == 0 else -4
+        if flow_field is not None:
+            flow_field.update(player.x + player.width/2, player.y + player.height/2)
+        for enemy in enemies:
+            enemy.follow_behavior(player, world, (), flow_field)
+    elapsed = time.perf_counter() - start
+
+    return {"chasers": count, "flow_field": use_flow_field,
+            "ms_per_frame": elapsed / frames * 1000,
+            "us_per_chaser": elapsed / frames / count * 1e6,
+            "rebuilds": flow_field.rebuild_count if flow_field else 0}
+
+
+def bench_enemy_ai(count, batched, frames=60):
+    """Coût d'une frame d'IA pour `count` ennemis de tous types dans la grande salle :
+    EnemyStore.update (passes vectorisées) contre Enemy.update un par un"""
+    clock = SimClock()
+    engine = ProjectileEngine(clock)
+    world = World()
+    world.unlock_room("big")
+    room = world.rooms["big"]
+    player = Player((room["x"] + room["w"] // 2) * world.tile_size,
+                    (room["y"] + room["h"] // 2) * world.tile_size, clock)
+    player.take_damage = lambda damage: None  # Le joueur ne doit pas mourir pendant la mesure
+    flow_field = FlowField(world)
+
+    rng = random.Random(42)
+    store = EnemyStore(clock, random.Random(0), count)
+    enemies = []
+    while len(enemies) < count:
+        x = player.x + rng.uniform(-300, 300)
+        y = player.y + rng.uniform(-300, 300)
+        if not world.rect_hits_wall(x, y, 24, 24):
+            enemies.append(Enemy(x, y, rng.choice(("normal", "patrol", "stationary")), store))
+    projectiles = engine.group(BULLET)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        clock.tick()  # Délais et durées de vie en temps de simulation
+        player.x += 4 if (frame // 15) % 2 == 0 else -4
+        flow_field.update(player.x + player.width/2, player.y + player.height/2)
+        if batched:
+            store.update(player, world, projectiles, flow_field)
+        else:
+            for enemy in enemies:
+                enemy.update(player, world, enemies, projectiles, flow_field)
+        engine.clear()
+    elapsed = time.perf_counter() - start
+
+    return {"enemies": count, "batched": batched, "ms_per_frame": elapsed / frames * 1000}
+
+
+def bench_enemy_scaling(count, frames=30):
+    """Coût d'un update de l'EnemyStore quand la population grandit à densité bornée :
+    ennemis de tous types répartis sur des tuiles libres de toute la carte"""
+    world = World()
+    for room_name in world.rooms:
+        world.unlock_room(room_name)
+    room = world.rooms["big"]
+    clock = SimClock()
+    engine = ProjectileEngine(clock)
+    player = Player((room["x"] + room["w"] // 2) * world.tile_size,
+                    (room["y"] + room["h"] // 2) * world.tile_size, clock)
+    player.take_damage = lambda damage: None
+    flow_field = FlowField(world)
+
+    rng = random.Random(42)
+    free_y, free_x = (world.map == 0).nonzero()
+    tiles = rng.sample(range(len(free_x)), min(count, len(free_x)))
+    store = EnemyStore(clock, random.Random(0), len(tiles))
+    for tile in tiles:
+        Enemy(free_x[tile] * world.tile_size + 4, free_y[tile] * world.tile_size + 4,
+              rng.choice(("normal", "patrol", "stationary")), store)
+    projectiles = engine.group(BULLET)
+
+    store.update(player, world, projectiles, flow_field)  # Remplissage initial de la grille
+    start = time.perf_counter()
+    for frame in range(frames):
+        clock.tick()
+        player.x += 4 if (frame // 15) % 2 == 0 else -4
+        flow_field.update(player.x + player.width/2, player.y + player.height/2)
+        store.update(player, world, projectiles, flow_field)
+        engine.clear()
+    elapsed = time.perf_counter() - start
+
+    return {"enemies": store.count, "ms_per_frame": elapsed / frames * 1000,
+            "us_per_enemy": elapsed / frames / store.count * 1e6}
+
+
+def bench_room_activity(count, use_activity, frames=60):
+    """Ennemis répartis sur toute la carte, début de partie (spawn et room1 ouvertes) :
+    coût d'un tick avec ou sans mise en sommeil des salles verrouillées ou lointaines"""
+    clock = SimClock()
+    engine = ProjectileEngine(clock)
+    world = World()
+    world.unlock_room("room1")
+    player = Player(*world.level.player_spawn, clock)
+    player.take_damage = lambda damage: None
+    flow_field = FlowField(world)
+    activity = RoomActivity(world, clock)
+
+    # Placement sur les tuiles libres de toutes les salles, verrouillées comprises
+    rng = random.Random(42)
+    free_y, free_x = ((world.room_grid >= 0) & (world.map == 0)).nonzero()
+    tiles = rng.sample(range(len(free_x)), min(count, len(free_x)))
+    store = EnemyStore(clock, random.Random(0), len(tiles))
+    for tile in tiles:
+        Enemy(free_x[tile] * world.tile_size + 4, free_y[tile] * world.tile_size + 4,
+              rng.choice(("normal", "patrol", "stationary")), store)
+    projectiles = engine.group(BULLET)
+
+    store.update(player, world, projectiles, flow_field)
+    start = time.perf_counter()
+    for frame in range(frames):
+        clock.tick()
+        player.x += 2 if (frame // 15) % 2 == 0 else -2
+        flow_field.update(player.x + player.width/2, player.y + player.height/2)
+        active_rooms = activity.update(player.x, player.y) if use_activity else None
+        store.update(player, world, projectiles, flow_field, active_rooms)
+        engine.clear()
+    elapsed = time.perf_counter() - start
+
+    return {"enemies": store.count, "activity": use_activity, "ms_per_frame": elapsed / frames * 1000}
+
+
+def bench_boss_bursts(frames=1200, burst_every=30):
+    """Ondes de choc du boss principal (48 projectiles par salve) en continu :
+    allocations de projectiles et passes du GC une fois la réserve chauffée"""
+    world = World()
+    world.unlock_room("boss")
+    room = world.rooms["boss"]
+    center_x = (room["x"] + room["w"] // 2) * world.tile_size
+    center_y = (room["y"] + room["h"] // 2) * world.tile_size
+    clock = SimClock()
+    boss = Boss(center_x - 32, center_y - 32, clock, random.Random(0), "main", world)
+    player = Player(center_x + 100, center_y, clock)
+
+    engine = ProjectileEngine(clock)
+    boss_projectiles = engine.group(BOSS)
+
+    def run(frames):
+        for frame in range(frames):
+            clock.tick()
+            if frame % burst_every == 0:
+                boss.main_boss_special(player, boss_projectiles)
+            engine.update(player, world)
+
+    run(frames)  # Chauffe : les cases et leurs vues existent ensuite
+    allocations = engine.allocations
+    collections = gc.get_stats()[0]["collections"]
+    start = time.perf_counter()
+    run(frames)
+    elapsed = time.perf_counter() - start
+
+    return {"frames": frames, "ms_per_frame": elapsed / frames * 1000,
+            "allocations": engine.allocations - allocations,
+            "gc_gen0": gc.get_stats()[0]["collections"] - collections,
+            "live": len(boss_projectiles)}
+
+
+def bench_bullet_hell(count=5000, frames=120):
+    """Au moins `count` projectiles de boss en vol dans la grande salle (anneaux tirés
+    depuis le centre, complétés à chaque frame) : coût de l'update et du test joueur"""
+    world = World()
+    world.unlock_room("big")
+    room = world.rooms["big"]
+    center_x = (room["x"] + room["w"] // 2) * world.tile_size
+    center_y = (room["y"] + room["h"] // 2) * world.tile_size
+    clock = SimClock()
+    player = Player(center_x + 150, center_y + 40, clock)
+    rng = random.Random(42)
+
+    engine = ProjectileEngine(clock, 2 * count)
+    bullets = engine.group(BOSS)
+
+    def top_up():
+        while engine.live < count:
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(60, 180)
+            BossProjectile.spawn(engine, center_x + rng.uniform(-200, 200), center_y + rng.uniform(-150, 150),
+                                 math.cos(angle) * speed, math.sin(angle) * speed,
+                                 rng.choice(("boss_normal", "boss_secret", "explosive")))
+
+    top_up()
+    engine.update(player, world)  # Chauffe : vues créées pour toutes les cases
+    top_up()
+    allocations = engine.allocations
+    live = 0
+    start = time.perf_counter()
+    for frame in range(frames):
+        clock.tick()
+        top_up()
+        engine.update(player, world)
+        engine.overlapping(BOSS, player.rect)
+        live += engine.live
+    elapsed = time.perf_counter() - start
+
+    return {"bullets": live // frames, "ms_per_frame": elapsed / frames * 1000,
+            "allocations": engine.allocations - allocations, "group": len(bullets)}
+
+
+def bench_arrow_hits(arrows, enemies, frames=60):
+    """Débit des collisions flèches × ennemis : `enemies` ennemis répartis sur la carte,
+    `arrows` flèches en vol (renouvelées au fil des impacts) tirées depuis des ennemis au hasard"""
+    world = World()
+    for room_name in world.rooms:
+        world.unlock_room(room_name)
+    clock = SimClock()
+    player = Player(*world.level.player_spawn, clock)
+    rng = random.Random(42)
+
+    free_y, free_x = (world.map == 0).nonzero()
+    tiles = rng.sample(range(len(free_x)), min(enemies, len(free_x)))
+    store = EnemyStore(clock, random.Random(0), len(tiles))
+    for tile in tiles:
+        enemy = Enemy(free_x[tile] * world.tile_size + 4, free_y[tile] * world.tile_size + 4, "normal", store)
+        enemy.hp = enemy.max_hp = 10**9  # Les cibles ne meurent pas : charge constante
+    store.sync_grid()
+
+    engine = ProjectileEngine(clock, 2 * arrows)
+
+    def top_up():
+        while len(engine.group(ARROW)) < arrows:
+            source = store.enemies[rng.randrange(store.count)]
+            angle = rng.uniform(0, 2 * math.pi)
+            PlayerProjectile.spawn(engine, source.x + rng.uniform(-60, 60), source.y + rng.uniform(-60, 60),
+                                   math.cos(angle), math.sin(angle), 1, 400)
+
+    pairs = 0
+    elapsed = 0.0
+    for frame in range(frames):
+        clock.tick()
+        top_up()
+        pairs += engine.live * store.count
+        start = time.perf_counter()
+        engine.update(player, world, store)
+        elapsed += time.perf_counter() - start
+    # Chaque flèche inflige 1 dégât : les dégâts cumulés comptent les impacts
+    hits = int(np.sum(10**9 - store.hp[:store.count]))
+    return {"arrows": arrows, "enemies": store.count, "ms_per_frame": elapsed / frames * 1000,
+            "pairs_per_second": pairs / elapsed, "hits": hits}
+
+
+def bench_fast_movers(step, count=2000):
+    """Boîtes de 8 px qui avancent de `step` px par tick : murs sautés par le test
+    de destination seul, et coût du balayage (World.sweep_box) par déplacement"""
+    world = World()
+    rng = random.Random(7)
+    free_y, free_x = (world.map == 0).nonzero()
+    moves = []
+    for _ in range(count):
+        tile = rng.randrange(len(free_x))
+        angle = rng.uniform(0, 2 * math.pi)
+        moves.append((free_x[tile] * world.tile_size + 12.0, free_y[tile] * world.tile_size + 12.0,
+                      math.cos(angle) * step, math.sin(angle) * step))
+
+    start = time.perf_counter()
+    swept = [world.sweep_box(x, y, 8, 8, dx, dy) is not None for x, y, dx, dy in moves]
+    sweep_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sampled = [world.rect_hits_wall(x + dx, y + dy, 8, 8) for x, y, dx, dy in moves]
+    sample_time = time.perf_counter() - start
+
+    tunneled = sum(1 for hit, seen in zip(swept, sampled) if hit and not seen)
+    return {"step": step, "moves": count, "wall_hits": sum(swept), "tunneled": tunneled,
+            "us_sweep": sweep_time / count * 1e6, "us_sample": sample_time / count * 1e6}
+
+
+def bench_particles(count, batched, frames=120):
+    """Mise à jour + dessin de `count` particules en vie (renouvelées au fil des expirations).
+    batched=False rejoue l'ancienne version : dicts filtrés à chaque frame et une Surface
+    créée par particule et par frame pour régler l'alpha"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(42)
+    colors = ((255, 0, 0), (150, 0, 150), (255, 100, 0))
+    now = 1000.0
+    particles = ParticleSystem(capacity=count) if batched else []
+
+    def emit():
+        x = rng.uniform(0, SCREEN_WIDTH)
+        y = rng.uniform(0, SCREEN_HEIGHT)
+        velocity = (rng.uniform(-20, 20), rng.uniform(-20, 20))
+        lifetime = rng.uniform(1.0, 2.0)
+        color = rng.choice(colors)
+        size = rng.randint(2, 4)
+        if batched:
+            particles.emit(x, y, velocity[0], velocity[1], lifetime, now, color, size)
+        else:
+            particles.append({"x": x, "y": y, "velocity_x": velocity[0], "velocity_y": velocity[1],
+                              "lifetime": lifetime, "creation_time": now, "color": color, "size": size})
+
+    surfaces = 0
+    elapsed = 0.0
+    for frame in range(frames):
+        now += 1 / 60
+        while len(particles) < count:
+            emit()
+        start = time.perf_counter()
+        if batched:
+            particles.update(now)
+            particles.draw(screen, 0, 0, now)
+        else:
+            particles = [p for p in particles if now - p["creation_time"] < p["lifetime"]]
+            for particle in particles:
+                particle["x"] += particle["velocity_x"] / 60
+                particle["y"] += particle["velocity_y"] / 60
+            for particle in particles:
+                alpha = int(255 * (1 - (now - particle["creation_time"]) / particle["lifetime"]))
+                if alpha > 0:
+                    surface = pygame.Surface((particle["size"], particle["size"]))
+                    surface.set_alpha(alpha)
+                    surface.fill(particle["color"])
+                    screen.blit(surface, (particle["x"], particle["y"]))
+                    surfaces += 1
+        elapsed += time.perf_counter() - start
+    if batched:
+        surfaces = particles.sprites_built
+    return {"particles": count, "ms_per_frame": elapsed / frames * 1000, "surfaces": surfaces}
+
+
+def bench_boss_trails(count, batched, frames=60):
+    """Dessin de `count` projectiles du boss secret avec traînée complète.
+    batched=False rejoue l'ancien dessin : une Surface 4x4 par point de traînée et par frame"""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    world = World()
+    world.unlock_room("big")
+    room = world.rooms["big"]
+    center_x = (room["x"] + room["w"] // 2) * world.tile_size
+    center_y = (room["y"] + room["h"] // 2) * world.tile_size
+    clock = SimClock()
+    player = Player(center_x, center_y, clock)
+    camera = BenchCamera(center_x - SCREEN_WIDTH // 2, center_y - SCREEN_HEIGHT // 2)
+    rng = random.Random(42)
+
+    engine = ProjectileEngine(clock, 2 * count)
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        BossProjectile.spawn(engine, center_x + rng.uniform(-300, 300), center_y + rng.uniform(-200, 200),
+                             math.cos(angle) * 30, math.sin(angle) * 30, "boss_secret")
+    for _ in range(TRAIL_LENGTH):
+        engine.update(player, world)
+    bullets = engine.group(BOSS)
+
+    surfaces = 0
+    gc.collect()
+    gc_start = gc.get_stats()[0]["collections"]
+    start = time.perf_counter()
+    for frame in range(frames):
+        if batched:
+            BossProjectile.draw_trails(engine, screen, camera.x, camera.y)
+        else:
+            for projectile in bullets:
+                trail = projectile.trail
+                for i, (trail_x, trail_y) in enumerate(trail):
+                    trail_surface = pygame.Surface((4, 4))
+                    trail_surface.set_alpha(int(255 * (i / len(trail))))
+                    trail_surface.fill(projectile.color)
+                    screen.blit(trail_surface, (trail_x - camera.x, trail_y - camera.y))
+                    surfaces += 1
+    elapsed = time.perf_counter() - start
+    return {"bullets": len(bullets), "ms_per_frame": elapsed / frames * 1000,
+            "surfaces_per_frame": surfaces / frames,
+            "gc_gen0": gc.get_stats()[0]["collections"] - gc_start}
+
+
+def main():
+    setup(logging.WARNING)
+    pygame.init()
+    result = bench_render_world()
+    print(f"render_world: {result['ms_per_frame']:.3f} ms/frame ({result['frames']} frames)")
+
+    for count in (100, 1000, 5000):
+        for use_flow_field in (False, True):
+            result = bench_chasers(count, use_flow_field)
+            label = "flow field" if use_flow_field else "ligne droite"
+            print(f"chasers x{count} ({label}): {result['ms_per_frame']:.2f} ms/frame, "
+                  f"{result['us_per_chaser']:.2f} us/ennemi, {result['rebuilds']} recalculs")
+
+    for count in (100, 500):
+        for batched in (False, True):
+            result = bench_enemy_ai(count, batched)
+            label = "EnemyStore" if batched else "un par un"
+            print(f"enemy_ai x{count} ({label}): {result['ms_per_frame']:.2f} ms/frame")
+
+    for count in (250, 1000, 2500):
+        result = bench_enemy_scaling(count)
+        print(f"enemy_scaling x{result['enemies']}: {result['ms_per_frame']:.2f} ms/frame, "
+              f"{result['us_per_enemy']:.2f} us/ennemi")
+
+    for use_activity in (False, True):
+        result = bench_room_activity(2500, use_activity)
+        label = "salles actives" if use_activity else "toutes les salles"
+        print(f"room_activity x{result['enemies']} ({label}): {result['ms_per_frame']:.2f} ms/frame")
+
+    result = bench_boss_bursts()
+    print(f"boss_bursts: {result['ms_per_frame']:.2f} ms/frame, {result['allocations']} allocations, "
+          f"{result['gc_gen0']} passes GC, {result['live']} projectiles en vol")
+
+    for arrows, enemies in ((64, 100), (512, 1000), (2048, 2500)):
+        result = bench_arrow_hits(arrows, enemies)
+        print(f"arrow_hits {arrows} flèches x {result['enemies']} ennemis: {result['ms_per_frame']:.2f} ms/frame, "
+              f"{result['pairs_per_second'] / 1e6:.0f} M paires/s, {result['hits']} impacts")
+
+    for count in (1000, 5000, 20000):
+        result = bench_bullet_hell(count)
+        print(f"bullet_hell x{result['bullets']}: {result['ms_per_frame']:.2f} ms/frame, "
+              f"{result['allocations']} allocations")
+
+    for count in (100, 500):
+        for batched in (False, True):
+            result = bench_boss_trails(count, batched)
+            label = "draw_trails" if batched else "Surface par point"
+            print(f"boss_trails x{result['bullets']} ({label}): {result['ms_per_frame']:.2f} ms/frame, "
+                  f"{result['surfaces_per_frame']:.0f} surfaces/frame, {result['gc_gen0']} passes GC")
+
+    for count in (200, 2000):
+        for batched in (False, True):
+            result = bench_particles(count, batched)
+            label = "ParticleSystem" if batched else "dicts + Surface"
+            print(f"particles x{count} ({label}): {result['ms_per_frame']:.2f} ms/frame, "
+                  f"{result['surfaces']} surfaces créées")
+
+    for step in (4, 16, 48, 96):
+        result = bench_fast_movers(step)
+        print(f"fast_movers {step} px/tick: {result['wall_hits']} murs touchés, "
+              f"{result['tunneled']} sautés par le test de destination, "
+              f"{result['us_sweep']:.2f} us/balayage ({result['us_sample']:.2f} us/test simple)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
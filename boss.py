@@ -1,97 +1,97 @@
 # boss.py - Système de boss corrigé avec contraintes de salle
 import pygame
 import math
-import time
-import random
+import numpy as np
+from projectiles import ProjectileView, BOSS, TRAIL_LENGTH
+from timing import FIXED_DT, NEVER
+from eventlog import get_logger
 
-class BossProjectile:
-    def __init__(self, x, y, velocity_x, velocity_y, projectile_type="normal"):
-        self.x = x
-        self.y = y
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
-        self.projectile_type = projectile_type
-        self.creation_time = time.time()
-        self.lifetime = 6.0  # 6 secondes de vie
-        
-        # Propriétés selon le type
-        if projectile_type == "boss_normal":
-            self.width = 12
-            self.height = 12
-            self.color = (255, 100, 0)  # Orange vif
-            self.damage = 20
-        elif projectile_type == "boss_secret":
-            self.width = 8
-            self.height = 8
-            self.color = (150, 0, 150)  # Violet
-            self.damage = 15
-        else:  # "explosive"
-            self.width = 16
-            self.height = 16
-            self.color = (255, 0, 0)  # Rouge
-            self.damage = 25
-        
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.trail = []  # Pour les traînées visuelles
+log = get_logger("boss")
+
+# Taille, couleur et dégâts selon le type de projectile de boss
+BOSS_PROJECTILE_TYPES = {
+    "boss_normal": (12, (255, 100, 0), 20),  # Orange vif
+    "boss_secret": (8, (150, 0, 150), 15),   # Violet
+    "explosive": (16, (255, 0, 0), 25),      # Rouge
+}
+BOSS_PROJECTILE_NAMES = list(BOSS_PROJECTILE_TYPES)
+TRAIL_STYLE = BOSS_PROJECTILE_NAMES.index("boss_secret")  # Seuls les tirs du boss secret ont une traînée
+TRAIL_SIZE = 4
+TRAIL_SPRITES = []  # Sprites pré-alphés, indexés par longueur * TRAIL_LENGTH + rang
+
+
+def trail_sprites():
+    """Le point de rang i d'une traînée de n points a l'alpha int(255 * i / n) :
+    un sprite par couple (n, i), créé une seule fois"""
+    if not TRAIL_SPRITES:
+        color = BOSS_PROJECTILE_TYPES["boss_secret"][1]
+        TRAIL_SPRITES.extend([None] * ((TRAIL_LENGTH + 1) * TRAIL_LENGTH))
+        for length in range(1, TRAIL_LENGTH + 1):
+            for rank in range(length):
+                sprite = pygame.Surface((TRAIL_SIZE, TRAIL_SIZE))
+                sprite.set_alpha(int(255 * (rank / length)))
+                sprite.fill(color)
+                TRAIL_SPRITES[length * TRAIL_LENGTH + rank] = sprite
+    return TRAIL_SPRITES
+
+
+class BossProjectile(ProjectileView):
+    """Projectile de boss ; garde une traînée de ses dernières positions"""
+    lifetime = 6.0  # 6 secondes de vie
     
-    def update(self, world):
-        current_time = time.time()
-        
-        # Vérifier durée de vie
-        if current_time - self.creation_time >= self.lifetime:
-            return False
-        
-        # Ajouter position actuelle à la traînée
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > 8:  # Limiter la traînée
-            self.trail.pop(0)
-        
-        # Déplacer le projectile
-        dt = 1/60
-        new_x = self.x + self.velocity_x * dt
-        new_y = self.y + self.velocity_y * dt
-        
-        # Vérifier collision avec les murs
-        if self.check_collision(new_x, new_y, world):
-            return False
-        
-        # Mettre à jour position
-        self.x = new_x
-        self.y = new_y
-        self.rect.x = int(self.x)
-        self.rect.y = int(self.y)
-        
-        return True
+    @classmethod
+    def spawn(cls, engine, x, y, velocity_x, velocity_y, projectile_type="normal"):
+        """Tire un projectile dans le moteur de projectiles de la partie"""
+        if projectile_type not in BOSS_PROJECTILE_TYPES:
+            projectile_type = "explosive"
+        size, color, damage = BOSS_PROJECTILE_TYPES[projectile_type]
+        return engine.add(cls, BOSS, x, y, velocity_x, velocity_y, size, size, cls.lifetime,
+                          damage=damage, style=BOSS_PROJECTILE_NAMES.index(projectile_type))
     
-    def check_collision(self, x, y, world):
-        corners = [(x, y), (x + self.width, y), 
-                  (x, y + self.height), (x + self.width, y + self.height)]
-        
-        for corner_x, corner_y in corners:
-            grid_x = int(corner_x // world.tile_size)
-            grid_y = int(corner_y // world.tile_size)
-            
-            if (0 <= grid_x < world.width and 0 <= grid_y < world.height and 
-                world.map[grid_y][grid_x] == 1):
-                return True
-        return False
+    @property
+    def projectile_type(self):
+        return BOSS_PROJECTILE_NAMES[self.engine.style[self.slot]]
+    
+    @property
+    def width(self):
+        return int(self.engine.width[self.slot])
+    
+    @property
+    def height(self):
+        return int(self.engine.height[self.slot])
+    
+    @property
+    def color(self):
+        return BOSS_PROJECTILE_TYPES[self.projectile_type][1]
+    
+    @property
+    def trail(self):
+        """Dernières positions, de la plus ancienne à la plus récente"""
+        _, _, points = self.engine.trail_points(np.array([self.slot]))
+        return [tuple(point) for point in points.tolist()]
+    
+    @classmethod
+    def draw_trails(cls, engine, screen, camera_x, camera_y):
+        """Dessine les traînées de tous les projectiles du boss secret de `engine` en un seul blits"""
+        n = engine.count
+        rows = np.flatnonzero(engine.alive[:n] & (engine.kind[:n] == BOSS) &
+                              (engine.style[:n] == TRAIL_STYLE) & (engine.trail_length[:n] > 0))
+        if len(rows) == 0:
+            return
+        rows = rows[np.argsort(engine.serial[rows], kind="stable")]
+        rank, length, points = engine.trail_points(rows)
+        sprites = trail_sprites()
+        keys = (length * TRAIL_LENGTH + rank).tolist()
+        # Itérateur plutôt que liste : aucun tuple (sprite, position) ne survit à son blit
+        xs = (points[:, 0] - camera_x).tolist()
+        ys = (points[:, 1] - camera_y).tolist()
+        screen.blits(zip(map(sprites.__getitem__, keys), zip(xs, ys)), doreturn=False)
     
     def draw(self, screen, camera_x, camera_y):
+        """Dessine le projectile (les traînées sont dessinées ensemble par draw_trails)"""
         screen_x = self.x - camera_x
         screen_y = self.y - camera_y
         
-        # Dessiner la traînée
-        if self.projectile_type == "boss_secret":
-            for i, (trail_x, trail_y) in enumerate(self.trail):
-                alpha = int(255 * (i / len(self.trail))) if self.trail else 0
-                trail_screen_x = trail_x - camera_x
-                trail_screen_y = trail_y - camera_y
-                
-                trail_surface = pygame.Surface((4, 4))
-                trail_surface.set_alpha(alpha)
-                trail_surface.fill(self.color)
-                screen.blit(trail_surface, (trail_screen_x, trail_screen_y))
-        
         # Dessiner le projectile principal
         if self.projectile_type == "boss_secret":
             # Losange pour boss secret
@@ -111,7 +111,9 @@ class BossProjectile:
 
 
 class Boss:
-    def __init__(self, x, y, boss_type="main", world=None):
+    def __init__(self, x, y, clock, rng, boss_type="main", world=None):
+        self.clock = clock  # Horloge de simulation de la partie
+        self.rng = rng      # Flux aléatoire des boss (Game.rng.bosses)
         self.x = x
         self.y = y
         self.start_x = x
@@ -146,18 +148,22 @@ class Boss:
         
         # Patterns d'attaque
         self.attack_pattern = 0
-        self.last_attack_time = 0
+        self.last_attack_time = NEVER
         self.attack_cooldown = 3.0
-        self.last_special_time = 0
+        self.last_special_time = NEVER
         self.special_cooldown = 8.0
         
         # Mouvement
         self.target_x = x
         self.target_y = y
-        self.movement_timer = 0
+        self.movement_timer = NEVER
+        
+        # Position au tick précédent, pour l'interpolation du rendu
+        self.previous_x = x
+        self.previous_y = y
         
         # Invulnérabilité
-        self.last_damage_time = 0
+        self.last_damage_time = NEVER
         self.damage_cooldown = 0.3
         
         # Effets visuels
@@ -167,36 +173,37 @@ class Boss:
         # Boss secret spécifique - COOLDOWN AUGMENTÉ
         if boss_type == "secret":
             self.teleport_cooldown = 8.0  # AUGMENTÉ: 5.0 → 8.0
-            self.last_teleport_time = 0
+            self.last_teleport_time = NEVER
             self.is_teleporting = False
             self.teleport_alpha = 255
     
+    def remember_position(self):
+        """Garde la position courante avant le tick suivant"""
+        self.previous_x = self.x
+        self.previous_y = self.y
+    
     def get_room_bounds(self):
         """Détermine les limites de la salle du boss"""
         if not self.world:
             return None
         
-        # Convertir position en tiles
-        boss_tile_x = int(self.start_x // self.world.tile_size)
-        boss_tile_y = int(self.start_y // self.world.tile_size)
-        
-        # Trouver la salle qui contient le boss
-        for room_name, room_data in self.world.rooms.items():
-            if (room_data["x"] <= boss_tile_x < room_data["x"] + room_data["w"] and
-                room_data["y"] <= boss_tile_y < room_data["y"] + room_data["h"]):
-                
-                # Convertir en coordonnées pixel avec marge de sécurité
-                bounds = {
-                    "min_x": (room_data["x"] + 1) * self.world.tile_size,
-                    "max_x": (room_data["x"] + room_data["w"] - 2) * self.world.tile_size,
-                    "min_y": (room_data["y"] + 1) * self.world.tile_size,
-                    "max_y": (room_data["y"] + room_data["h"] - 2) * self.world.tile_size,
-                    "room_name": room_name
-                }
-                print(f"Boss {self.boss_type} confiné dans {room_name}: {bounds}")
-                return bounds
-        
-        print(f"⚠️ ERREUR: Boss {self.boss_type} pas dans une salle identifiée!")
+        # Trouver la salle qui contient le boss (lecture directe de la grille des salles)
+        room_name = self.world.get_player_room(self.start_x, self.start_y)
+        if room_name is not None:
+            room_data = self.world.rooms[room_name]
+            
+            # Convertir en coordonnées pixel avec marge de sécurité
+            bounds = {
+                "min_x": (room_data["x"] + 1) * self.world.tile_size,
+                "max_x": (room_data["x"] + room_data["w"] - 2) * self.world.tile_size,
+                "min_y": (room_data["y"] + 1) * self.world.tile_size,
+                "max_y": (room_data["y"] + room_data["h"] - 2) * self.world.tile_size,
+                "room_name": room_name
+            }
+            log.info("Boss %s confiné dans %s : %s", self.boss_type, room_name, bounds)
+            return bounds
+        
+        log.warning("Boss %s pas dans une salle identifiée", self.boss_type)
         return None
     
     def is_in_room_bounds(self, x, y):
@@ -231,7 +238,7 @@ class Boss:
                      self.room_bounds["min_y"] <= player_y <= self.room_bounds["max_y"])
         
         if is_in_room:
-            print(f"🎯 Joueur détecté dans la salle {self.room_bounds['room_name']} - Boss {self.boss_type} activé!")
+            log.debug("Joueur détecté dans la salle %s - boss %s activé", self.room_bounds["room_name"], self.boss_type)
         
         return is_in_room
     
@@ -243,7 +250,7 @@ class Boss:
         if not self.is_player_in_same_room(player):
             return
         
-        current_time = time.time()
+        current_time = self.clock.now
         
         # Vérifier passage en phase 2
         if not self.is_enraged and self.hp < self.max_hp * 0.5:
@@ -271,11 +278,11 @@ class Boss:
         if self.boss_type == "secret":
             self.teleport_cooldown = 5.0  # Téléporte plus souvent en phase 2
         
-        print(f"{self.name} devient enragé !")
+        log.info("%s devient enragé !", self.name)
     
     def update_tank_movement(self, player, world):
         """Mouvement du boss principal (tank) - AVEC CONTRAINTES"""
-        current_time = time.time()
+        current_time = self.clock.now
         
         if current_time - self.movement_timer > 4.0:
             self.movement_timer = current_time
@@ -292,7 +299,7 @@ class Boss:
                 target_x = self.x - dx/distance * 60
                 target_y = self.y - dy/distance * 60
             else:  # Distance correcte, bouger autour
-                angle = random.random() * 2 * math.pi
+                angle = self.rng.random() * 2 * math.pi
                 target_x = player.x + math.cos(angle) * 100
                 target_y = player.y + math.sin(angle) * 100
             
@@ -357,12 +364,12 @@ class Boss:
     def teleport_near_player(self, player, world):
         """Téléporte le boss secret près du joueur - DANS SA SALLE SEULEMENT"""
         if not self.is_player_in_same_room(player):
-            print(f"❌ Téléportation annulée: joueur pas dans la salle du boss")
+            log.debug("Téléportation annulée : joueur pas dans la salle du boss")
             return
         
         for attempt in range(20):  # Plus de tentatives
-            angle = random.random() * 2 * math.pi
-            distance = random.randint(80, 120)
+            angle = self.rng.random() * 2 * math.pi
+            distance = self.rng.randint(80, 120)
             
             new_x = player.x + math.cos(angle) * distance
             new_y = player.y + math.sin(angle) * distance
@@ -378,10 +385,10 @@ class Boss:
                 # Effet de téléportation
                 self.is_teleporting = True
                 self.teleport_alpha = 100
-                print(f"✅ Boss secret téléporté en ({new_x:.0f}, {new_y:.0f})")
+                log.debug("Boss secret téléporté en (%.0f, %.0f)", new_x, new_y)
                 break
         else:
-            print(f"❌ Échec téléportation après 20 tentatives")
+            log.debug("Échec de la téléportation après 20 tentatives")
     
     def update_attacks(self, player, world, projectiles, current_time):
         """Gestion des attaques selon le type de boss - SEULEMENT si joueur dans la salle"""
@@ -424,7 +431,7 @@ class Boss:
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
             
-            projectile = BossProjectile(center_x, center_y, vel_x, vel_y, "boss_normal")
+            projectile = BossProjectile.spawn(projectiles.engine, center_x, center_y, vel_x, vel_y, "boss_normal")
             projectiles.append(projectile)
     
     def main_boss_special(self, player, projectiles):
@@ -442,10 +449,10 @@ class Boss:
                 vel_x = math.cos(angle) * radius_speed
                 vel_y = math.sin(angle) * radius_speed
                 
-                projectile = BossProjectile(center_x, center_y, vel_x, vel_y, "explosive")
+                projectile = BossProjectile.spawn(projectiles.engine, center_x, center_y, vel_x, vel_y, "explosive")
                 projectiles.append(projectile)
         
-        print(f"{self.name} lance une onde de choc !")
+        log.debug("%s lance une onde de choc !", self.name)
     
     def secret_boss_attack(self, player, projectiles):
         """Attaque normale du boss secret - Spirale"""
@@ -453,7 +460,7 @@ class Boss:
         center_y = self.y + self.height/2
         
         num_projectiles = 8 if not self.is_enraged else 12
-        spiral_offset = time.time() * 2  # Rotation de la spirale
+        spiral_offset = self.clock.now * 2  # Rotation de la spirale
         
         for i in range(num_projectiles):
             angle = (i * 2 * math.pi / num_projectiles) + spiral_offset
@@ -461,7 +468,7 @@ class Boss:
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
             
-            projectile = BossProjectile(center_x, center_y, vel_x, vel_y, "boss_secret")
+            projectile = BossProjectile.spawn(projectiles.engine, center_x, center_y, vel_x, vel_y, "boss_secret")
             projectiles.append(projectile)
     
     def secret_boss_special(self, player, projectiles):
@@ -489,14 +496,14 @@ class Boss:
             vel_x = math.cos(player_angle) * speed
             vel_y = math.sin(player_angle) * speed
             
-            projectile = BossProjectile(start_x, start_y, vel_x, vel_y, "boss_secret")
+            projectile = BossProjectile.spawn(projectiles.engine, start_x, start_y, vel_x, vel_y, "boss_secret")
             projectiles.append(projectile)
         
-        print(f"{self.name} lance un mur de projectiles !")
+        log.debug("%s lance un mur de projectiles !", self.name)
     
     def take_damage(self, damage):
         """Boss prend des dégâts"""
-        current_time = time.time()
+        current_time = self.clock.now
         if current_time - self.last_damage_time < self.damage_cooldown:
             return False
         
@@ -506,29 +513,19 @@ class Boss:
         if self.hp <= 0:
             self.hp = 0
             self.alive = False
-            print(f"{self.name} vaincu !")
+            log.info("%s vaincu !", self.name)
             return True
         
-        print(f"{self.name} : {self.hp}/{self.max_hp} HP")
+        log.debug("%s : %s/%s HP", self.name, self.hp, self.max_hp)
         return True
     
     def check_collision(self, x, y, world):
         """Vérification collision boss"""
-        corners = [(x, y), (x + self.width, y), 
-                  (x, y + self.height), (x + self.width, y + self.height)]
-        
-        for corner_x, corner_y in corners:
-            grid_x = int(corner_x // world.tile_size)
-            grid_y = int(corner_y // world.tile_size)
-            
-            if (0 <= grid_x < world.width and 0 <= grid_y < world.height and 
-                world.map[grid_y][grid_x] == 1):
-                return True
-        return False
+        return world.rect_hits_wall(x, y, self.width, self.height)
     
     def update_effects(self, current_time):
         """Met à jour les effets visuels"""
-        self.pulse_timer += 1/60
+        self.pulse_timer += FIXED_DT
         
         # Effet de téléportation pour boss secret
         if self.boss_type == "secret" and self.is_teleporting:
@@ -546,7 +543,7 @@ class Boss:
         
         # Couleur avec effets
         color = self.color
-        current_time = time.time()
+        current_time = self.clock.now
         
         # Effet de pulsation
         pulse = math.sin(self.pulse_timer * 4) * 0.3 + 0.7
@@ -0,0 +1,65 @@
+# controls.py - Sources d'entrées du joueur : clavier réel ou script (mode sans affichage)
+import pygame
+
+# Touches maintenues lues par la simulation (Player.update/dash, Game.update, coffres) :
+# seules celles-ci sont capturées à chaque tick et enregistrées dans les replays
+WATCHED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                pygame.K_q, pygame.K_d, pygame.K_z, pygame.K_s,
+                pygame.K_LSHIFT, pygame.K_SPACE, pygame.K_e, pygame.K_r)
+
+class InputFrame:
+    """Entrées d'un tick : touches maintenues (lues comme pygame.key.get_pressed(),
+    frame[pygame.K_q]) et touches appuyées pendant ce tick (équivalent des KEYDOWN)"""
+    __slots__ = ("held", "presses")
+
+    def __init__(self, held=(), presses=()):
+        self.held = frozenset(held)
+        self.presses = tuple(presses)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class KeyboardInput:
+    """Clavier réel : les appuis (KEYDOWN) sont mis en attente par la boucle d'événements
+    de main.py, puis chaque tick capture les touches maintenues en une fois. Tout le tick
+    voit le même état, qui peut être enregistré puis rejoué à l'identique."""
+    def __init__(self):
+        self.pending = []
+        self.frame = InputFrame()
+
+    def press(self, key):
+        self.pending.append(key)
+
+    def advance(self):
+        """Passe au tick suivant ; retourne les touches appuyées depuis le tick précédent"""
+        pressed = pygame.key.get_pressed()
+        self.frame = InputFrame([key for key in WATCHED_KEYS if pressed[key]], self.pending)
+        self.pending = []
+        return self.frame.presses
+
+    def keys(self):
+        return self.frame
+
+
+class ScriptedInput:
+    """Entrées rejouées tick par tick. `script` est une séquence d'InputFrame (un par tick,
+    plus rien une fois épuisée) ou une fonction tick -> InputFrame (bot, entrées aléatoires)."""
+    def __init__(self, script):
+        self.script = script
+        self.tick = -1
+        self.frame = InputFrame()
+
+    def advance(self):
+        """Passe au tick suivant ; retourne les touches appuyées pendant ce tick"""
+        self.tick += 1
+        if callable(self.script):
+            self.frame = self.script(self.tick)
+        elif self.tick < len(self.script):
+            self.frame = self.script[self.tick]
+        else:
+            self.frame = InputFrame()
+        return self.frame.presses
+
+    def keys(self):
+        return self.frame
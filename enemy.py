@@ -1,80 +1,37 @@
 # enemy.py
 import pygame
 import math
-import time
-import random
+import numpy as np
+from level import ENEMY_TYPES
+from spatial import SpatialHash
+from projectiles import ProjectileView, BULLET
+from timing import NEVER
+from eventlog import get_logger
 
-class Projectile:
-    def __init__(self, x, y, target_x, target_y):
-        self.x = x
-        self.y = y
-        self.speed = 100  # pixels par seconde
-        self.lifetime = 4.0  # 4 secondes
-        self.creation_time = time.time()
-        self.width = 8
-        self.height = 8
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-        
+log = get_logger("enemy")
+
+class Projectile(ProjectileView):
+    """Missile qui suit le joueur, tiré par les ennemis stationnaires"""
+    speed = 100  # pixels par seconde
+    lifetime = 4.0  # 4 secondes
+    width = 8
+    height = 8
+    
+    @classmethod
+    def spawn(cls, engine, x, y, target_x, target_y):
+        """Tire un missile vers la cible dans le moteur de projectiles de la partie"""
         # Direction vers la cible
         dx = target_x - x
         dy = target_y - y
         distance = math.sqrt(dx*dx + dy*dy)
         if distance > 0:
-            self.velocity_x = (dx / distance) * self.speed
-            self.velocity_y = (dy / distance) * self.speed
+            velocity_x = (dx / distance) * cls.speed
+            velocity_y = (dy / distance) * cls.speed
         else:
-            self.velocity_x = 0
-            self.velocity_y = 0
-    
-    def update(self, player, world):
-        current_time = time.time()
-        
-        # Vérifier si le projectile doit disparaître
-        if current_time - self.creation_time >= self.lifetime:
-            return False
-        
-        # Recalculer la direction vers le joueur (missile qui suit)
-        dx = player.x + player.width/2 - (self.x + self.width/2)
-        dy = player.y + player.height/2 - (self.y + self.height/2)
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        if distance > 0:
-            # Mélanger direction actuelle et nouvelle direction pour un suivi fluide
-            target_vel_x = (dx / distance) * self.speed
-            target_vel_y = (dy / distance) * self.speed
-            
-            # Transition douce (20% nouvelle direction, 80% ancienne)
-            self.velocity_x = self.velocity_x * 0.8 + target_vel_x * 0.2
-            self.velocity_y = self.velocity_y * 0.8 + target_vel_y * 0.2
-        
-        # Déplacer le projectile
-        dt = 1/60  # 60 FPS
-        new_x = self.x + self.velocity_x * dt
-        new_y = self.y + self.velocity_y * dt
-        
-        # Vérifier collision avec les murs
-        if not self.check_collision(new_x, new_y, world):
-            self.x = new_x
-            self.y = new_y
-            self.rect.x = int(self.x)
-            self.rect.y = int(self.y)
-        else:
-            return False  # Détruire si collision mur
-        
-        return True
-    
-    def check_collision(self, x, y, world):
-        corners = [(x, y), (x + self.width, y), 
-                  (x, y + self.height), (x + self.width, y + self.height)]
-        
-        for corner_x, corner_y in corners:
-            grid_x = int(corner_x // world.tile_size)
-            grid_y = int(corner_y // world.tile_size)
-            
-            if (0 <= grid_x < world.width and 0 <= grid_y < world.height and 
-                world.map[grid_y][grid_x] == 1):
-                return True
-        return False
+            velocity_x = 0
+            velocity_y = 0
+        return engine.add(cls, BULLET, x, y, velocity_x, velocity_y, cls.width, cls.height,
+                          cls.lifetime, speed=cls.speed, homing=True)
     
     def draw(self, screen, camera_x, camera_y):
         screen_x = self.x - camera_x
@@ -82,65 +39,89 @@ class Projectile:
         pygame.draw.circle(screen, (255, 255, 0), 
                          (int(screen_x + self.width/2), int(screen_y + self.height/2)), 4)
 
+# Points de vie de départ selon le type
+# HP ÉQUILIBRÉS pour survie aux attaques (15 dégâts base)
+ENEMY_HP = {
+    "normal": 40,      # AUGMENTÉ : 6 → 25 (2 coups pour tuer)
+    "patrol": 55,      # AUGMENTÉ : 10 → 35 (3 coups pour tuer)
+    "stationary": 60,  # AUGMENTÉ : 8 → 30 (2 coups pour tuer)
+}
+PATROL_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+NORMAL, PATROL, STATIONARY = (ENEMY_TYPES.index(name) for name in ("normal", "patrol", "stationary"))
+
+
+def store_column(name, cast=float):
+    """Propriété qui lit/écrit la case de l'ennemi dans une colonne du magasin"""
+    def get(self):
+        return cast(getattr(self.store, name)[self.index])
+    
+    def set(self, value):
+        getattr(self.store, name)[self.index] = value
+    
+    return property(get, set)
+
+
 class Enemy:
-    def __init__(self, x, y, enemy_type="normal"):
-        self.x = x
-        self.y = y
-        self.start_x = x
-        self.start_y = y
-        self.width = 24
-        self.height = 24
-        self.speed = 3
-        
-        # HP ÉQUILIBRÉS pour survie aux attaques (15 dégâts base)
-        if enemy_type == "normal":
-            self.hp = 40  # AUGMENTÉ : 6 → 25 (2 coups pour tuer)
-            self.max_hp = 40
-        elif enemy_type == "patrol":
-            self.hp = 55  # AUGMENTÉ : 10 → 35 (3 coups pour tuer)
-            self.max_hp = 55
-        elif enemy_type == "stationary":
-            self.hp = 60  # AUGMENTÉ : 8 → 30 (2 coups pour tuer)
-            self.max_hp = 60
-        
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.alive = True
-        
-        # Système de barre de vie
-        self.show_health_bar = False
-        self.last_damage_time = 0
-        self.health_bar_duration = 5.0
-        
-        # Stats d'attaque légèrement réduites
-        self.attack_damage = 12  # RÉDUIT : 15 → 12
-        self.attack_cooldown = 1.5
-        self.last_attack_time = 0
-        
-        # Type d'ennemi
-        self.enemy_type = enemy_type
-        self.patrol_direction = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
-        self.patrol_distance = 0
-        self.max_patrol_distance = random.randint(60, 120)
-        
-        # Pour les patrouilleurs qui deviennent agressifs
-        self.is_aggressive = False
-        self.detection_range = 100
-        
-        # Pour les ennemis à distance
-        self.shoot_cooldown = 2.0
-        self.last_shoot_time = 0
-        self.shoot_range = 150
+    """Vue sur une ligne de l'EnemyStore : l'état vit dans les tableaux du magasin,
+    l'objet sert au dessin et au code qui manipule les ennemis un par un"""
+    width = 24
+    height = 24
+    speed = 3
+    health_bar_duration = 5.0
+    # Stats d'attaque légèrement réduites
+    attack_damage = 12  # RÉDUIT : 15 → 12
+    attack_cooldown = 1.5
+    # Pour les patrouilleurs qui deviennent agressifs
+    detection_range = 100
+    # Pour les ennemis à distance
+    shoot_cooldown = 2.0
+    shoot_range = 150
+    
+    x = store_column("x")
+    y = store_column("y")
+    start_x = store_column("start_x")
+    start_y = store_column("start_y")
+    hp = store_column("hp")
+    max_hp = store_column("max_hp")
+    alive = store_column("alive", bool)
+    show_health_bar = store_column("show_health_bar", bool)
+    last_damage_time = store_column("last_damage_time")
+    last_attack_time = store_column("last_attack_time")
+    last_shoot_time = store_column("last_shoot_time")
+    patrol_distance = store_column("patrol_distance")
+    max_patrol_distance = store_column("max_patrol_distance", int)
+    is_aggressive = store_column("aggressive", bool)
     
-    def update(self, player, world, other_enemies, projectiles):
+    def __init__(self, x, y, enemy_type, store):
+        self.store = store
+        self.index = self.store.add(self, x, y, enemy_type)
+    
+    @property
+    def enemy_type(self):
+        return ENEMY_TYPES[self.store.kind[self.index]]
+    
+    @property
+    def rect(self):
+        return self.store.rects[self.index]
+    
+    @property
+    def patrol_direction(self):
+        return (int(self.store.patrol_dx[self.index]), int(self.store.patrol_dy[self.index]))
+    
+    @patrol_direction.setter
+    def patrol_direction(self, direction):
+        self.store.patrol_dx[self.index], self.store.patrol_dy[self.index] = direction
+    
+    def update(self, player, world, other_enemies, projectiles, flow_field=None):
         if not self.alive:
             return
         
         if self.enemy_type == "stationary":
             self.ranged_behavior(player, world, projectiles)
         elif self.enemy_type == "patrol":
-            self.smart_patrol_behavior(player, world, other_enemies)
+            self.smart_patrol_behavior(player, world, other_enemies, flow_field)
         else:  # "normal"
-            self.follow_behavior(player, world, other_enemies)
+            self.follow_behavior(player, world, other_enemies, flow_field)
     
     def ranged_behavior(self, player, world, projectiles):
         """Ennemi stationnaire qui tire des missiles"""
@@ -153,11 +134,12 @@ class Enemy:
             self.attack_player(player)
         # Tirer des missiles si dans la portée
         elif distance <= self.shoot_range:
-            current_time = time.time()
+            current_time = self.store.clock.now
             if current_time - self.last_shoot_time >= self.shoot_cooldown:
                 self.last_shoot_time = current_time
                 # Créer un projectile vers le joueur
-                projectile = Projectile(
+                projectile = Projectile.spawn(
+                    projectiles.engine,
                     self.x + self.width/2, 
                     self.y + self.height/2,
                     player.x + player.width/2, 
@@ -165,7 +147,7 @@ class Enemy:
                 )
                 projectiles.append(projectile)
     
-    def smart_patrol_behavior(self, player, world, other_enemies):
+    def smart_patrol_behavior(self, player, world, other_enemies, flow_field=None):
         """Patrouille, mais suit le joueur si détecté"""
         dx_player = player.x - self.x
         dy_player = player.y - self.y
@@ -177,7 +159,7 @@ class Enemy:
         
         if self.is_aggressive:
             # Comportement de suivi (comme un ennemi normal)
-            self.follow_behavior(player, world, other_enemies)
+            self.follow_behavior(player, world, other_enemies, flow_field)
         else:
             # Comportement de patrouille normal
             if player_distance <= 40:
@@ -204,7 +186,7 @@ class Enemy:
             self.rect.x = int(self.x)
             self.rect.y = int(self.y)
     
-    def follow_behavior(self, player, world, other_enemies):
+    def follow_behavior(self, player, world, other_enemies, flow_field=None):
         dx = player.x - self.x
         dy = player.y - self.y
         distance = math.sqrt(dx*dx + dy*dy)
@@ -213,6 +195,18 @@ class Enemy:
             if distance <= 40:
                 self.attack_player(player)
             
+            # Contourner les obstacles avec le champ de flux partagé :
+            # viser le centre de la tuile suivante, tout droit si le joueur est en vue
+            waypoint = None
+            if flow_field is not None:
+                center_x = self.x + self.width/2
+                center_y = self.y + self.height/2
+                waypoint = flow_field.waypoint_at(center_x, center_y)
+                if waypoint is not None:
+                    dx = waypoint[0] - center_x
+                    dy = waypoint[1] - center_y
+                    distance = math.sqrt(dx*dx + dy*dy) or 1
+            
             dx = (dx / distance) * self.speed
             dy = (dy / distance) * self.speed
             
@@ -235,7 +229,7 @@ class Enemy:
             self.rect.y = int(self.y)
     
     def attack_player(self, player):
-        current_time = time.time()
+        current_time = self.store.clock.now
         if current_time - self.last_attack_time < self.attack_cooldown:
             return False
         
@@ -249,24 +243,14 @@ class Enemy:
         
         # NOUVEAU: Activer la barre de vie
         self.show_health_bar = True
-        self.last_damage_time = time.time()
+        self.last_damage_time = self.store.clock.now
         
         if self.hp <= 0:
             self.alive = False
-            print(f"Ennemi {self.enemy_type} éliminé !")
+            log.debug("Ennemi %s éliminé !", self.enemy_type)
     
     def check_collision(self, x, y, world):
-        corners = [(x, y), (x + self.width, y), 
-                  (x, y + self.height), (x + self.width, y + self.height)]
-        
-        for corner_x, corner_y in corners:
-            grid_x = int(corner_x // world.tile_size)
-            grid_y = int(corner_y // world.tile_size)
-            
-            if (0 <= grid_x < world.width and 0 <= grid_y < world.height and 
-                world.map[grid_y][grid_x] == 1):
-                return True
-        return False
+        return world.rect_hits_wall(x, y, self.width, self.height)
     
     def check_enemy_collision(self, x, y, other_enemies):
         temp_rect = pygame.Rect(x, y, self.width, self.height)
@@ -284,25 +268,23 @@ class Enemy:
     
     def check_room_boundary(self, x, y, world):
         """Empêche l'ennemi de sortir de sa salle d'origine"""
+        x0, y0, x1, y1 = self.home_bounds(world)
+        if x0 < 0:
+            return False  # Pas de salle d'origine : aucune limite
+        
         # Convertir position en tiles
         tile_x = int(x // world.tile_size)
         tile_y = int(y // world.tile_size)
-        
-        # Trouver la salle d'origine
-        start_tile_x = int(self.start_x // world.tile_size)
-        start_tile_y = int(self.start_y // world.tile_size)
-        
-        for room_name, room_data in world.rooms.items():
-            if (room_data["x"] <= start_tile_x < room_data["x"] + room_data["w"] and
-                room_data["y"] <= start_tile_y < room_data["y"] + room_data["h"]):
-                # Vérifier si la nouvelle position est toujours dans cette salle
-                if (room_data["x"] <= tile_x < room_data["x"] + room_data["w"] and
-                    room_data["y"] <= tile_y < room_data["y"] + room_data["h"]):
-                    return False  # Pas de collision, reste dans la salle
-                else:
-                    return True   # Collision, sort de la salle
-        
-        return False
+        return not (x0 <= tile_x < x1 and y0 <= tile_y < y1)
+    
+    def home_bounds(self, world):
+        """Rectangle (x0, y0, x1, y1) en tuiles de la salle d'origine, -1 si aucune"""
+        store = self.store
+        index = self.index
+        if not store.home_resolved[index]:
+            store.resolve_homes(world, [index])
+        return (int(store.home_x0[index]), int(store.home_y0[index]),
+                int(store.home_x1[index]), int(store.home_y1[index]))
     
     def reset(self):
         self.x = self.start_x
@@ -311,20 +293,21 @@ class Enemy:
         self.alive = True
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
+        self.store.home_resolved[self.index] = False  # Salle d'origine recalculée au prochain usage
         self.patrol_distance = 0
         self.is_aggressive = False  # Reset de l'agressivité
-        self.patrol_direction = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+        self.patrol_direction = self.store.rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
         
         # NOUVEAU: Reset barre de vie
         self.show_health_bar = False
-        self.last_damage_time = 0
+        self.last_damage_time = NEVER
     
     def draw(self, screen, camera_x, camera_y):
         if self.alive:
             screen_x = self.x - camera_x
             screen_y = self.y - camera_y
             
-            current_time = time.time()
+            current_time = self.store.clock.now
             
             # Couleur selon état et type
             if current_time - self.last_attack_time < 0.2:
@@ -397,4 +380,295 @@ class Enemy:
             fade_surface = pygame.Surface((bar_width, bar_height))
             fade_surface.set_alpha(255 - alpha)
             fade_surface.fill((30, 30, 30))  # Même couleur que le fond
-            screen.blit(fade_surface, (bar_x, bar_y))
\ No newline at end of file
+            screen.blit(fade_surface, (bar_x, bar_y))
+
+class EnemyStore:
+    """Tous les ennemis d'une partie rangés en colonnes NumPy (une ligne par ennemi).
+    update() fait tourner l'IA de tous les ennemis par passes vectorisées ;
+    seules les collisions entre ennemis restent testées une à une, dans l'ordre,
+    pour garder exactement le résultat de Enemy.update. Ces tests passent par une
+    grille de hachage spatial qui suit les ennemis vivants."""
+    width = Enemy.width
+    height = Enemy.height
+    COLUMNS = {
+        "x": np.float64, "y": np.float64, "start_x": np.float64, "start_y": np.float64,
+        "hp": np.float64, "max_hp": np.float64, "kind": np.uint8, "alive": bool,
+        "aggressive": bool, "patrol_dx": np.int8, "patrol_dy": np.int8,
+        "patrol_distance": np.float64, "max_patrol_distance": np.int32,
+        "last_attack_time": np.float64, "last_shoot_time": np.float64,
+        "last_damage_time": np.float64, "show_health_bar": bool,
+        # Position au tick précédent, pour l'interpolation du rendu
+        "prev_x": np.float64, "prev_y": np.float64,
+        # Position (celle du Rect) sous laquelle l'ennemi est rangé dans la grille
+        "grid_x": np.int32, "grid_y": np.int32, "in_grid": bool,
+        # Salle d'origine (indice et rectangle en tuiles), résolue une fois au spawn/reset (-1 = aucune)
+        "home_x0": np.int32, "home_y0": np.int32, "home_x1": np.int32, "home_y1": np.int32,
+        "home_room": np.int16, "home_resolved": bool,
+    }
+    
+    def __init__(self, clock, rng, capacity=128, cell_size=32):
+        self.clock = clock  # Horloge de simulation de la partie
+        self.rng = rng      # Flux aléatoire des ennemis (Game.rng.enemies)
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        self.enemies = []  # Vues Enemy, même ordre que les lignes
+        self.rects = []    # Rect de chaque ennemi, mis à jour quand il bouge
+        self.grid = SpatialHash(cell_size)  # Ennemis vivants, indexés par ligne
+    
+    def add(self, enemy, x, y, enemy_type):
+        """Ajoute une ligne pour la vue `enemy` et retourne son indice"""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        index = self.count
+        self.count += 1
+        
+        self.x[index] = self.start_x[index] = self.prev_x[index] = x
+        self.y[index] = self.start_y[index] = self.prev_y[index] = y
+        self.hp[index] = self.max_hp[index] = ENEMY_HP[enemy_type]
+        self.kind[index] = ENEMY_TYPES.index(enemy_type)
+        self.alive[index] = True
+        self.aggressive[index] = False
+        self.patrol_dx[index], self.patrol_dy[index] = self.rng.choice(PATROL_DIRECTIONS)
+        self.patrol_distance[index] = 0
+        self.max_patrol_distance[index] = self.rng.randint(60, 120)
+        self.last_attack_time[index] = NEVER
+        self.last_shoot_time[index] = NEVER
+        self.last_damage_time[index] = NEVER
+        self.show_health_bar[index] = False
+        self.in_grid[index] = False  # Rangé dans la grille au prochain update
+        self.home_resolved[index] = False  # Salle d'origine résolue au premier besoin
+        
+        self.enemies.append(enemy)
+        self.rects.append(pygame.Rect(x, y, Enemy.width, Enemy.height))
+        return index
+    
+    def grow(self, capacity):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+        self.capacity = capacity
+    
+    def update(self, player, world, projectiles, flow_field=None, active_rooms=None):
+        """Un pas d'IA pour tous les ennemis vivants (équivalent à appeler
+        Enemy.update sur chacun, dans l'ordre). `active_rooms` (un booléen par salle,
+        voir RoomActivity) endort les ennemis des salles qui ne tournent pas à ce tick."""
+        n = self.count
+        if n == 0:
+            return
+        if not self.home_resolved[:n].all():
+            self.resolve_homes(world)
+        awake = self.alive[:n]
+        if active_rooms is not None:
+            home_room = self.home_room[:n]
+            awake = awake & np.where(home_room >= 0, active_rooms[home_room], True)
+        rows = np.flatnonzero(awake)
+        if len(rows) == 0:
+            return
+        
+        current_time = self.clock.now
+        width, height, speed = Enemy.width, Enemy.height, Enemy.speed
+        x = self.x[rows]
+        y = self.y[rows]
+        kind = self.kind[rows]
+        
+        dx = player.x - x
+        dy = player.y - y
+        distance = np.sqrt(dx*dx + dy*dy)
+        
+        stationary = kind == STATIONARY
+        patrol = kind == PATROL
+        aggressive = self.aggressive[rows] | (patrol & (distance <= Enemy.detection_range))
+        self.aggressive[rows] = aggressive
+        patrolling = patrol & ~aggressive
+        chasing = ((kind == NORMAL) | (patrol & aggressive)) & (distance > 0) & (distance < 200)
+        
+        # Attaques au contact (l'invulnérabilité du joueur est gérée par player.take_damage)
+        attacking = ((stationary | patrolling | chasing) & (distance <= 40) &
+                     (current_time - self.last_attack_time[rows] >= Enemy.attack_cooldown))
+        self.last_attack_time[rows[attacking]] = current_time
+        for _ in range(np.count_nonzero(attacking)):
+            player.take_damage(Enemy.attack_damage)
+        
+        # Tirs des ennemis stationnaires
+        shooting = (stationary & (distance > 40) & (distance <= Enemy.shoot_range) &
+                    (current_time - self.last_shoot_time[rows] >= Enemy.shoot_cooldown))
+        self.last_shoot_time[rows[shooting]] = current_time
+        for index in np.flatnonzero(shooting):
+            projectiles.append(Projectile.spawn(
+                projectiles.engine,
+                float(x[index]) + width/2,
+                float(y[index]) + height/2,
+                player.x + player.width/2,
+                player.y + player.height/2
+            ))
+        
+        moving = np.flatnonzero(chasing | patrolling)
+        if len(moving) == 0:
+            return
+        
+        # Pas de chaque ennemi qui bouge (poursuite : champ de flux ou ligne droite).
+        # Le champ n'est lu (et donc recalculé) que si un ennemi poursuit le joueur.
+        step_x = dx
+        step_y = dy
+        length = distance
+        if flow_field is not None and chasing.any():
+            center_x = x + width/2
+            center_y = y + height/2
+            next_x, next_y, follow = flow_field.waypoints_at(center_x, center_y)
+            follow &= chasing
+            waypoint_dx = next_x - center_x
+            waypoint_dy = next_y - center_y
+            waypoint_distance = np.sqrt(waypoint_dx*waypoint_dx + waypoint_dy*waypoint_dy)
+            waypoint_distance[waypoint_distance == 0] = 1
+            step_x = np.where(follow, waypoint_dx, step_x)
+            step_y = np.where(follow, waypoint_dy, step_y)
+            length = np.where(follow, waypoint_distance, length)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step_x = np.where(chasing, step_x / length * speed, self.patrol_dx[rows] * speed * 0.5)
+            step_y = np.where(chasing, step_y / length * speed, self.patrol_dy[rows] * speed * 0.5)
+        
+        chasing = chasing[moving]
+        patrolling = patrolling[moving]
+        x = x[moving]
+        y = y[moving]
+        step_x = step_x[moving]
+        step_y = step_y[moving]
+        moving = rows[moving]  # Indices locaux -> lignes du magasin
+        new_x = x + step_x
+        new_y = y + step_y
+        new_xs = new_x.tolist()
+        new_ys = new_y.tolist()
+        
+        # Murs, joueur et sortie de salle pour les trois positions candidates :
+        # (new_x, y) puis (new_x, new_y) ou (x, new_y) selon que le pas en x a réussi
+        blocked_xy = self.static_blocked(world, moving, new_x, new_y)
+        hits_player_xy = self.hits_player(player, new_x, new_y)
+        stuck_x = (self.static_blocked(world, moving, new_x, y) | self.hits_player(player, new_x, y)).tolist()
+        stuck_xy = (blocked_xy | hits_player_xy).tolist()
+        stuck_y = (self.static_blocked(world, moving, x, new_y) | self.hits_player(player, x, new_y)).tolist()
+        
+        # Patrouilleurs : demi-tour devant un mur, la limite de salle ou en fin de course
+        patrol_distance = self.patrol_distance[moving]
+        turning = patrolling & (blocked_xy | (patrol_distance >= self.max_patrol_distance[moving]))
+        self.patrol_dx[moving[turning]] *= -1
+        self.patrol_dy[moving[turning]] *= -1
+        patrol_distance[turning] = 0
+        
+        # Collisions entre ennemis, dans l'ordre : chacun voit les positions déjà mises à jour
+        self.sync_grid()
+        grid = self.grid
+        rects = self.rects
+        xs = x.tolist()
+        ys = y.tolist()
+        chasing_rows = chasing.tolist()
+        turning_rows = turning.tolist()
+        hits_player_xy = hits_player_xy.tolist()
+        patrol_steps = (np.abs(step_x) + np.abs(step_y)).tolist()
+        for i, row in enumerate(moving.tolist()):
+            rect = rects[row]
+            if chasing_rows[i]:
+                moved_x = False
+                if not stuck_x[i]:
+                    test = pygame.Rect(new_xs[i], ys[i], width, height)
+                    if not self.hits_other(test, row):
+                        xs[i] = new_xs[i]
+                        moved_x = True
+                if not (stuck_xy[i] if moved_x else stuck_y[i]):
+                    test = pygame.Rect(xs[i], new_ys[i], width, height)
+                    if not self.hits_other(test, row):
+                        ys[i] = new_ys[i]
+            elif not turning_rows[i] and not hits_player_xy[i]:
+                test = pygame.Rect(new_xs[i], new_ys[i], width, height)
+                if not self.hits_other(test, row):
+                    xs[i] = new_xs[i]
+                    ys[i] = new_ys[i]
+                    patrol_distance[i] += patrol_steps[i]
+            rect.x = int(xs[i])
+            rect.y = int(ys[i])
+            grid.move(row, rect.x, rect.y, width, height)
+        
+        self.x[moving] = xs
+        self.y[moving] = ys
+        self.grid_x[moving] = np.trunc(self.x[moving])
+        self.grid_y[moving] = np.trunc(self.y[moving])
+        self.patrol_distance[moving] = patrol_distance
+    
+    def remember_positions(self):
+        """Garde les positions courantes avant le tick suivant"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+    
+    def render_offsets(self, alpha):
+        """Avance de chaque ennemi sur sa position interpolée (listes par ligne) : ajoutée à
+        la caméra, elle dessine l'ennemi entre ses positions des deux derniers ticks"""
+        n = self.count
+        lag = 1.0 - alpha
+        return (((self.x[:n] - self.prev_x[:n]) * lag).tolist(),
+                ((self.y[:n] - self.prev_y[:n]) * lag).tolist())
+    
+    def sync_grid(self):
+        """Range dans la grille les ennemis tués, ressuscités ou déplacés hors de update()
+        (dégâts, reset, chargement) ; seules les lignes modifiées sont touchées"""
+        n = self.count
+        alive = self.alive[:n]
+        in_grid = self.in_grid[:n]
+        stale = (alive != in_grid) | (alive & ((np.trunc(self.x[:n]) != self.grid_x[:n]) |
+                                               (np.trunc(self.y[:n]) != self.grid_y[:n])))
+        for row in np.flatnonzero(stale).tolist():
+            if alive[row]:
+                rect = self.rects[row]
+                self.grid.move(row, rect.x, rect.y, rect.width, rect.height)
+                self.grid_x[row] = rect.x
+                self.grid_y[row] = rect.y
+                in_grid[row] = True
+            else:
+                self.grid.remove(row)
+                in_grid[row] = False
+    
+    def resolve_homes(self, world, rows=None):
+        """Résout la salle d'origine des lignes non résolues (ou de `rows`) en un passage"""
+        if rows is None:
+            rows = np.flatnonzero(~self.home_resolved[:self.count])
+        rooms = world.room_indices_at(self.start_x[rows], self.start_y[rows])
+        bounds = world.room_bounds[rooms]
+        bounds[rooms < 0] = -1
+        self.home_x0[rows], self.home_y0[rows], self.home_x1[rows], self.home_y1[rows] = bounds.T
+        self.home_room[rows] = rooms
+        self.home_resolved[rows] = True
+    
+    def leaves_home(self, rows, xs, ys, tile_size):
+        """Masque vectorisé de check_room_boundary : positions hors de la salle d'origine"""
+        tile_x = np.floor_divide(xs, tile_size)
+        tile_y = np.floor_divide(ys, tile_size)
+        x0 = self.home_x0[rows]
+        y0 = self.home_y0[rows]
+        in_room = ((x0 <= tile_x) & (tile_x < self.home_x1[rows]) &
+                   (y0 <= tile_y) & (tile_y < self.home_y1[rows]))
+        return (x0 >= 0) & ~in_room
+    
+    def static_blocked(self, world, rows, xs, ys):
+        """Positions bloquées par un mur ou hors de la salle d'origine"""
+        blocked = world.rects_hit_wall(xs, ys, Enemy.width, Enemy.height)
+        return blocked | self.leaves_home(rows, xs, ys, world.tile_size)
+    
+    def hits_player(self, player, xs, ys):
+        """Recouvrement avec le joueur, avec les coordonnées entières de pygame.Rect"""
+        player_x = int(player.x)
+        player_y = int(player.y)
+        xs = np.trunc(xs)
+        ys = np.trunc(ys)
+        return ((xs < player_x + player.width) & (player_x < xs + Enemy.width) &
+                (ys < player_y + player.height) & (player_y < ys + Enemy.height))
+    
+    def hits_other(self, rect, row):
+        """Vrai si `rect` chevauche un autre ennemi vivant que celui de la ligne `row`"""
+        rects = self.rects
+        for other in self.grid.query(rect.x, rect.y, rect.width, rect.height):
+            if other != row and rect.colliderect(rects[other]):
+                return True
+        return False
@@ -0,0 +1,146 @@
+# eventlog.py - Journal d'événements : niveaux, limitation de débit, mémoire circulaire, écriture en tâche de fond
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+ROOT = "tus"
+FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """Seau à jetons par modèle de message (logger + texte avant formatage) : `burst` messages
+    d'affilée puis `rate` par seconde. Les messages ignorés sont comptés et signalés sur le
+    suivant qui passe. Appliqué dans le thread appelant : un message ignoré n'est jamais formaté."""
+    def __init__(self, rate=2.0, burst=5):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}  # (logger, modèle) -> [jetons, date, messages ignorés]
+
+    def filter(self, record):
+        now = time.monotonic()
+        bucket = self.buckets.get((record.name, record.msg))
+        if bucket is None:
+            bucket = self.buckets[(record.name, record.msg)] = [self.burst, now, 0]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] += 1
+            return False
+        bucket[0] = tokens - 1
+        if bucket[2]:
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+
+class EventFormatter(logging.Formatter):
+    """Format console/mémoire, avec le nombre de messages identiques ignorés"""
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" (+{suppressed} identiques ignorés)"
+        return text
+
+
+class RingBufferHandler(logging.Handler):
+    """Garde les `capacity` dernières lignes du journal en mémoire (rapport de plantage, overlay)"""
+    def __init__(self, capacity=1000):
+        super().__init__()
+        self.lines = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Dépose l'enregistrement tel quel dans la file : le formatage (%-arguments, date,
+    trace) est fait par le thread du listener, pas par le thread du jeu"""
+    def prepare(self, record):
+        return record
+
+
+class EventListener(logging.handlers.QueueListener):
+    """Listener qui reconnaît les marqueurs de flush() : tout ce qui a été déposé avant
+    le marqueur est déjà écrit quand il le rencontre"""
+    def handle(self, record):
+        done = getattr(record, "flush_done", None)
+        if done is not None:
+            done.set()
+        else:
+            super().handle(record)
+
+
+rate_limit = RateLimitFilter()
+ring = RingBufferHandler()
+console = logging.StreamHandler(sys.stdout)
+for _handler in (ring, console):
+    _handler.setFormatter(EventFormatter(FORMAT, "%H:%M:%S"))
+
+# Le jeu ne fait que déposer les messages dans la file ; le thread du listener les écrit
+_queue = queue.SimpleQueue()
+_queue_handler = DeferredQueueHandler(_queue)
+_queue_handler.addFilter(rate_limit)
+_listener = EventListener(_queue, ring, console, respect_handler_level=True)
+
+# Tant que setup() n'a pas été appelé, le logger n'a aucun handler : seuls les
+# avertissements et erreurs sortent (sur stderr, via logging.lastResort)
+_root = logging.getLogger(ROOT)
+_root.setLevel(logging.INFO)
+_root.propagate = False
+
+
+def setup(level=logging.INFO, console_level=logging.NOTSET):
+    """Branche la file sur le logger du jeu et démarre le thread d'écriture (main.py,
+    headless.py et les autres points d'entrée) ; sans effet au deuxième appel"""
+    if _queue_handler not in _root.handlers:
+        _root.addHandler(_queue_handler)
+        _listener.start()
+        atexit.register(shutdown)
+    configure(level, console_level)
+
+
+def shutdown():
+    """Écrit les derniers messages et arrête le thread (appelé à la sortie)"""
+    if _queue_handler in _root.handlers:
+        _root.removeHandler(_queue_handler)
+        _listener.stop()
+
+
+def get_logger(name):
+    """Logger d'un module du jeu (« tus.<name> ») ; debug() est ignoré par défaut"""
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def configure(level=logging.INFO, console_level=logging.NOTSET, rate=None, burst=None):
+    """Niveau du journal (les messages en dessous ne sont même pas créés), niveau propre à la
+    console (la mémoire circulaire garde tout ce qui passe) et limitation de débit"""
+    _root.setLevel(level)
+    console.setLevel(console_level)
+    if rate is not None:
+        rate_limit.rate = rate
+    if burst is not None:
+        rate_limit.burst = burst
+
+
+def recent(count=None):
+    """Dernières lignes du journal, des plus anciennes aux plus récentes"""
+    flush()
+    lines = list(ring.lines)
+    return lines if count is None else lines[-count:]
+
+
+def flush(timeout=1.0):
+    """Attend que le thread d'écriture ait traité tout ce qui est déjà dans la file"""
+    if _queue_handler not in _root.handlers:
+        return
+    marker = logging.makeLogRecord({"flush_done": threading.Event()})
+    _queue.put_nowait(marker)
+    marker.flush_done.wait(timeout)
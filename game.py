@@ -2,17 +2,34 @@
 import pygame
 from player import Player
 from world import World
-from enemy import Enemy
+from enemy import Enemy, EnemyStore
 from boss import Boss, BossProjectile
+from projectiles import ProjectileEngine, BULLET, ARROW, BOSS
 from ui import UI
 from loot import Chest
 from menu import InventoryMenu
-import time
+from pathfinding import FlowField
+from activity import RoomActivity
+from particles import ParticleSystem
+from timing import NEVER, lerp, SimClock
+from controls import KeyboardInput
+from rng import RandomStreams
+from profiler import profiler
+from eventlog import get_logger
 import math
-import random
+
+log = get_logger("game")
+
+class RenderCamera:
+    """Position de caméra figée pour dessiner une image"""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
 
 class Camera:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, clock, rng):
+        self.clock = clock
+        self.rng = rng  # Flux du tremblement d'écran (Game.rng.camera)
         self.x = 0
         self.y = 0
         self.screen_width = screen_width
@@ -21,7 +38,22 @@ class Camera:
         # Screen shake
         self.shake_intensity = 0
         self.shake_duration = 0
-        self.shake_start_time = 0
+        self.shake_start_time = NEVER
+        
+        # Position au tick précédent, pour l'interpolation du rendu
+        self.previous_x = 0
+        self.previous_y = 0
+    
+    def remember_position(self):
+        """Garde la position courante avant le tick suivant"""
+        self.previous_x = self.x
+        self.previous_y = self.y
+    
+    def at(self, alpha):
+        """Vue de la caméra interpolée entre les deux derniers ticks"""
+        if alpha >= 1.0:
+            return self
+        return RenderCamera(lerp(self.previous_x, self.x, alpha), lerp(self.previous_y, self.y, alpha))
     
     def follow_player(self, player, world):
         self.x = player.x - self.screen_width // 2
@@ -38,49 +70,55 @@ class Camera:
         """Démarre un tremblement d'écran"""
         self.shake_intensity = intensity
         self.shake_duration = duration
-        self.shake_start_time = time.time()
+        self.shake_start_time = self.clock.now
     
     def apply_screen_shake(self):
         """Applique le tremblement d'écran"""
-        current_time = time.time()
+        current_time = self.clock.now
         if current_time - self.shake_start_time < self.shake_duration:
             progress = (current_time - self.shake_start_time) / self.shake_duration
             current_intensity = self.shake_intensity * (1 - progress)
             
-            shake_x = random.randint(-int(current_intensity), int(current_intensity))
-            shake_y = random.randint(-int(current_intensity), int(current_intensity))
+            shake_x = self.rng.randint(-int(current_intensity), int(current_intensity))
+            shake_y = self.rng.randint(-int(current_intensity), int(current_intensity))
             
             self.x += shake_x
             self.y += shake_y
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, controls=None, seed=0):
         self.screen = screen
-        self.world = World(100, 80)
-        self.player = Player(320, 320)
+        # Source des entrées : clavier par défaut, script en mode sans affichage (headless.py)
+        self.controls = controls if controls is not None else KeyboardInput()
+        # Horloge de simulation propre à la partie, avancée d'un tick au début de chaque update.
+        # Elle est passée aux sous-systèmes, comme les flux aléatoires et le moteur de projectiles :
+        # deux parties peuvent tourner côte à côte dans le même processus (comparaison d'empreintes)
+        self.clock = SimClock()
+        # Flux aléatoires par sous-système, tous tirés de la graine : même graine + mêmes entrées = même partie
+        self.seed = seed
+        self.rng = RandomStreams(seed)
+        self.world = World()
+        self.flow_field = FlowField(self.world)
+        self.room_activity = RoomActivity(self.world, self.clock)
+        self.player = Player(*self.world.level.player_spawn, self.clock)
         self.player.set_game_reference(self)
-        self.camera = Camera(screen.get_width(), screen.get_height())
-        self.ui = UI(screen.get_width(), screen.get_height())
-        self.projectiles = []
-        self.player_projectiles = []
+        self.player.controls = self.controls
+        self.previous_player_position = (self.player.x, self.player.y)
+        self.camera = Camera(screen.get_width(), screen.get_height(), self.clock, self.rng.camera)
+        self.ui = UI(screen.get_width(), screen.get_height(), self.clock)
+        
+        # Projectiles : tous dans le moteur de la partie, vus par type dans l'ordre de tir
+        self.projectiles = ProjectileEngine(self.clock)
+        self.enemy_projectiles = self.projectiles.group(BULLET)
+        self.player_projectiles = self.projectiles.group(ARROW)
         
         # NOUVEAU: Système de boss spawn dynamique
         self.bosses = []  # Liste des boss actuellement actifs
-        self.boss_projectiles = []
+        self.boss_projectiles = self.projectiles.group(BOSS)
         self.spawned_bosses = {"boss": False, "secret": False}  # Track des boss déjà spawnés
         
         # Associer chaque ennemi à sa salle
-        self.room_enemies = {
-            "spawn": [],
-            "room1": [],
-            "room2": [],
-            "central": [],
-            "right": [],
-            "big": [],
-            "bottom": [],
-            "boss": [],
-            "secret": []
-        }
+        self.room_enemies = {room_name: [] for room_name in self.world.rooms}
         
         # Créer seulement les ennemis normaux
         self.create_enemies()
@@ -94,17 +132,8 @@ class Game:
         self.equipped_skills = []
         self.player_weapon = None
 
-        # Positions des coffres
-        self.chest_positions = {
-            "room1": (1024, 450),
-            "room2": (1764, 350),
-            "central": (900, 1200),
-            "right": (1604, 1000),
-            "big": (2440, 900),
-            "bottom": (600, 2000),
-            "boss": (1700, 1800),
-            "secret": (2604, 1900)
-        }
+        # Positions des coffres (définies dans le fichier de niveau)
+        self.chest_positions = self.world.level.chest_positions()
 
         self.menu = InventoryMenu(screen.get_width(), screen.get_height())
         self.equipped_skills = [None, None, None, None]
@@ -113,147 +142,57 @@ class Game:
         
         # Messages de loot
         self.loot_message = None
-        self.loot_message_time = 0
+        self.loot_message_time = NEVER
         self.loot_message_duration = 3.0
         
         # Effets visuels
-        self.particles = []
+        self.particles = ParticleSystem()
     
     def spawn_boss_if_needed(self, room_name):
         """Spawn un boss quand le joueur entre dans sa salle pour la première fois"""
         if room_name == "boss" and not self.spawned_bosses["boss"]:
-            print("🔥 SPAWNING BOSS PRINCIPAL 🔥")
             boss_room = self.world.rooms["boss"]
             boss_center_x = (boss_room["x"] + boss_room["w"]//2) * self.world.tile_size
             boss_center_y = (boss_room["y"] + boss_room["h"]//2) * self.world.tile_size
             
-            main_boss = Boss(boss_center_x - 32, boss_center_y - 32, "main", self.world)
+            main_boss = Boss(boss_center_x - 32, boss_center_y - 32, self.clock, self.rng.bosses, "main", self.world)
             self.bosses.append(main_boss)
             self.spawned_bosses["boss"] = True
             
             # Effet visuel de spawn
             self.camera.start_screen_shake(20, 1.0)
             self.show_loot_message("🔥 GARDIEN DES PROFONDEURS APPARAÎT ! 🔥", (255, 0, 0))
-            print(f"Boss principal spawné en ({boss_center_x}, {boss_center_y})")
+            log.info("Boss principal apparu en (%s, %s)", boss_center_x, boss_center_y)
             
         elif room_name == "secret" and not self.spawned_bosses["secret"]:
-            print("👻 SPAWNING BOSS SECRET 👻")
             secret_room = self.world.rooms["secret"]
             secret_center_x = (secret_room["x"] + secret_room["w"]//2) * self.world.tile_size
             secret_center_y = (secret_room["y"] + secret_room["h"]//2) * self.world.tile_size
             
-            secret_boss = Boss(secret_center_x - 32, secret_center_y - 32, "secret", self.world)
+            secret_boss = Boss(secret_center_x - 32, secret_center_y - 32, self.clock, self.rng.bosses, "secret", self.world)
             self.bosses.append(secret_boss)
             self.spawned_bosses["secret"] = True
             
             # Effet visuel de spawn
             self.camera.start_screen_shake(20, 1.0)
             self.show_loot_message("👻 SEIGNEUR DES OMBRES APPARAÎT ! 👻", (150, 0, 150))
-            print(f"Boss secret spawné en ({secret_center_x}, {secret_center_y})")
+            log.info("Boss secret apparu en (%s, %s)", secret_center_x, secret_center_y)
     
-    def create_enemies(self):
+    def create_enemies(self, spawns=None):
+        """Crée les ennemis à partir des tables de spawn du niveau
+        (ou d'une liste (salle, x, y, type) fournie, pour les scénarios de test)"""
+        if spawns is None:
+            spawns = self.world.level.enemy_spawns()
+        self.enemy_store = EnemyStore(self.clock, self.rng.enemies, len(spawns))
         self.enemies = []
-        
-        # === SALLE 1 CORRIGÉE (22, 8, 20, 18) ===
-        room1_enemies = [
-            Enemy(1024, 540, "stationary"), Enemy(1104, 480, "stationary"),
-            Enemy(754, 300, "patrol"), Enemy(1284, 300, "patrol"),
-            Enemy(754, 780, "patrol"), Enemy(1284, 780, "patrol"),
-            Enemy(854, 350, "normal"), Enemy(1004, 350, "normal"),
-            Enemy(1154, 350, "normal"), Enemy(854, 700, "normal"),
-            Enemy(1004, 700, "normal"), Enemy(1154, 700, "normal"),
-        ]
-        self.enemies.extend(room1_enemies)
-        self.room_enemies["room1"] = room1_enemies
-        
-        # === SALLE 2 CORRIGÉE (45, 5, 18, 15) ===
-        room2_enemies = [
-            Enemy(1728, 400, "stationary"),
-            Enemy(1490, 200, "patrol"), Enemy(1940, 200, "patrol"),
-            Enemy(1490, 580, "patrol"), Enemy(1940, 580, "patrol"),
-            Enemy(1590, 280, "normal"), Enemy(1690, 280, "normal"),
-            Enemy(1790, 280, "normal"), Enemy(1590, 520, "normal"),
-            Enemy(1690, 520, "normal"), Enemy(1790, 520, "normal"),
-        ]
-        self.enemies.extend(room2_enemies)
-        self.room_enemies["room2"] = room2_enemies
-        
-        # === SALLE CENTRALE (15, 30, 25, 20) ===
-        central_enemies = [
-            Enemy(720, 1200, "stationary"), Enemy(880, 1200, "stationary"),
-            Enemy(1040, 1200, "stationary"), Enemy(880, 1080, "stationary"),
-            Enemy(880, 1320, "stationary"), Enemy(520, 1000, "patrol"),
-            Enemy(520, 1400, "patrol"), Enemy(1220, 1000, "patrol"),
-            Enemy(1220, 1400, "patrol"), Enemy(700, 980, "patrol"),
-            Enemy(1000, 980, "patrol"), Enemy(600, 1100, "normal"),
-            Enemy(760, 1100, "normal"), Enemy(1000, 1100, "normal"),
-            Enemy(1160, 1100, "normal"), Enemy(600, 1300, "normal"),
-            Enemy(760, 1300, "normal"), Enemy(1000, 1300, "normal"),
-            Enemy(1160, 1300, "normal"),
-        ]
-        self.enemies.extend(central_enemies)
-        self.room_enemies["central"] = central_enemies
-        
-        # === SALLE DROITE CORRIGÉE (42, 25, 20, 15) ===
-        right_enemies = [
-            Enemy(1664, 1040, "stationary"),
-            Enemy(1384, 840, "patrol"), Enemy(1924, 840, "patrol"),
-            Enemy(1384, 1240, "patrol"), Enemy(1924, 1240, "patrol"),
-            Enemy(1504, 920, "normal"), Enemy(1624, 920, "normal"),
-            Enemy(1744, 920, "normal"), Enemy(1504, 1160, "normal"),
-            Enemy(1624, 1160, "normal"), Enemy(1744, 1160, "normal"),
-        ]
-        self.enemies.extend(right_enemies)
-        self.room_enemies["right"] = right_enemies
-        
-        # === GRANDE SALLE CORRIGÉE (65, 20, 25, 25) ===
-        big_enemies = [
-            Enemy(2320, 900, "stationary"), Enemy(2480, 900, "stationary"),
-            Enemy(2640, 900, "stationary"), Enemy(2400, 780, "stationary"),
-            Enemy(2400, 1020, "stationary"), Enemy(2560, 780, "stationary"),
-            Enemy(2560, 1020, "stationary"), Enemy(2120, 680, "patrol"),
-            Enemy(2820, 680, "patrol"), Enemy(2120, 1380, "patrol"),
-            Enemy(2820, 1380, "patrol"), Enemy(2120, 900, "patrol"),
-            Enemy(2820, 900, "patrol"), Enemy(2200, 800, "normal"),
-            Enemy(2280, 800, "normal"), Enemy(2440, 800, "normal"),
-            Enemy(2600, 800, "normal"), Enemy(2680, 800, "normal"),
-            Enemy(2200, 1000, "normal"), Enemy(2280, 1000, "normal"),
-            Enemy(2440, 1000, "normal"), Enemy(2600, 1000, "normal"),
-            Enemy(2680, 1000, "normal"),
-        ]
-        self.enemies.extend(big_enemies)
-        self.room_enemies["big"] = big_enemies
-        
-        # === SALLE BAS-GAUCHE (10, 55, 20, 15) ===
-        bottom_enemies = [
-            Enemy(640, 2000, "stationary"),
-            Enemy(360, 1800, "patrol"), Enemy(920, 1800, "patrol"),
-            Enemy(360, 2200, "patrol"), Enemy(920, 2200, "patrol"),
-            Enemy(480, 1880, "normal"), Enemy(600, 1880, "normal"),
-            Enemy(720, 1880, "normal"), Enemy(480, 2120, "normal"),
-            Enemy(600, 2120, "normal"), Enemy(720, 2120, "normal"),
-        ]
-        self.enemies.extend(bottom_enemies)
-        self.room_enemies["bottom"] = bottom_enemies
-        
-        # === SALLE BOSS (40, 50, 30, 20) - RÉDUITE car boss présent ===
-        boss_enemies = [
-            Enemy(1520, 1840, "stationary"), Enemy(1680, 1840, "stationary"),
-            Enemy(1840, 1840, "stationary"), Enemy(2000, 1840, "stationary"),
-            Enemy(1600, 1720, "patrol"), Enemy(1920, 1720, "patrol"),
-            Enemy(1400, 1720, "normal"), Enemy(1560, 1720, "normal"),
-            Enemy(1800, 1720, "normal"), Enemy(1960, 1720, "normal"),
-        ]
-        self.enemies.extend(boss_enemies)
-        self.room_enemies["boss"] = boss_enemies
-        
-        # === SALLE SECRET - RÉDUITE car boss secret présent ===
-        secret_enemies = [
-            Enemy(2544, 1840, "stationary"),
-            Enemy(2384, 1840, "normal"), Enemy(2784, 1840, "normal"),
-        ]
-        self.enemies.extend(secret_enemies)
-        self.room_enemies["secret"] = secret_enemies
+        for enemies in self.room_enemies.values():
+            enemies.clear()
+        
+        for room_name, x, y, enemy_type in spawns:
+            enemy = Enemy(x, y, enemy_type, self.enemy_store)
+            self.enemies.append(enemy)
+            self.room_enemies[room_name].append(enemy)
+        self.enemy_store.resolve_homes(self.world)
     
     def check_room_cleared(self, room_name):
         """Vérifie si tous les ennemis d'une salle sont morts"""
@@ -313,12 +252,30 @@ class Game:
                 break
         
         if crit_skill:
-            import random
-            return random.random() < crit_skill.effect_value
+            return self.rng.combat.random() < crit_skill.effect_value
         return False
     
+    def step(self):
+        """Un tick complet : appuis de touches du tick (KEYDOWN) puis simulation"""
+        for key in self.controls.advance():
+            self.handle_key_press(key)
+            if key == pygame.K_LCTRL:
+                self.player.dash(self.world)
+        self.update()
+    
     def update(self):
-        keys = pygame.key.get_pressed()
+        """Un tick de simulation (FIXED_DT)"""
+        self.clock.tick()
+        
+        # État du tick précédent, pour l'interpolation du rendu
+        self.camera.remember_position()
+        self.previous_player_position = (self.player.x, self.player.y)
+        self.enemy_store.remember_positions()
+        self.projectiles.remember_positions()
+        for boss in self.bosses:
+            boss.remember_position()
+        
+        keys = self.controls.keys()
         if not self.player.alive and keys[pygame.K_r]:
             self.restart_game()
             return
@@ -328,78 +285,94 @@ class Game:
         if current_room in ["boss", "secret"] and self.world.rooms[current_room]["unlocked"]:
             self.spawn_boss_if_needed(current_room)
         
-        self.update_player()
+        with profiler.scope("update_player"):
+            self.update_player()
         
-        # Update ennemis normaux
-        for enemy in self.enemies:
-            enemy.update(self.player, self.world, self.enemies, self.projectiles)
+        with profiler.scope("enemies"):
+            # Champ de flux vers le joueur, partagé par tous les poursuivants
+            self.flow_field.update(self.player.x + self.player.width/2,
+                                   self.player.y + self.player.height/2)
+            
+            # Update ennemis normaux : IA en passes vectorisées, seulement dans les salles actives
+            # (salles verrouillées suspendues, salles lointaines à fréquence réduite)
+            active_rooms = self.room_activity.update(self.player.x, self.player.y)
+            self.enemy_store.update(self.player, self.world, self.enemy_projectiles, self.flow_field, active_rooms)
         
         # Update boss actifs seulement
-        for boss in self.bosses:
-            if boss.alive:
-                boss.update(self.player, self.world, self.boss_projectiles)
-                
-                # Screen shake lors des attaques spéciales
-                current_time = time.time()
-                if (current_time - boss.last_special_time < 0.5 and 
-                    current_time - boss.last_special_time > 0.4):
-                    self.camera.start_screen_shake(15, 0.4)
+        with profiler.scope("bosses"):
+            for boss in self.bosses:
+                if boss.alive:
+                    boss.update(self.player, self.world, self.boss_projectiles)
+                    
+                    # Screen shake lors des attaques spéciales
+                    current_time = self.clock.now
+                    if (current_time - boss.last_special_time < 0.5 and 
+                        current_time - boss.last_special_time > 0.4):
+                        self.camera.start_screen_shake(15, 0.4)
         
-        # Update projectiles
-        self.projectiles = [proj for proj in self.projectiles 
-                        if proj.update(self.player, self.world)]
+        # Update projectiles : tous les types en une passe (flèches → ennemis comprises)
+        with profiler.scope("projectiles"):
+            self.projectiles.update(self.player, self.world, self.enemy_store)
         
-        self.player_projectiles = [proj for proj in self.player_projectiles 
-                                if proj.update(self.world, self.enemies)]
+        with profiler.scope("collisions"):
+            self.update_collisions()
         
-        self.boss_projectiles = [proj for proj in self.boss_projectiles 
-                               if proj.update(self.world)]
+        self.near_door = self.check_door_interaction()
+        self.camera.follow_player(self.player, self.world)
+
+        for room_name in self.room_enemies.keys():
+            if room_name != "spawn":
+                self.spawn_chest_if_room_cleared(room_name)
         
+        self.check_chest_interaction()
+        self.update_particles()
+    
+    def update_collisions(self):
+        """Collisions joueur/boss/projectiles qui ne sont pas traitées par les passes vectorisées"""
         # Collisions projectiles → joueur
-        for projectile in self.projectiles[:]:
-            if projectile.rect.colliderect(self.player.rect):
-                if self.check_dodge():
-                    print("Esquive réussie !")
-                    self.show_loot_message("Esquive !", (0, 255, 255))
-                else:
-                    self.player.take_damage(10)
-                self.projectiles.remove(projectile)
+        for projectile in self.projectiles.overlapping(BULLET, self.player.rect):
+            if self.check_dodge():
+                log.debug("Esquive réussie !")
+                self.show_loot_message("Esquive !", (0, 255, 255))
+            else:
+                self.player.take_damage(10)
+            projectile.destroy()
         
         # Collisions projectiles de boss → joueur
-        for projectile in self.boss_projectiles[:]:
-            if projectile.rect.colliderect(self.player.rect):
-                if self.check_dodge():
-                    print("Esquive de projectile boss !")
-                    self.show_loot_message("Esquive Boss !", (0, 255, 255))
-                else:
-                    self.player.take_damage(projectile.damage)
-                    print(f"Boss projectile touche pour {projectile.damage} dégâts")
-                self.boss_projectiles.remove(projectile)
+        for projectile in self.projectiles.overlapping(BOSS, self.player.rect):
+            if self.check_dodge():
+                log.debug("Esquive de projectile boss !")
+                self.show_loot_message("Esquive Boss !", (0, 255, 255))
+            else:
+                self.player.take_damage(projectile.damage)
+                log.debug("Projectile de boss : %s dégâts", projectile.damage)
+            projectile.destroy()
         
         # Collisions joueur → boss (contact direct)
         for boss in self.bosses:
             if boss.alive and boss.rect.colliderect(self.player.rect):
-                current_time = time.time()
+                current_time = self.clock.now
                 if current_time - self.player.last_damage_time > self.player.damage_cooldown:
                     self.player.take_damage(25)
-                    print("Contact direct avec boss !")
+                    log.debug("Contact direct avec boss !")
         
         # CORRECTION: Collisions projectiles joueur → boss
-        for projectile in self.player_projectiles[:]:
-            for boss in self.bosses:
-                if boss.alive and projectile.rect.colliderect(boss.rect):
+        # (test groupé de toutes les flèches contre les boss, dans l'ordre de tir)
+        for projectile, targets in self.projectiles.hits_against(ARROW, [boss.rect for boss in self.bosses]):
+            for boss in (self.bosses[index] for index in targets):
+                if boss.alive:
                     if boss.take_damage(projectile.damage):
-                        print(f"Projectile touche {boss.name} pour {projectile.damage} dégâts")
+                        log.debug("Projectile touche %s pour %s dégâts", boss.name, projectile.damage)
                         self.camera.start_screen_shake(5, 0.2)
                         if not boss.alive:
                             self.show_loot_message(f"{boss.name} VAINCU!", (255, 215, 0))
                             self.camera.start_screen_shake(20, 1.0)
-                    self.player_projectiles.remove(projectile)
+                    projectile.destroy()
                     break
         
         # CORRECTION: Collisions attaques au corps à corps → boss
         if hasattr(self.player, 'last_attack_time'):
-            current_time = time.time()
+            current_time = self.clock.now
             if current_time - self.player.last_attack_time < 0.1:  # Dans les 0.1s après une attaque
                 # Vérifier si une arme à distance a été utilisée
                 weapon_is_ranged = (self.player_weapon and 
@@ -431,54 +404,34 @@ class Game:
                                 
                                 if boss.take_damage(damage):
                                     if is_critical:
-                                        print(f"Coup critique sur {boss.name} ! {damage} dégâts")
+                                        log.debug("Coup critique sur %s ! %s dégâts", boss.name, damage)
                                     else:
-                                        print(f"Attaque corps à corps sur {boss.name} : {damage} dégâts")
+                                        log.debug("Attaque corps à corps sur %s : %s dégâts", boss.name, damage)
                                     
                                     self.camera.start_screen_shake(8, 0.3)
                                     if not boss.alive:
                                         self.show_loot_message(f"{boss.name} VAINCU!", (255, 215, 0))
                                         self.camera.start_screen_shake(25, 1.2)
-        
-        self.near_door = self.check_door_interaction()
-        self.camera.follow_player(self.player, self.world)
-
-        for room_name in self.room_enemies.keys():
-            if room_name != "spawn":
-                self.spawn_chest_if_room_cleared(room_name)
-        
-        self.check_chest_interaction()
-        self.update_particles()
     
     def update_particles(self):
         """Met à jour les particules d'effets visuels"""
+        current_time = self.clock.now
         # Particules autour des boss vivants
         for boss in self.bosses:
-            if boss.alive and random.random() < 0.3:
-                offset_x = random.randint(-40, 40)
-                offset_y = random.randint(-40, 40)
-                particle = {
-                    "x": boss.x + boss.width//2 + offset_x,
-                    "y": boss.y + boss.height//2 + offset_y,
-                    "velocity_x": random.uniform(-20, 20),
-                    "velocity_y": random.uniform(-20, 20),
-                    "lifetime": random.uniform(1.0, 2.0),
-                    "creation_time": time.time(),
-                    "color": boss.color if boss.boss_type == "main" else (150, 0, 150),
-                    "size": random.randint(2, 4)
-                }
-                self.particles.append(particle)
-        
-        # Update et nettoyage des particules
-        current_time = time.time()
-        self.particles = [p for p in self.particles 
-                         if current_time - p["creation_time"] < p["lifetime"]]
-        
-        # Déplacer les particules
-        for particle in self.particles:
-            dt = 1/60
-            particle["x"] += particle["velocity_x"] * dt
-            particle["y"] += particle["velocity_y"] * dt
+            if boss.alive and self.rng.particles.random() < 0.3:
+                offset_x = self.rng.particles.randint(-40, 40)
+                offset_y = self.rng.particles.randint(-40, 40)
+                self.particles.emit(boss.x + boss.width//2 + offset_x,
+                                    boss.y + boss.height//2 + offset_y,
+                                    self.rng.particles.uniform(-20, 20),
+                                    self.rng.particles.uniform(-20, 20),
+                                    self.rng.particles.uniform(1.0, 2.0),
+                                    current_time,
+                                    boss.color if boss.boss_type == "main" else (150, 0, 150),
+                                    self.rng.particles.randint(2, 4))
+        
+        # Nettoyage des particules expirées puis déplacement
+        self.particles.update(current_time)
     
     def update_player(self):
         """Met à jour le joueur avec gestion des compétences améliorée"""
@@ -540,8 +493,7 @@ class Game:
                 break
         
         if dodge_skill:
-            import random
-            return random.random() < dodge_skill.effect_value
+            return self.rng.combat.random() < dodge_skill.effect_value
         return False
     
     def all_bosses_defeated(self):
@@ -554,14 +506,14 @@ class Game:
         return len(self.bosses) >= 2 and all(not boss.alive for boss in self.bosses)
     
     def restart_game(self):
-        self.player = Player(320, 320)
+        self.player = Player(*self.world.level.player_spawn, self.clock)
         self.player.set_game_reference(self)
-        self.projectiles = []
-        self.player_projectiles = []
+        self.player.controls = self.controls
+        self.previous_player_position = (self.player.x, self.player.y)
+        self.projectiles.clear()
         
         # Reset système de boss
         self.bosses = []
-        self.boss_projectiles = []
         self.spawned_bosses = {"boss": False, "secret": False}
         
         self.chests = []
@@ -571,7 +523,7 @@ class Game:
         
         self.last_dead_count = 0
         self.loot_message = None
-        self.particles = []
+        self.particles.clear()
         
         for room_name in self.world.rooms:
             if room_name != "spawn":
@@ -579,40 +531,57 @@ class Game:
         
         for enemy in self.enemies:
             enemy.reset()
+        self.enemy_store.resolve_homes(self.world)
+        self.enemy_store.remember_positions()
         
         self.world.update_doors()
+        self.room_activity = RoomActivity(self.world, self.clock)
     
-    def draw(self):
+    def draw(self, alpha=1.0):
+        """Dessine l'image ; alpha (fraction du tick suivant déjà écoulée) place la caméra et tout ce
+        qui bouge entre leurs positions des deux derniers ticks"""
+        camera = self.camera.at(alpha)
+        lag = 1.0 - alpha
         self.screen.fill((30, 30, 30))
-        self.world.draw_world(self.screen, self.camera)
+        with profiler.scope("draw_world"):
+            self.world.draw_world(self.screen, camera)
         
-        # Dessiner les ennemis normaux
+        # Dessiner les ennemis normaux (décalage de la caméra = avance sur la position interpolée)
+        offset_x, offset_y = self.enemy_store.render_offsets(alpha)
         for enemy in self.enemies:
             if self.is_enemy_visible(enemy):
-                enemy.draw(self.screen, self.camera.x, self.camera.y)
+                enemy.draw(self.screen, camera.x + offset_x[enemy.index], camera.y + offset_y[enemy.index])
         
         # Dessiner les boss actifs
         for boss in self.bosses:
             if self.is_boss_visible(boss):
-                boss.draw(self.screen, self.camera.x, self.camera.y)
+                boss.draw(self.screen, camera.x + (boss.x - boss.previous_x) * lag,
+                          camera.y + (boss.y - boss.previous_y) * lag)
         
         # Dessiner tous les projectiles
-        for projectile in self.projectiles:
-            projectile.draw(self.screen, self.camera.x, self.camera.y)
+        offset_x, offset_y = self.projectiles.render_offsets(alpha)
+        for projectile in self.enemy_projectiles:
+            projectile.draw(self.screen, camera.x + offset_x[projectile.slot], camera.y + offset_y[projectile.slot])
         
         for projectile in self.player_projectiles:
-            projectile.draw(self.screen, self.camera.x, self.camera.y)
+            projectile.draw(self.screen, camera.x + offset_x[projectile.slot], camera.y + offset_y[projectile.slot])
         
+        BossProjectile.draw_trails(self.projectiles, self.screen, camera.x, camera.y)
         for projectile in self.boss_projectiles:
-            projectile.draw(self.screen, self.camera.x, self.camera.y)
+            projectile.draw(self.screen, camera.x + offset_x[projectile.slot], camera.y + offset_y[projectile.slot])
         
         # Dessiner les particules
-        self.draw_particles()
+        with profiler.scope("draw_particles"):
+            self.draw_particles(camera, alpha)
         
         for chest in self.chests:
-            chest.draw(self.screen, self.camera.x, self.camera.y)
+            chest.draw(self.screen, camera.x, camera.y)
         
-        self.player.draw(self.screen, self.camera.x, self.camera.y)
+        # Joueur à sa position interpolée : on décale la caméra de l'écart avec sa position courante
+        previous_x, previous_y = self.previous_player_position
+        self.player.draw(self.screen,
+                         camera.x - (lerp(previous_x, self.player.x, alpha) - self.player.x),
+                         camera.y - (lerp(previous_y, self.player.y, alpha) - self.player.y))
         
         # Interface utilisateur
         if self.near_door and not self.menu.is_open and not self.menu.showing_loot:
@@ -637,32 +606,23 @@ class Game:
         self.draw_loot_message()
         
         # Interface utilisateur avec boss actifs
-        self.ui.draw_hud(self.screen, self.player, self.enemies, self.player_weapon, self.bosses)
+        with profiler.scope("draw_hud"):
+            self.ui.draw_hud(self.screen, self.player, self.enemies, self.player_weapon, self.bosses)
+        
+        with profiler.scope("menu"):
+            self.menu.draw(self.screen, self.equipped_skills)
         
-        self.menu.draw(self.screen, self.equipped_skills)
+        # Overlay du profileur (F3) puis fin de la frame mesurée
+        profiler.draw(self.screen)
+        profiler.end_frame()
     
-    def draw_particles(self):
+    def draw_particles(self, camera, alpha=1.0):
         """Dessine les particules d'effets visuels"""
-        current_time = time.time()
-        for particle in self.particles:
-            # Calculer l'alpha basé sur la durée de vie restante
-            time_ratio = (current_time - particle["creation_time"]) / particle["lifetime"]
-            alpha = int(255 * (1 - time_ratio))
-            
-            if alpha > 0:
-                screen_x = particle["x"] - self.camera.x
-                screen_y = particle["y"] - self.camera.y
-                
-                # Créer une surface avec transparence
-                particle_surface = pygame.Surface((particle["size"], particle["size"]))
-                particle_surface.set_alpha(alpha)
-                particle_surface.fill(particle["color"])
-                
-                self.screen.blit(particle_surface, (screen_x, screen_y))
+        self.particles.draw(self.screen, camera.x, camera.y, self.clock.now, alpha)
 
     def draw_loot_message(self):
         """Dessine le message de loot temporaire"""
-        current_time = time.time()
+        current_time = self.clock.now
         if self.loot_message and (current_time - self.loot_message_time) < self.loot_message_duration:
             font = pygame.font.Font(None, 48)
             text = font.render(self.loot_message["text"], True, self.loot_message["color"])
@@ -680,7 +640,7 @@ class Game:
     def show_loot_message(self, text, color=(255, 255, 255)):
         """Affiche un message temporaire"""
         self.loot_message = {"text": text, "color": color}
-        self.loot_message_time = time.time()
+        self.loot_message_time = self.clock.now
 
     def is_enemy_visible(self, enemy):
         """Détermine si un ennemi doit être visible"""
@@ -689,16 +649,11 @@ class Game:
         if enemy_room and self.world.rooms.get(enemy_room, {}).get("unlocked", False):
             return True
         
-        enemy_tile_x = int(enemy.x // self.world.tile_size)
-        enemy_tile_y = int(enemy.y // self.world.tile_size)
-        
-        for door in self.world.doors:
-            corridor = door["corridor"]
-            if (corridor[0] <= enemy_tile_x < corridor[0] + corridor[2] and
-                corridor[1] <= enemy_tile_y < corridor[1] + corridor[3]):
-                from_room = self.world.rooms[door["from"]]
-                to_room = self.world.rooms[door["to"]]
-                return from_room["unlocked"] or to_room["unlocked"]
+        door = self.world.get_door_at(enemy.x, enemy.y)
+        if door is not None:
+            from_room = self.world.rooms[door["from"]]
+            to_room = self.world.rooms[door["to"]]
+            return from_room["unlocked"] or to_room["unlocked"]
         
         return False
     
@@ -739,7 +694,7 @@ class Game:
                     target_room = self.near_door["door"]["to"]
                 
                 self.world.unlock_room(target_room)
-                print(f"Porte ouverte ! Salle {target_room} déverrouillée depuis {current_room}")
+                log.info("Porte ouverte ! Salle %s déverrouillée depuis %s", target_room, current_room)
                 self.near_door = None
         
         elif key == pygame.K_h and self.equipped_skills[0]:
@@ -760,7 +715,7 @@ class Game:
             chest_x, chest_y = self.chest_positions[room_name]
             new_chest = Chest(chest_x, chest_y)
             self.chests.append(new_chest)
-            print(f"Coffre apparu dans {room_name} !")
+            log.info("Coffre apparu dans %s !", room_name)
 
     def check_chest_interaction(self):
         """Vérifie l'interaction avec les coffres"""
@@ -768,9 +723,10 @@ class Game:
             if not chest.opened:
                 distance = ((self.player.x - chest.x)**2 + (self.player.y - chest.y)**2)**0.5
                 if distance <= 50:  
-                    keys = pygame.key.get_pressed()
+                    keys = self.controls.keys()
                     if keys[pygame.K_e]:  
-                        loot = chest.open(self.player)
+                        # Générateur propre au coffre : fonction de la graine, de la position et du tick
+                        loot = chest.open(self.player, self.rng.fork("loot", chest.x, chest.y, self.clock.ticks))
                         if loot:
                             self.handle_loot(loot)
 
@@ -793,14 +749,14 @@ class Game:
             
             self.apply_passive_effects()
             
-            print(f"Compétence {skill.name} équipée sur {skill.key_binding}")
+            log.info("Compétence %s équipée sur %s", skill.name, skill.key_binding)
             if old_skill:
-                print(f"Ancienne compétence {old_skill.name} remplacée")
+                log.info("Ancienne compétence %s remplacée", old_skill.name)
         
         elif hasattr(skill, 'weapon_type'):
             self.player_weapon = skill
             self.apply_passive_effects()
-            print(f"Arme équipée : {skill.name}")
+            log.info("Arme équipée : %s", skill.name)
         
         else:
             self.use_potion(skill)
@@ -808,7 +764,7 @@ class Game:
 
     def apply_passive_effects(self):
         """Applique les effets passifs des compétences équipées"""
-        print("Application des effets passifs...")
+        log.debug("Application des effets passifs")
         
         base_speed = 3
         base_stamina = 50  
@@ -834,40 +790,41 @@ class Game:
         
         for i, skill in enumerate(self.equipped_skills):
             if skill:
-                print(f"Applique compétence {skill.name} (slot {i})")
+                log.debug("Applique la compétence %s (slot %s)", skill.name, i)
                 if skill.effect_type == "speed":
                     old_speed = self.player.speed
                     self.player.speed *= (1 + skill.effect_value)
-                    print(f"Vitesse: {old_speed} -> {self.player.speed}")
+                    log.debug("Vitesse : %s -> %s", old_speed, self.player.speed)
                 elif skill.effect_type == "stamina":
                     old_stamina = self.player.max_stamina
                     self.player.max_stamina += skill.effect_value
-                    print(f"Stamina max: {old_stamina} -> {self.player.max_stamina}")
+                    log.debug("Stamina max : %s -> %s", old_stamina, self.player.max_stamina)
                 elif skill.effect_type == "dash":
                     self.player.dash_distance = 150
                     self.player.dash_stamina_cost = 50
                     self.player.dash_cooldown = 1.0
-                    self.player.last_dash_time = 0
+                    self.player.last_dash_time = NEVER
                     self.player.is_dashing = False
                     self.player.dash_duration = 0.2
-                    self.player.dash_start_time = 0
+                    self.player.dash_start_time = NEVER
                     self.player.dash_direction = (0, 0)
                     self.player_has_dash = True
-                    print("Dash activé!")
+                    log.debug("Dash activé")
         
         if self.player_weapon:
-            print(f"Applique arme: {self.player_weapon.name}")
+            log.debug("Applique l'arme %s", self.player_weapon.name)
             old_damage = self.player.attack_damage
             self.player.attack_damage += self.player_weapon.damage_bonus
-            print(f"Dégâts: {old_damage} -> {self.player.attack_damage}")
+            log.debug("Dégâts : %s -> %s", old_damage, self.player.attack_damage)
             
             if self.player_weapon.weapon_type == "sword":
                 old_range = self.player.attack_range
                 self.player.attack_range += self.player_weapon.range_bonus
-                print(f"Portée: {old_range} -> {self.player.attack_range}")
+                log.debug("Portée : %s -> %s", old_range, self.player.attack_range)
         
         self.player.stamina = min(self.player.stamina, self.player.max_stamina)
-        print(f"Stats finales - Vitesse: {self.player.speed}, Dégâts: {self.player.attack_damage}, Portée: {self.player.attack_range}")
+        log.info("Stats - vitesse : %s, dégâts : %s, portée : %s",
+                 self.player.speed, self.player.attack_damage, self.player.attack_range)
 
     def use_skill(self, skill):
         """Utilise une compétence active"""
@@ -882,8 +839,8 @@ class Game:
             old_hp = self.player.hp
             self.player.hp = min(self.player.max_hp, self.player.hp + 50)
             heal_amount = self.player.hp - old_hp
-            print(f"HP restaurés: +{heal_amount}")
+            log.info("HP restaurés : +%s", heal_amount)
         elif potion_name == "Potion Complète":
             self.player.hp = self.player.max_hp
             self.player.stamina = self.player.max_stamina
-            print("HP et Stamina au maximum !")
\ No newline at end of file
+            log.info("HP et stamina au maximum !")
\ No newline at end of file
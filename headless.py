@@ -0,0 +1,90 @@
+# headless.py - Simulation sans affichage ni dessin, entrées scriptées, aussi vite que possible
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import logging
+import random
+import time
+import pygame
+from game import Game
+from controls import InputFrame, ScriptedInput
+from timing import FIXED_DT
+from eventlog import setup
+from statehash import StateHasher
+from snapshot import load_game
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900
+MOVE_KEYS = (pygame.K_q, pygame.K_d, pygame.K_z, pygame.K_s)
+
+
+def wander_script(seed, hold_ticks=45):
+    """Bot simple : change de direction toutes les `hold_ticks`, attaque et ouvre les portes
+    au hasard. Les tirages ont leur propre générateur : le script est rejouable."""
+    rng = random.Random(seed)
+    state = {"held": ()}
+
+    def frame(tick):
+        if tick % hold_ticks == 0:
+            held = [key for key in MOVE_KEYS if rng.random() < 0.35]
+            if rng.random() < 0.3:
+                held.append(pygame.K_SPACE)
+            if rng.random() < 0.2:
+                held.append(pygame.K_e)
+            state["held"] = held
+        presses = (pygame.K_f,) if tick % 120 == 60 else ()
+        return InputFrame(state["held"], presses)
+
+    return frame
+
+
+def create_game(controls, seed=0):
+    """Jeu complet sur une surface hors écran : aucune fenêtre n'est ouverte"""
+    pygame.init()
+    return Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), controls, seed)
+
+
+def run(game, ticks, hasher=None):
+    """Joue `ticks` ticks de simulation sans dessiner ; retourne le débit obtenu.
+    `hasher` (StateHasher) prend l'empreinte de l'état à ses points de contrôle."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.step()
+        if hasher is not None:
+            hasher.update(game)
+    elapsed = time.perf_counter() - start
+    return {"ticks": ticks, "seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed else float("inf"),
+            "speedup": ticks * FIXED_DT / elapsed if elapsed else float("inf")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation sans affichage")
+    parser.add_argument("--ticks", type=int, default=3600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="afficher le journal du jeu")
+    parser.add_argument("--hash-every", type=int, default=0, metavar="N",
+                        help="empreinte de l'état toutes les N ticks (comparaison entre versions)")
+    parser.add_argument("--snapshot", metavar="FICHIER", help="partir d'une sauvegarde (F5, snapshot.py)")
+    args = parser.parse_args()
+
+    setup(logging.INFO if args.verbose else logging.WARNING)
+    game = create_game(ScriptedInput(wander_script(args.seed)), args.seed)
+    if args.snapshot:
+        load_game(game, args.snapshot)
+    hasher = StateHasher(args.hash_every) if args.hash_every else None
+    result = run(game, args.ticks, hasher)
+
+    print(f"{result['ticks']} ticks en {result['seconds']:.2f} s : "
+          f"{result['ticks_per_second']:.0f} ticks/s (x{result['speedup']:.1f} temps réel)")
+    print(f"joueur : {game.player.hp:.0f}/{game.player.max_hp} HP, "
+          f"ennemis vivants : {sum(1 for enemy in game.enemies if enemy.alive)}/{len(game.enemies)}")
+    if hasher is not None and hasher.history:
+        print(f"empreinte au tick {hasher.history[-1][0]} : {hasher.history[-1][1]} "
+              f"({len(hasher.history)} points de contrôle)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# level.py - Niveaux décrits en JSON, compilés en cache binaire (tableaux NumPy mappables)
+import os
+import sys
+import json
+import shutil
+import hashlib
+import numpy as np
+from eventlog import get_logger
+
+log = get_logger("level")
+
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+DEFAULT_LEVEL = os.path.join(LEVEL_DIR, "tus.json")
+CACHE_DIR = os.path.join(LEVEL_DIR, "__levelcache__")
+
+# À incrémenter dès que le format compilé change : invalide tous les caches
+FORMAT_VERSION = 1
+
+ENEMY_TYPES = ("normal", "patrol", "stationary")
+
+META_DTYPE = np.dtype([("name", "U64"), ("width", "i4"), ("height", "i4"),
+                       ("tile_size", "i4"), ("spawn_x", "f8"), ("spawn_y", "f8")])
+ROOM_DTYPE = np.dtype([("name", "U32"), ("x", "i4"), ("y", "i4"),
+                       ("w", "i4"), ("h", "i4"), ("unlocked", "?")])
+DOOR_DTYPE = np.dtype([("from", "i2"), ("to", "i2"), ("x", "i4"), ("y", "i4"),
+                       ("w", "i4"), ("h", "i4"), ("always_open", "?")])
+CHEST_DTYPE = np.dtype([("room", "i2"), ("x", "f8"), ("y", "f8")])
+ENEMY_DTYPE = np.dtype([("room", "i2"), ("x", "f8"), ("y", "f8"), ("type", "u1")])
+
+TABLES = ("meta", "tiles", "rooms", "doors", "chests", "enemies")
+
+
+class Level:
+    """Niveau compilé : tuiles de base (couloirs murés) et tables de spawn"""
+    def __init__(self, tables, source_hash):
+        self.source_hash = source_hash
+        meta = tables["meta"][0]
+        self.name = str(meta["name"])
+        self.width = int(meta["width"])
+        self.height = int(meta["height"])
+        self.tile_size = int(meta["tile_size"])
+        self.player_spawn = (float(meta["spawn_x"]), float(meta["spawn_y"]))
+
+        # Tableaux en lecture seule (mappés en mémoire quand ils viennent du cache)
+        self.tiles = tables["tiles"]
+        self.room_table = tables["rooms"]
+        self.door_table = tables["doors"]
+        self.chest_table = tables["chests"]
+        self.enemy_table = tables["enemies"]
+        self.room_names = [str(name) for name in self.room_table["name"]]
+
+    def create_rooms(self):
+        """Dictionnaires de salles neufs (l'état 'unlocked' est modifié en jeu)"""
+        return {
+            str(room["name"]): {"x": int(room["x"]), "y": int(room["y"]),
+                                "w": int(room["w"]), "h": int(room["h"]),
+                                "unlocked": bool(room["unlocked"])}
+            for room in self.room_table
+        }
+
+    def create_doors(self):
+        """Liste de portes neuve, au format utilisé par World"""
+        return [
+            {"from": self.room_names[door["from"]], "to": self.room_names[door["to"]],
+             "corridor": (int(door["x"]), int(door["y"]), int(door["w"]), int(door["h"])),
+             "always_open": bool(door["always_open"])}
+            for door in self.door_table
+        ]
+
+    def chest_positions(self):
+        """Position du coffre de chaque salle"""
+        return {self.room_names[chest["room"]]: (int(chest["x"]), int(chest["y"]))
+                for chest in self.chest_table}
+
+    def enemy_spawns(self):
+        """Liste (salle, x, y, type) dans l'ordre du fichier source"""
+        return [(self.room_names[spawn["room"]], float(spawn["x"]), float(spawn["y"]),
+                 ENEMY_TYPES[spawn["type"]])
+                for spawn in self.enemy_table]
+
+
+def compile_level(source):
+    """Compile la description JSON d'un niveau en tableaux NumPy"""
+    data = json.loads(source)
+    width = data["width"]
+    height = data["height"]
+
+    meta = np.array([(data.get("name", ""), width, height, data.get("tile_size", 32),
+                      data["player_spawn"][0], data["player_spawn"][1])], dtype=META_DTYPE)
+
+    room_index = {room["name"]: index for index, room in enumerate(data["rooms"])}
+    rooms = np.array([(room["name"], room["x"], room["y"], room["w"], room["h"],
+                       room.get("unlocked", False)) for room in data["rooms"]], dtype=ROOM_DTYPE)
+    doors = np.array([(room_index[door["from"]], room_index[door["to"]], *door["corridor"],
+                       door.get("always_open", False)) for door in data["doors"]], dtype=DOOR_DTYPE)
+    chests = np.array([(room_index[room_name], x, y)
+                       for room_name, (x, y) in data.get("chests", {}).items()], dtype=CHEST_DTYPE)
+    enemies = np.array([(room_index[room_name], x, y, ENEMY_TYPES.index(enemy_type))
+                        for room_name, spawns in data.get("enemies", {}).items()
+                        for x, y, enemy_type in spawns], dtype=ENEMY_DTYPE)
+
+    # Tuiles de base : murs partout, salles creusées, piliers posés.
+    # Les couloirs restent murés, World les ouvre selon l'état des portes.
+    tiles = np.ones((height, width), dtype=np.uint8)
+    for room in rooms:
+        tiles[max(0, room["y"]):room["y"] + room["h"], max(0, room["x"]):room["x"] + room["w"]] = 0
+    for x, y in data.get("obstacles", []):
+        if 0 <= x < width and 0 <= y < height:
+            tiles[y, x] = 1
+
+    return {"meta": meta, "tiles": tiles, "rooms": rooms, "doors": doors,
+            "chests": chests, "enemies": enemies}
+
+
+def source_digest(source):
+    """Clé du cache : empreinte du contenu source et de la version du format"""
+    return hashlib.sha1(b"%d:" % FORMAT_VERSION + source).hexdigest()
+
+
+def load_level(path=DEFAULT_LEVEL, cache_dir=CACHE_DIR):
+    """Charge un niveau depuis son cache compilé, en le (re)compilant si la source a changé"""
+    with open(path, "rb") as level_file:
+        source = level_file.read()
+    digest = source_digest(source)
+    # Une entrée par niveau et par version de sa source : <nom du fichier>-<empreinte>
+    stem = os.path.splitext(os.path.basename(path))[0]
+    entry = os.path.join(cache_dir, "%s-%s" % (stem, digest))
+
+    tables = None
+    if os.path.isdir(entry):
+        try:
+            tables = {name: np.load(os.path.join(entry, name + ".npy"), mmap_mode="r")
+                      for name in TABLES}
+        except (OSError, ValueError) as error:
+            log.warning("Cache de niveau illisible (%s), recompilation : %s", entry, error)
+            tables = None  # Cache corrompu ou incomplet : recompiler
+
+    if tables is None:
+        tables = compile_level(source)
+        write_cache(entry, tables)
+        prune_cache(cache_dir, stem, entry)
+    return Level(tables, digest)
+
+
+def write_cache(entry, tables):
+    """Écrit les tables compilées ; le dossier n'apparaît qu'une fois complet.
+    Une entrée existante (corrompue, puisqu'on recompile) est remplacée."""
+    staging = "%s.%d.tmp" % (entry, os.getpid())
+    try:
+        os.makedirs(staging, exist_ok=True)
+        for name in TABLES:
+            np.save(os.path.join(staging, name + ".npy"), tables[name])
+        # os.replace refuse un dossier cible non vide
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+    except OSError as error:
+        # Dossier en lecture seule, disque plein... : le cache est facultatif, le niveau reste chargé
+        log.warning("Cache de niveau non écrit (%s) : %s", entry, error)
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def prune_cache(cache_dir, stem, entry):
+    """Supprime les entrées du même niveau compilées depuis une ancienne version de la source,
+    et celles de l'ancien nommage (empreinte seule). Les dossiers temporaires (.tmp) d'une
+    écriture en cours sont laissés."""
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        prefix, _, digest = name.rpartition("-")
+        if prefix in (stem, "") and len(digest) == 40 and path != entry:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # Précompile les niveaux passés en argument (ou le niveau par défaut)
+    for level_path in sys.argv[1:] or [DEFAULT_LEVEL]:
+        level = load_level(level_path)
+        print(f"{level_path}: {level.name} ({level.width}x{level.height}, "
+              f"{len(level.enemy_table)} ennemis) -> {level.source_hash}")
@@ -1,7 +1,8 @@
 # loot.py - Suppression des potions de stamina
 import pygame
-import random
-import time
+from eventlog import get_logger
+
+log = get_logger("loot")
 
 class Skill:
     def __init__(self, name, description, effect_type, effect_value, key_binding=None):
@@ -31,20 +32,16 @@ class Chest:
         # Ne pas générer le loot à la création, mais à l'ouverture
         self.loot_generated = False
     
-    def generate_loot(self):
-        """Génère un loot aléatoire - Version corrigée pour vraie aléatoire"""
+    def generate_loot(self, rng):
+        """Génère un loot aléatoire - tiré de `rng`, le générateur propre au coffre"""
         if self.loot_generated:
             return  # Déjà généré
         
-        # Utiliser une combinaison unique pour chaque coffre
-        unique_seed = hash((self.x, self.y, time.time()))
-        random.seed(unique_seed & 0x7FFFFFFF)  # Garder positif
-        
-        print(f"Génération loot pour coffre en ({self.x}, {self.y}) avec seed {unique_seed}")
+        log.debug("Génération du loot du coffre en (%s, %s)", self.x, self.y)
         
         # Choix du type de loot
-        loot_type = random.choice(["skill", "weapon", "potion"])
-        print(f"Type choisi: {loot_type}")
+        loot_type = rng.choice(["skill", "weapon", "potion"])
+        log.debug("Type choisi : %s", loot_type)
         
         if loot_type == "skill":
             skills = [
@@ -56,8 +53,8 @@ class Chest:
                 Skill("Critique", "25% chance dégâts x2", "crit", 0.25),
                 Skill("Vampirisme", "+10 HP par ennemi tué", "vampire", 10)
             ]
-            self.contents = random.choice(skills)
-            print(f"Compétence choisie: {self.contents.name}")
+            self.contents = rng.choice(skills)
+            log.info("Coffre : compétence %s", self.contents.name)
         
         elif loot_type == "weapon":
             weapons = [
@@ -66,25 +63,24 @@ class Chest:
                 Weapon("Arc de Précision", "bow", damage_bonus=5, range_bonus=150),
                 Weapon("Lame Maudite", "sword", damage_bonus=20, range_bonus=30)
             ]
-            self.contents = random.choice(weapons)
-            print(f"Arme choisie: {self.contents.name} ({self.contents.weapon_type})")
+            self.contents = rng.choice(weapons)
+            log.info("Coffre : arme %s (%s)", self.contents.name, self.contents.weapon_type)
         
         else:  # potion
             potions = ["Potion de Vie", "Potion Complète"]
-            self.contents = random.choice(potions)
-            print(f"Potion choisie: {self.contents}")
+            self.contents = rng.choice(potions)
+            log.info("Coffre : %s", self.contents)
         
         self.loot_generated = True
-        # Remettre le random à un état normal
-        random.seed()
     
-    def open(self, player):
+    def open(self, player, rng):
+        """Ouvre le coffre ; `rng` sert à tirer son contenu s'il n'est pas encore généré"""
         if self.opened:
             return None
         
         # Générer le loot au moment de l'ouverture pour plus d'aléatoire
         if not self.loot_generated:
-            self.generate_loot()
+            self.generate_loot(rng)
         
         self.opened = True
         return self.contents
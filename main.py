@@ -1,31 +1,88 @@
+import argparse
 import pygame
+import random
 import sys
 from game import Game
+from timing import FixedTimestep
+from controls import KeyboardInput
+from replay import Recorder
+from snapshot import save_game, quicksave, quickload, CRASH_PATH
+from profiler import profiler
+from eventlog import get_logger, setup
+
+log = get_logger("main")
+
+parser = argparse.ArgumentParser(description="The Curse of Tus")
+parser.add_argument("--record", metavar="FICHIER", help="enregistrer la partie (rejouer avec replay.py)")
+parser.add_argument("--seed", type=int, help="graine de la partie (aléatoire par défaut)")
+args = parser.parse_args()
+setup()
 
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900
+MAX_RENDER_FPS = 144  # Le rendu peut dépasser 60 Hz : les images entre deux ticks sont interpolées
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("The Curse of Tus - Boss Edition")
 
-game = Game(screen)
+# Graine connue : une partie enregistrée se rejoue à l'identique avec les mêmes entrées
+seed = args.seed if args.seed is not None else random.randrange(2**32)
+controls = Recorder(KeyboardInput(), seed) if args.record else KeyboardInput()
+
+game = Game(screen, controls, seed)
 clock = pygame.time.Clock()
+timestep = FixedTimestep()
+
+
+def crash_save(exc_type, exc_value, exc_traceback):
+    """Erreur non rattrapée : sauvegarde de secours (et replay en cours) avant la trace"""
+    try:
+        save_game(game, CRASH_PATH)
+        log.critical("Plantage : partie sauvegardée dans %s", CRASH_PATH)
+        if args.record:
+            controls.replay.save(args.record)
+    finally:
+        sys.__excepthook__(exc_type, exc_value, exc_traceback)
+
+
+sys.excepthook = crash_save
+
+
+def handle_system_key(key):
+    """Touches hors simulation (profileur, sauvegarde) : traitées ici, jamais transmises à
+    Game.step ni enregistrées, pour qu'un replay ne touche ni aux fichiers ni à l'overlay"""
+    if key == pygame.K_F3:
+        profiler.toggle()
+    elif key == pygame.K_F5:
+        quicksave(game)
+        game.show_loot_message("Partie sauvegardée", (0, 255, 255))
+    elif key == pygame.K_F9:
+        if args.record:
+            # L'état chargé ne viendrait pas des entrées : le replay ne se rejouerait plus
+            game.show_loot_message("Chargement désactivé pendant l'enregistrement", (255, 100, 100))
+        elif quickload(game):
+            game.show_loot_message("Partie chargée", (0, 255, 255))
+    else:
+        return False
+    return True
 
 while True:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            if args.record:
+                controls.replay.save(args.record)
             pygame.quit()
             sys.exit()
-        elif event.type == pygame.KEYDOWN:  
-            game.handle_key_press(event.key)
-            if event.key == pygame.K_LCTRL:
-                game.player.dash(game.world)
+        elif event.type == pygame.KEYDOWN and not handle_system_key(event.key):
+            # Traité au prochain tick (Game.step), comme au rejeu
+            controls.press(event.key)
     
-    game.update()
-    game.draw()
+    # Simulation à pas fixe : 0, 1 ou plusieurs ticks selon le temps réel écoulé
+    for _ in range(timestep.advance(clock.tick(MAX_RENDER_FPS) / 1000)):
+        game.step()
+    game.draw(timestep.alpha)
     
     # Victoire seulement si les 2 boss ont été spawnés ET vaincus
     if game.all_bosses_defeated() and game.player.alive:
         game.ui.draw_victory_screen(screen)
     
     pygame.display.flip()
-    clock.tick(60)
\ No newline at end of file
@@ -0,0 +1,113 @@
+# particles.py - Particules d'effets visuels stockées en tableaux, dessinées en un seul blits
+import numpy as np
+import pygame
+from timing import FIXED_DT
+
+
+class ParticleSystem:
+    """Particules en colonnes préallouées, vivantes dans [0, count) dans l'ordre d'émission.
+    Le budget est fixe : au-delà de `capacity`, les nouvelles particules sont ignorées,
+    ce qui borne le coût par frame pendant les combats de boss.
+    Les sprites (couleur, taille, niveau d'alpha) sont construits une fois puis réutilisés."""
+    COLUMNS = {
+        "x": np.float64, "y": np.float64, "vx": np.float64, "vy": np.float64,
+        "creation_time": np.float64, "lifetime": np.float64,
+        "color": np.uint8, "size": np.uint8,
+    }
+
+    def __init__(self, capacity=512, alpha_levels=16):
+        self.capacity = capacity
+        self.alpha_levels = alpha_levels
+        self.count = 0
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.palette = []         # Couleurs RGB, indexées par la colonne `color`
+        self.palette_index = {}   # couleur -> index dans la palette
+        self.sprites = {}         # (couleur, taille, niveau d'alpha) -> Surface
+
+        # Compteurs pour les benchmarks
+        self.emitted = 0
+        self.dropped = 0          # Particules refusées faute de budget
+        self.sprites_built = 0
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x, y, velocity_x, velocity_y, lifetime, creation_time, color, size):
+        """Ajoute une particule ; retourne False si le budget est atteint"""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return False
+        color_index = self.palette_index.get(color)
+        if color_index is None:
+            color_index = self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = velocity_x
+        self.vy[i] = velocity_y
+        self.lifetime[i] = lifetime
+        self.creation_time[i] = creation_time
+        self.color[i] = color_index
+        self.size[i] = size
+        self.count += 1
+        self.emitted += 1
+        return True
+
+    def update(self, current_time):
+        """Retire les particules expirées (en gardant l'ordre) puis avance les autres d'un tick"""
+        n = self.count
+        if n == 0:
+            return
+        keep = current_time - self.creation_time[:n] < self.lifetime[:n]
+        kept = int(np.count_nonzero(keep))
+        if kept < n:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[:kept] = column[:n][keep]
+            self.count = n = kept
+
+        self.x[:n] += self.vx[:n] * FIXED_DT
+        self.y[:n] += self.vy[:n] * FIXED_DT
+
+    def clear(self):
+        self.count = 0
+
+    def sprite(self, color_index, size, level):
+        key = (color_index, size, level)
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = pygame.Surface((size, size))
+            surface.fill(self.palette[color_index])
+            surface.set_alpha(level * 255 // self.alpha_levels)
+            self.sprites[key] = surface
+            self.sprites_built += 1
+        return surface
+
+    def draw(self, screen, camera_x, camera_y, current_time, alpha=1.0):
+        """Dessine toutes les particules visibles en un seul appel à blits. `alpha` (fraction
+        du tick suivant déjà écoulée) recule l'image entre les deux derniers ticks : une
+        particule avance en ligne droite, sa position précédente est x - vx * dt."""
+        n = self.count
+        if n == 0:
+            return
+        lag = (1.0 - alpha) * FIXED_DT
+        current_time -= lag
+        # Alpha décroissant avec l'âge, arrondi au niveau supérieur (jamais 0 pour une particule vivante)
+        ratio = (current_time - self.creation_time[:n]) / self.lifetime[:n]
+        alpha = (255 * (1 - ratio)).astype(np.int32)
+        visible = np.flatnonzero(alpha > 0)
+        if len(visible) == 0:
+            return
+        levels = -(-alpha[visible] * self.alpha_levels // 255)
+
+        sprite = self.sprite
+        blits = [(sprite(color, size, level), (x, y))
+                 for color, size, level, x, y in zip(self.color[visible].tolist(),
+                                                     self.size[visible].tolist(),
+                                                     levels.tolist(),
+                                                     (self.x[visible] - self.vx[visible] * lag - camera_x).tolist(),
+                                                     (self.y[visible] - self.vy[visible] * lag - camera_y).tolist())]
+        screen.blits(blits, doreturn=False)
@@ -0,0 +1,161 @@
+# pathfinding.py - Champ de flux partagé par les ennemis qui poursuivent le joueur
+from collections import deque
+import numpy as np
+
+# Voisins (dx, dy) : 4 directions puis diagonales
+NEIGHBORS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# Mode de chaque tuile du champ
+UNREACHED = 0  # Hors rayon ou inaccessible : aller tout droit
+DIRECT = 1     # La cible est en vue : aller tout droit
+FOLLOW = 2     # Obstacle entre la tuile et la cible : viser le centre de la tuile suivante
+
+
+class FlowField:
+    """Champ de flux calculé par BFS autour de la tuile du joueur.
+    Reconstruit seulement quand le joueur change de tuile ou que la carte change, et
+    seulement à la première lecture qui suit : sans poursuivant à portée, aucun calcul.
+    Chaque ennemi n'a ensuite qu'une lecture de grille à faire."""
+    def __init__(self, world, radius=10):
+        self.world = world
+        self.radius = radius  # Rayon de calcul en tuiles (les ennemis suivent à moins de 200 px)
+        self.mode = np.zeros((world.height, world.width), dtype=np.uint8)
+        # Centre (en pixels) de la tuile suivante sur le plus court chemin
+        self.next_x = np.zeros((world.height, world.width), dtype=np.float32)
+        self.next_y = np.zeros((world.height, world.width), dtype=np.float32)
+        # Vues à plat pour les lectures unitaires (une par ennemi et par frame)
+        self.mode_cells = memoryview(self.mode).cast("B")
+        self.next_x_cells = memoryview(self.next_x).cast("B").cast("f")
+        self.next_y_cells = memoryview(self.next_y).cast("B").cast("f")
+        self.target_tile = None
+        self.pending_tile = None  # Tuile de la cible au dernier update(), calculée à la demande
+        self.tile_version = -1
+        self.rebuild_count = 0
+        self.window = None  # (x0, y0, x1, y1) de la dernière zone calculée
+
+    def update(self, target_x, target_y):
+        """Note la position de la cible ; retourne True si le champ devra être recalculé
+        (cible sur une autre tuile ou tuiles modifiées) à la prochaine lecture"""
+        self.pending_tile = (int(target_x // self.world.tile_size), int(target_y // self.world.tile_size))
+        return self.pending_tile != self.target_tile or self.world.tile_version != self.tile_version
+
+    def refresh(self):
+        """Recalcule le champ s'il ne correspond plus à la dernière cible notée"""
+        tile = self.pending_tile
+        if tile is None or (tile == self.target_tile and self.world.tile_version == self.tile_version):
+            return
+        self.rebuild(tile)
+
+    def rebuild(self, tile):
+        world = self.world
+        self.target_tile = tile
+        self.tile_version = world.tile_version
+        self.rebuild_count += 1
+
+        # Effacer seulement la zone précédente
+        if self.window is not None:
+            x0, y0, x1, y1 = self.window
+            self.mode[y0:y1, x0:x1] = UNREACHED
+
+        target_x, target_y = tile
+        if not (0 <= target_x < world.width and 0 <= target_y < world.height):
+            self.window = None
+            return
+
+        x0 = max(0, target_x - self.radius)
+        y0 = max(0, target_y - self.radius)
+        x1 = min(world.width, target_x + self.radius + 1)
+        y1 = min(world.height, target_y + self.radius + 1)
+        self.window = (x0, y0, x1, y1)
+
+        # BFS 8-connexe depuis la cible, sans couper les coins des murs
+        # (tableaux à plat de la taille de la fenêtre pendant le parcours)
+        tiles = world.tiles
+        stride = world.width
+        window_width = x1 - x0
+        visited = bytearray(window_width * (y1 - y0))
+        visited[(target_y - y0) * window_width + target_x - x0] = 1
+        reached = []  # (index fenêtre, tuile suivante x, tuile suivante y)
+        queue = deque([(target_x, target_y)])
+
+        while queue:
+            x, y = queue.popleft()
+            for step_x, step_y in NEIGHBORS:
+                nx = x + step_x
+                ny = y + step_y
+                if not (x0 <= nx < x1 and y0 <= ny < y1):
+                    continue
+                index = (ny - y0) * window_width + nx - x0
+                if visited[index] or tiles[ny * stride + nx]:
+                    continue
+                if step_x and step_y and (tiles[y * stride + nx] or tiles[ny * stride + x]):
+                    continue
+                # Depuis (nx, ny), le chemin le plus court passe par (x, y)
+                visited[index] = 1
+                reached.append((index, x, y))
+                queue.append((nx, ny))
+
+        size = world.tile_size
+        mode = np.zeros((y1 - y0, window_width), dtype=np.uint8)
+        next_x = np.zeros(mode.shape, dtype=np.float32)
+        next_y = np.zeros(mode.shape, dtype=np.float32)
+        mode[target_y - y0, target_x - x0] = DIRECT
+        if reached:
+            index, parent_x, parent_y = np.array(reached, dtype=np.intp).T
+            mode.flat[index] = FOLLOW
+            next_x.flat[index] = (parent_x + 0.5) * size
+            next_y.flat[index] = (parent_y + 0.5) * size
+
+        # Tuiles atteintes avec la cible en vue : tout droit (trajectoire d'origine)
+        reached_y, reached_x = np.nonzero(mode == FOLLOW)
+        if len(reached_x):
+            visible = self.line_of_sight(reached_x + x0, reached_y + y0, target_x, target_y)
+            mode[reached_y[visible], reached_x[visible]] = DIRECT
+
+        self.mode[y0:y1, x0:x1] = mode
+        self.next_x[y0:y1, x0:x1] = next_x
+        self.next_y[y0:y1, x0:x1] = next_y
+
+    def line_of_sight(self, tiles_x, tiles_y, target_x, target_y, clearance=0.75):
+        """Masque des tuiles d'où l'on peut aller tout droit vers la cible : le segment
+        de centre à centre et ses deux parallèles décalées (largeur d'un corps) ne
+        traversent aucun mur"""
+        size = self.world.tile_size
+        steps = np.linspace(0.0, 1.0, 3 * self.radius + 2)[:, None]
+        start_x = (tiles_x + 0.5) * size
+        start_y = (tiles_y + 0.5) * size
+        delta_x = (target_x + 0.5) * size - start_x
+        delta_y = (target_y + 0.5) * size - start_y
+        length = np.maximum(np.hypot(delta_x, delta_y), 1e-6)
+        normal_x = -delta_y / length * clearance * size
+        normal_y = delta_x / length * clearance * size
+
+        visible = np.ones(len(tiles_x), dtype=bool)
+        for offset in (0.0, 1.0, -1.0):
+            points_x = start_x + normal_x * offset + delta_x * steps
+            points_y = start_y + normal_y * offset + delta_y * steps
+            visible &= ~self.world.points_hit_wall(points_x, points_y).any(axis=0)
+        return visible
+
+    def waypoint_at(self, x, y):
+        """Point (centre de la tuile suivante) à viser depuis une position, ou None pour aller tout droit"""
+        self.refresh()
+        tile_x = int(x // self.world.tile_size)
+        tile_y = int(y // self.world.tile_size)
+        if not (0 <= tile_x < self.world.width and 0 <= tile_y < self.world.height):
+            return None
+        cell = tile_y * self.world.width + tile_x
+        if self.mode_cells[cell] != FOLLOW:
+            return None
+        return self.next_x_cells[cell], self.next_y_cells[cell]
+
+    def waypoints_at(self, xs, ys):
+        """Version vectorisée : (next_x, next_y, follow) ; follow=False signifie aller tout droit"""
+        self.refresh()
+        tile_x = np.floor_divide(xs, self.world.tile_size).astype(np.intp)
+        tile_y = np.floor_divide(ys, self.world.tile_size).astype(np.intp)
+        inside = (tile_x >= 0) & (tile_x < self.world.width) & (tile_y >= 0) & (tile_y < self.world.height)
+        tile_x = np.clip(tile_x, 0, self.world.width - 1)
+        tile_y = np.clip(tile_y, 0, self.world.height - 1)
+        follow = (self.mode[tile_y, tile_x] == FOLLOW) & inside
+        return self.next_x[tile_y, tile_x], self.next_y[tile_y, tile_x], follow
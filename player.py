@@ -1,74 +1,27 @@
 import pygame
 import math
-import time
+from projectiles import slot_column, ProjectileView, ARROW
+from timing import FIXED_DT, NEVER
+from controls import KeyboardInput
+from eventlog import get_logger
 
-class PlayerProjectile:
-    def __init__(self, x, y, dx, dy, damage, max_range):
-        self.x = x
-        self.y = y
-        self.start_x = x
-        self.start_y = y
-        self.speed = 200  
-        self.lifetime = 3.0  # 3 secondes de vie
-        self.creation_time = time.time()
-        self.damage = damage
-        self.max_range = max_range
-        self.width = 6
-        self.height = 6
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-        
-        # Direction normalisée
-        self.velocity_x = dx * self.speed
-        self.velocity_y = dy * self.speed
-    
-    def update(self, world, enemies):
-        current_time = time.time()
-        
-        # Vérifier si le projectile doit disparaître
-        if current_time - self.creation_time >= self.lifetime:
-            return False
-        
-        # Déplacer le projectile
-        dt = 1/60  # 60 FPS
-        new_x = self.x + self.velocity_x * dt
-        new_y = self.y + self.velocity_y * dt
-        
-        # Vérifier la portée max
-        distance = math.sqrt((new_x - self.start_x)**2 + (new_y - self.start_y)**2)
-        if distance > self.max_range:
-            return False
-        
-        # Vérifier collision avec les murs
-        if self.check_collision(new_x, new_y, world):
-            return False  # Détruire si collision mur
-        
-        # Mettre à jour la position
-        self.x = new_x
-        self.y = new_y
-        self.rect.x = int(self.x)
-        self.rect.y = int(self.y)
-        
-        # Collision avec les ennemis
-        for enemy in enemies:
-            if enemy.alive and self.rect.colliderect(enemy.rect):
-                enemy.take_damage(self.damage)
-                print(f"Flèche touche ennemi : {self.damage} dégâts")
-                return False  # Détruire après impact
-        
-        return True
+log = get_logger("player")
+
+class PlayerProjectile(ProjectileView):
+    """Flèche tirée par l'arc du joueur"""
+    speed = 200
+    lifetime = 3.0  # 3 secondes de vie
+    width = 6
+    height = 6
+    start_x = slot_column("start_x")
+    start_y = slot_column("start_y")
+    max_range = slot_column("max_range")
     
-    def check_collision(self, x, y, world):
-        corners = [(x, y), (x + self.width, y), 
-                  (x, y + self.height), (x + self.width, y + self.height)]
-        
-        for corner_x, corner_y in corners:
-            grid_x = int(corner_x // world.tile_size)
-            grid_y = int(corner_y // world.tile_size)
-            
-            if (0 <= grid_x < world.width and 0 <= grid_y < world.height and 
-                world.map[grid_y][grid_x] == 1):
-                return True
-        return False
+    @classmethod
+    def spawn(cls, engine, x, y, dx, dy, damage, max_range):
+        """Tire une flèche (direction normalisée dx, dy) dans le moteur de projectiles de la partie"""
+        return engine.add(cls, ARROW, x, y, dx * cls.speed, dy * cls.speed, cls.width, cls.height,
+                          cls.lifetime, damage=damage, max_range=max_range)
     
     def draw(self, screen, camera_x, camera_y):
         screen_x = int(self.x - camera_x)
@@ -77,7 +30,8 @@ class PlayerProjectile:
 
 
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock):
+        self.clock = clock  # Horloge de simulation de la partie
         self.x = x
         self.y = y
         self.width = 27
@@ -94,14 +48,15 @@ class Player:
         self.attack_range = 35  
         
         # Timers - Cooldowns différents selon l'arme
-        self.last_attack_time = 0
+        self.last_attack_time = NEVER
         self.melee_cooldown = 0.5
         self.bow_cooldown = 1.2
-        self.last_damage_time = 0
+        self.last_damage_time = NEVER
         self.damage_cooldown = 1.0
 
         self.alive = True
         self.game_ref = None
+        self.controls = KeyboardInput()  # Remplacé par Game (entrées scriptées en mode sans affichage)
     
     def set_game_reference(self, game):
         """Permet au joueur d'accéder aux méthodes de vérification du jeu"""
@@ -111,7 +66,7 @@ class Player:
         if not self.alive:
             return
         
-        current_time = time.time()
+        current_time = self.clock.now
         
         # Gestion du dash SEULEMENT si les attributs existent
         if hasattr(self, 'is_dashing') and self.is_dashing:
@@ -121,15 +76,15 @@ class Player:
             else:
                 # Mouvement de dash
                 dash_speed = self.dash_distance / self.dash_duration
-                dx = self.dash_direction[0] * dash_speed * (1/60)
-                dy = self.dash_direction[1] * dash_speed * (1/60)
+                dx = self.dash_direction[0] * dash_speed * FIXED_DT
+                dy = self.dash_direction[1] * dash_speed * FIXED_DT
                 
-                new_x = self.x + dx
-                new_y = self.y + dy
-                
-                if not self.check_collision(new_x, self.y, world):
+                # Balayage par axe : le dash s'arrête contre le mur au lieu de le sauter
+                new_x = self.sweep_axis(world, dx, 0)
+                if not self.check_door_collision(new_x, self.y, world):
                     self.x = new_x
-                if not self.check_collision(self.x, new_y, world):
+                new_y = self.sweep_axis(world, 0, dy)
+                if not self.check_door_collision(self.x, new_y, world):
                     self.y = new_y
                 
                 self.rect.x = int(self.x)
@@ -137,7 +92,7 @@ class Player:
                 return  # Skip le mouvement normal pendant le dash
         
         # Mouvement normal (seulement si pas en dash)
-        keys = pygame.key.get_pressed()
+        keys = self.controls.keys()
         dx, dy = 0, 0
         
         if keys[pygame.K_LEFT] or keys[pygame.K_q]:
@@ -160,11 +115,11 @@ class Player:
             
             # Consommer stamina si sprint
             if is_sprinting:
-                self.stamina -= 30 * (1/60)
+                self.stamina -= 30 * FIXED_DT
         
         # Régénération stamina (seulement si pas de sprint)
         if not is_sprinting:
-            self.stamina = min(self.max_stamina, self.stamina + 50 * (1/60))
+            self.stamina = min(self.max_stamina, self.stamina + 50 * FIXED_DT)
         
         # Mouvement avec collision
         new_x = self.x + dx
@@ -183,7 +138,7 @@ class Player:
             self.attack(enemies, weapon, player_projectiles)
     
     def attack(self, enemies, weapon=None, player_projectiles=None):
-        current_time = time.time()
+        current_time = self.clock.now
         
         # Cooldown différent selon l'arme
         if weapon and weapon.weapon_type == "bow":
@@ -197,26 +152,21 @@ class Player:
         self.last_attack_time = current_time
         self.last_weapon_used = weapon  # Tracker la dernière arme utilisée
         
-        print(f"=== ATTAQUE ===")
-        print(f"Arme: {weapon.name if weapon else 'Aucune'}")
-        print(f"Type: {weapon.weapon_type if weapon else 'corps à corps'}")
-        print(f"Cooldown utilisé: {attack_cooldown}")
-        print(f"Projectiles liste: {player_projectiles is not None}")
-        if player_projectiles is not None:
-            print(f"Nb projectiles actuels: {len(player_projectiles)}")
+        log.debug("Attaque : %s (%s), cooldown %s",
+                  weapon.name if weapon else "Aucune",
+                  weapon.weapon_type if weapon else "corps à corps", attack_cooldown)
         
         # Si c'est un arc, tirer une flèche
         if weapon and weapon.weapon_type == "bow":
             if player_projectiles is not None:
                 success = self.shoot_arrow(weapon, player_projectiles)
-                print(f"Tir réussi: {success}")
+                log.debug("Tir réussi : %s", success)
                 return success
             else:
-                print("ERREUR: Liste de projectiles manquante pour l'arc !")
+                log.error("Liste de projectiles manquante pour l'arc")
                 return False
         else:
             # Attaque au corps à corps normale
-            print("Attaque corps à corps")
             attacked_enemies = []
             for enemy in enemies:
                 if not enemy.alive:
@@ -242,16 +192,14 @@ class Player:
                     
                     # Affichage des dégâts
                     if is_critical:
-                        print(f"Coup critique ! {damage} dégâts")
+                        log.debug("Coup critique ! %s dégâts", damage)
                     else:
-                        print(f"{damage} dégâts")
+                        log.debug("%s dégâts", damage)
             
             return len(attacked_enemies) > 0
         
     def shoot_arrow(self, weapon, player_projectiles):
         """Tire une salve de projectiles à 360° avec l'arc - Version simplifiée"""
-        print(f"=== TIR D'ARC AVEC {weapon.name} ===")
-        
         # Calculer les dégâts
         arrow_damage = weapon.damage_bonus + self.attack_damage
         arrow_range = weapon.range_bonus + 150  # Portée de base des flèches
@@ -260,7 +208,6 @@ class Player:
         if self.game_ref and self.game_ref.check_critical_hit():
             arrow_damage *= 2
             self.game_ref.show_loot_message("FLÈCHES CRITIQUES !", (255, 255, 0))
-            print("CRITIQUE !")
         
         # Créer 8 projectiles à 360°
         num_arrows = 8
@@ -273,10 +220,9 @@ class Player:
             dx = math.cos(angle)
             dy = math.sin(angle)
             
-            print(f"Créé flèche {i+1}: angle={angle:.2f}, dx={dx:.2f}, dy={dy:.2f}")
-            
             # Créer le projectile (copie de la logique des ennemis)
-            arrow = PlayerProjectile(
+            arrow = PlayerProjectile.spawn(
+                player_projectiles.engine,
                 center_x - 3,  # Centrer le projectile
                 center_y - 3,
                 dx, dy,
@@ -285,12 +231,12 @@ class Player:
             )
             player_projectiles.append(arrow)
         
-        print(f"Créé {num_arrows} flèches de {arrow_damage} dégâts, portée {arrow_range}")
-        print(f"Total projectiles joueur: {len(player_projectiles)}")
+        log.debug("Tir d'arc avec %s : %s flèches de %s dégâts, portée %s",
+                  weapon.name, num_arrows, arrow_damage, arrow_range)
         return True
     
     def take_damage(self, damage):
-        current_time = time.time()
+        current_time = self.clock.now
         if current_time - self.last_damage_time < self.damage_cooldown:
             return  # Invincible
         
@@ -301,78 +247,78 @@ class Player:
             self.alive = False
     
     def check_collision(self, x, y, world):
-        # Vérifier les 4 coins du joueur
-        corners = [
-            (x, y),
-            (x + self.width, y),
-            (x, y + self.height),
-            (x + self.width, y + self.height)
-        ]
-        
-        for corner_x, corner_y in corners:
-            grid_x = int(corner_x // world.tile_size)
-            grid_y = int(corner_y // world.tile_size)
-            
-            if (0 <= grid_x < world.width and 0 <= grid_y < world.height and 
-                world.map[grid_y][grid_x] == 1):
-                return True
+        # Murs : une seule requête sur la grille pour toute la boîte du joueur
+        if world.rect_hits_wall(x, y, self.width, self.height):
+            return True
         
         return self.check_door_collision(x, y, world)
     
+    def sweep_axis(self, world, dx, dy):
+        """Coordonnée atteinte en se déplaçant sur un seul axe, au contact du premier mur"""
+        hit = world.sweep_box(self.x, self.y, self.width, self.height, dx, dy)
+        if hit is None:
+            return self.x + dx if dx else self.y + dy
+        t, (grid_x, grid_y) = hit
+        if t == 0.0:
+            return self.x if dx else self.y  # Déjà dans un mur : ne pas bouger
+        size = world.tile_size
+        # Bords droit et bas inclus : s'arrêter juste avant la tuile touchée
+        if dx > 0:
+            return max(self.x, grid_x * size - self.width - 0.01)
+        if dx < 0:
+            return (grid_x + 1) * size
+        if dy > 0:
+            return max(self.y, grid_y * size - self.height - 0.01)
+        return (grid_y + 1) * size
+    
     def check_door_collision(self, x, y, world):
         """Empêche le joueur de traverser les portes fermées - LOGIQUE FINALE CORRIGÉE"""
-        player_tile_x = int(x // world.tile_size)
-        player_tile_y = int(y // world.tile_size)
+        # Couloir sous la position visée (une seule lecture de la grille des couloirs)
+        door = world.get_door_at(x, y)
+        if door is None:
+            return False  # Pas dans un couloir = pas de collision de porte
         
         # D'abord, déterminer la salle actuelle du joueur
         current_room = world.get_player_room(self.x, self.y)
         
-        for door in world.doors:
-            corridor = door["corridor"]
-            from_room = world.rooms[door["from"]]
-            to_room = world.rooms[door["to"]]
-            
-            # Si le joueur essaie d'entrer dans le couloir
-            if (corridor[0] <= player_tile_x < corridor[0] + corridor[2] and
-                corridor[1] <= player_tile_y < corridor[1] + corridor[3]):
-                
-                # CAS 1: Si les DEUX salles sont déverrouillées -> PASSAGE LIBRE (porte verte)
-                if from_room["unlocked"] and to_room["unlocked"]:
-                    print(f"Porte verte {door['from']} ↔ {door['to']} - Passage libre")
-                    return False  # Pas de collision = passage autorisé
-                
-                # Déterminer vers quelle salle le joueur essaie d'aller
-                if current_room == door["from"]:
-                    # Le joueur va de "from" vers "to"
-                    target_room_name = door["to"]
-                    target_room = to_room
-                    origin_room = from_room
-                elif current_room == door["to"]:
-                    # Le joueur va de "to" vers "from"
-                    target_room_name = door["from"]
-                    target_room = from_room
-                    origin_room = to_room
-                else:
-                    # Le joueur n'est dans aucune des salles connectées
-                    print(f"Joueur dans couloir sans salle d'origine identifiée - Bloquer")
-                    return True
-                
-                # CAS 2: Si la salle d'origine n'est pas déverrouillée -> BLOQUER
-                if not origin_room["unlocked"]:
-                    print(f"Salle d'origine {current_room} non déverrouillée - Bloquer")
-                    return True
-                
-                # CAS 3: Si la salle de destination n'est pas déverrouillée -> BLOQUER
-                # (Le joueur doit d'abord nettoyer sa salle actuelle et utiliser F pour ouvrir)
-                if not target_room["unlocked"]:
-                    print(f"Salle destination {target_room_name} fermée - Bloquer passage")
-                    return True
-                
-                # CAS 4: Si on arrive ici, les deux salles sont déverrouillées -> PERMETTRE
-                print(f"Passage autorisé de {current_room} vers {target_room_name}")
-                return False
-        
-        return False  # Pas dans un couloir = pas de collision de porte
+        from_room = world.rooms[door["from"]]
+        to_room = world.rooms[door["to"]]
+        
+        # CAS 1: Si les DEUX salles sont déverrouillées -> PASSAGE LIBRE (porte verte)
+        if from_room["unlocked"] and to_room["unlocked"]:
+            log.debug("Porte verte %s ↔ %s - passage libre", door["from"], door["to"])
+            return False  # Pas de collision = passage autorisé
+        
+        # Déterminer vers quelle salle le joueur essaie d'aller
+        if current_room == door["from"]:
+            # Le joueur va de "from" vers "to"
+            target_room_name = door["to"]
+            target_room = to_room
+            origin_room = from_room
+        elif current_room == door["to"]:
+            # Le joueur va de "to" vers "from"
+            target_room_name = door["from"]
+            target_room = from_room
+            origin_room = to_room
+        else:
+            # Le joueur n'est dans aucune des salles connectées
+            log.debug("Joueur dans un couloir sans salle d'origine identifiée - bloqué")
+            return True
+        
+        # CAS 2: Si la salle d'origine n'est pas déverrouillée -> BLOQUER
+        if not origin_room["unlocked"]:
+            log.debug("Salle d'origine %s non déverrouillée - bloqué", current_room)
+            return True
+        
+        # CAS 3: Si la salle de destination n'est pas déverrouillée -> BLOQUER
+        # (Le joueur doit d'abord nettoyer sa salle actuelle et utiliser F pour ouvrir)
+        if not target_room["unlocked"]:
+            log.debug("Salle destination %s fermée - bloqué", target_room_name)
+            return True
+        
+        # CAS 4: Si on arrive ici, les deux salles sont déverrouillées -> PERMETTRE
+        log.debug("Passage autorisé de %s vers %s", current_room, target_room_name)
+        return False
     
     
     def draw(self, screen, camera_x, camera_y):
@@ -381,7 +327,7 @@ class Player:
             screen_y = self.y - camera_y
             
             # Clignoter si invincible
-            current_time = time.time()
+            current_time = self.clock.now
             if current_time - self.last_damage_time < self.damage_cooldown:
                 if int(current_time * 10) % 2:  # Clignotement
                     color = (150, 255, 150)
@@ -409,7 +355,7 @@ class Player:
         if not hasattr(self, 'dash_distance'):
             return False
         
-        current_time = time.time()
+        current_time = self.clock.now
         
         # Vérifier cooldown et stamina
         if (current_time - self.last_dash_time < self.dash_cooldown or 
@@ -418,7 +364,7 @@ class Player:
             return False
         
         # Déterminer la direction du dash
-        keys = pygame.key.get_pressed()
+        keys = self.controls.keys()
         dx, dy = 0, 0
         
         if keys[pygame.K_LEFT] or keys[pygame.K_q]:
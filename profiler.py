@@ -0,0 +1,150 @@
+# profiler.py - Chronométrage par sous-système et overlay en jeu (F3)
+import time
+import numpy as np
+import pygame
+
+# Couleurs des courbes, dans l'ordre d'apparition des scopes
+SCOPE_COLORS = [(255, 99, 71), (255, 215, 0), (50, 205, 50), (0, 191, 255), (186, 85, 211),
+                (255, 140, 0), (64, 224, 208), (255, 105, 180), (173, 255, 47), (220, 220, 220),
+                (135, 206, 250)]
+
+
+class NullScope:
+    """Scope du profileur désactivé : ne mesure rien"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SCOPE = NullScope()
+
+
+class Scope:
+    """Mesure le temps passé dans un bloc `with` et l'ajoute à la frame en cours"""
+    __slots__ = ("profiler", "row", "start")
+
+    def __init__(self, profiler, row):
+        self.profiler = profiler
+        self.row = row
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.current[self.row] += time.perf_counter() - self.start
+        return False
+
+
+class Profiler:
+    """Temps par scope nommé, cumulé sur chaque frame puis gardé sur les `window` dernières
+    frames (p50, p95, max glissants). Désactivé, scope() retourne un objet vide partagé :
+    le coût se limite à un appel de méthode par scope."""
+    def __init__(self, window=240, refresh=15):
+        self.enabled = False
+        self.window = window
+        self.refresh = refresh        # Le texte de l'overlay est recalculé toutes les N frames
+        self.names = []               # Scopes dans l'ordre d'apparition
+        self.scopes = {}              # nom -> Scope réutilisé
+        self.current = []             # Secondes cumulées dans la frame en cours, par scope
+        self.history = np.zeros((0, window))  # Millisecondes par scope et par frame (tampon circulaire)
+        self.frames = 0
+        self.font = None
+        self.lines = []               # Surfaces de texte de l'overlay
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+        return self.enabled
+
+    def reset(self):
+        self.history[:] = 0.0
+        self.current = [0.0] * len(self.names)
+        self.frames = 0
+        self.lines = []
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = Scope(self, len(self.names))
+            self.names.append(name)
+            self.current.append(0.0)
+            self.history = np.vstack([self.history, np.zeros((1, self.window))])
+        return scope
+
+    def end_frame(self):
+        """Range les temps de la frame écoulée dans l'historique"""
+        if not self.enabled:
+            return
+        slot = self.frames % self.window
+        self.history[:, slot] = self.current
+        self.history[:, slot] *= 1000
+        self.current = [0.0] * len(self.names)
+        self.frames += 1
+
+    def stats(self):
+        """{scope: (p50, p95, max)} en millisecondes sur les frames gardées"""
+        filled = min(self.frames, self.window)
+        if filled == 0:
+            return {}
+        samples = self.history[:, :filled]
+        p50, p95 = np.percentile(samples, (50, 95), axis=1)
+        peak = samples.max(axis=1)
+        return {name: (p50[row], p95[row], peak[row]) for row, name in enumerate(self.names)}
+
+    def draw(self, screen, budget_ms=1000 / 60):
+        """Overlay : tableau p50/p95/max par scope et courbes des dernières frames"""
+        if not self.enabled:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        if not self.lines or self.frames % self.refresh == 0:
+            # Police proportionnelle : nom et colonnes rendus séparément, alignés par position
+            header = ("scope (ms)", "p50", "p95", "max")
+            self.lines = [[self.font.render(text, True, (255, 255, 255)) for text in header]]
+            for row, (name, values) in enumerate(self.stats().items()):
+                color = SCOPE_COLORS[row % len(SCOPE_COLORS)]
+                self.lines.append([self.font.render(name, True, color)] +
+                                  [self.font.render(f"{value:.2f}", True, color) for value in values])
+
+        graph_height = 100
+        width = 360
+        height = 10 + 18 * len(self.lines) + graph_height + 10
+        left = screen.get_width() - width - 10
+        top = 10
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(200)
+        panel.fill((0, 0, 0))
+        screen.blit(panel, (left, top))
+        for index, line in enumerate(self.lines):
+            screen.blit(line[0], (left + 8, top + 6 + 18 * index))
+            for column, text in enumerate(line[1:]):
+                screen.blit(text, (left + 190 + 55 * column + 40 - text.get_width(), top + 6 + 18 * index))
+
+        # Courbes : l'échelle suit le pic de la fenêtre, la ligne grise marque le budget d'une frame
+        filled = min(self.frames, self.window)
+        if filled < 2:
+            return
+        order = np.arange(self.frames - filled, self.frames) % self.window
+        samples = self.history[:, order]
+        ceiling = max(float(samples.max()), 1.0)
+        base = top + height - 10
+        scale = graph_height / ceiling
+        if budget_ms <= ceiling:
+            pygame.draw.line(screen, (90, 90, 90), (left + 8, base - budget_ms * scale),
+                             (left + width - 8, base - budget_ms * scale))
+        xs = left + 8 + np.arange(filled) * ((width - 16) / (self.window - 1))
+        for row in range(len(self.names)):
+            ys = base - samples[row] * scale
+            pygame.draw.lines(screen, SCOPE_COLORS[row % len(SCOPE_COLORS)], False,
+                              np.column_stack((xs, ys)).tolist())
+
+
+# Profileur partagé par le jeu ; F3 l'active et affiche l'overlay
+profiler = Profiler()
@@ -0,0 +1,396 @@
+# projectiles.py - Moteur de projectiles en tableaux NumPy (tirs ennemis, flèches, boss)
+import math
+import numpy as np
+import pygame
+from timing import FIXED_DT
+from eventlog import get_logger
+
+log = get_logger("projectiles")
+
+# Types de projectiles (colonne `kind`)
+BULLET = 0  # Missile à tête chercheuse des ennemis stationnaires
+ARROW = 1   # Flèche du joueur
+BOSS = 2    # Projectile de boss
+
+TRAIL_LENGTH = 8  # Positions gardées pour la traînée des projectiles de boss (tampon circulaire)
+
+
+def slot_column(name, cast=float):
+    """Propriété qui lit/écrit la case du projectile dans une colonne du moteur"""
+    def get(self):
+        return cast(getattr(self.engine, name)[self.slot])
+
+    def set(self, value):
+        getattr(self.engine, name)[self.slot] = value
+
+    return property(get, set)
+
+
+class ProjectileView:
+    """Vue sur une case du moteur : sert au dessin et aux tests de collision ponctuels.
+    Les vues sont gardées par case et réutilisées d'un tir à l'autre."""
+    x = slot_column("x")
+    y = slot_column("y")
+    velocity_x = slot_column("vx")
+    velocity_y = slot_column("vy")
+    creation_time = slot_column("creation_time")
+    damage = slot_column("damage", int)
+
+    def __init__(self, engine, slot):
+        self.engine = engine
+        self.slot = slot
+
+    @property
+    def alive(self):
+        return bool(self.engine.alive[self.slot])
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def destroy(self):
+        """Retire le projectile du jeu (sa case est libérée au tick suivant)"""
+        self.engine.kill(self.slot)
+
+
+class ProjectileGroup:
+    """Projectiles vivants d'un type, dans l'ordre de tir.
+    Remplace les listes de Game : les tireurs continuent d'appeler append(), mais le
+    moteur suit déjà chaque projectile depuis spawn()."""
+    def __init__(self, engine, kind):
+        self.engine = engine
+        self.kind = kind
+
+    def append(self, projectile):
+        pass  # Déjà dans le moteur
+
+    def __iter__(self):
+        return iter(self.engine.live_views(self.kind))
+
+    def __len__(self):
+        engine = self.engine
+        n = engine.count
+        return int(np.count_nonzero(engine.alive[:n] & (engine.kind[:n] == self.kind)))
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def clear(self):
+        self.engine.kill_kind(self.kind)
+
+
+class ProjectileEngine:
+    """Tous les projectiles en colonnes NumPy : update() fait avancer l'ensemble
+    (tête chercheuse, durée de vie, portée, murs, traînées) en quelques passes vectorisées.
+    Les cases libres sont réutilisées : un tir ne crée ni objet ni Rect une fois chauffé.
+    Chaque Game a son moteur (Game.projectiles), daté par l'horloge de la partie."""
+    COLUMNS = {
+        "x": np.float64, "y": np.float64, "vx": np.float64, "vy": np.float64,
+        "width": np.int32, "height": np.int32, "kind": np.uint8, "style": np.uint8,
+        "creation_time": np.float64, "lifetime": np.float64, "speed": np.float64,
+        "damage": np.int32, "start_x": np.float64, "start_y": np.float64,
+        "max_range": np.float64, "homing": bool, "alive": bool, "in_use": bool,
+        "serial": np.int64, "trail_length": np.uint8, "trail_head": np.uint8,
+        # Position au tick précédent, pour l'interpolation du rendu
+        "prev_x": np.float64, "prev_y": np.float64,
+    }
+
+    def __init__(self, clock, capacity=1024):
+        self.clock = clock
+        self.capacity = capacity
+        self.count = 0  # Cases déjà utilisées au moins une fois
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.trail = np.zeros((capacity, TRAIL_LENGTH, 2), dtype=np.float64)
+        self.free = []             # Cases libres (pile)
+        self.views = {}            # classe -> {case: vue} réutilisées
+        self.slot_views = [None] * capacity  # Vue actuelle de chaque case
+        self.next_serial = 0
+        self.groups = {}
+
+        # Compteurs pour les benchmarks
+        self.allocations = 0  # Vues créées + agrandissements des tableaux
+        self.reuses = 0       # Tirs servis par une case libérée
+        self.releases = 0
+        self.live = 0
+        self.peak_live = 0
+
+    def group(self, kind):
+        if kind not in self.groups:
+            self.groups[kind] = ProjectileGroup(self, kind)
+        return self.groups[kind]
+
+    def reserve(self, capacity):
+        """Agrandit les tableaux d'avance pour qu'une salve n'ait jamais à le faire"""
+        if capacity > self.capacity:
+            self.grow(capacity)
+
+    def grow(self, capacity):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+        trail = np.zeros((capacity, TRAIL_LENGTH, 2), dtype=np.float64)
+        trail[:self.count] = self.trail[:self.count]
+        self.trail = trail
+        self.slot_views.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+        self.allocations += 1
+
+    def add(self, cls, kind, x, y, vx, vy, width, height, lifetime, damage=0,
+            speed=0.0, homing=False, max_range=math.inf, style=0):
+        """Occupe une case et retourne la vue `cls` du nouveau projectile"""
+        if self.free:
+            slot = self.free.pop()
+            self.reuses += 1
+        else:
+            if self.count == self.capacity:
+                self.grow(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+
+        self.x[slot] = self.start_x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.start_y[slot] = self.prev_y[slot] = y
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.width[slot] = width
+        self.height[slot] = height
+        self.kind[slot] = kind
+        self.style[slot] = style
+        self.creation_time[slot] = self.clock.now
+        self.lifetime[slot] = lifetime
+        self.speed[slot] = speed
+        self.damage[slot] = damage
+        self.max_range[slot] = max_range
+        self.homing[slot] = homing
+        self.alive[slot] = True
+        self.in_use[slot] = True
+        self.serial[slot] = self.next_serial
+        self.next_serial += 1
+        self.trail_length[slot] = 0
+        self.trail_head[slot] = 0
+
+        self.live += 1
+        if self.live > self.peak_live:
+            self.peak_live = self.live
+
+        views = self.views.setdefault(cls, {})
+        view = views.get(slot)
+        if view is None:
+            view = views[slot] = cls(self, slot)
+            self.allocations += 1
+        self.slot_views[slot] = view
+        return view
+
+    def kill(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.live -= 1
+
+    def kill_kind(self, kind):
+        n = self.count
+        rows = np.flatnonzero(self.alive[:n] & (self.kind[:n] == kind))
+        self.alive[rows] = False
+        self.live -= len(rows)
+
+    def clear(self):
+        n = self.count
+        self.live -= int(np.count_nonzero(self.alive[:n]))
+        self.alive[:n] = False
+        self.release_dead()
+
+    def remember_positions(self):
+        """Garde les positions courantes avant le tick suivant (un tir du tick part de sa
+        position de départ, écrite par add())"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def render_offsets(self, alpha):
+        """Avance de chaque case sur sa position interpolée (listes indexées par case),
+        à ajouter à la caméra pour dessiner le projectile entre ses deux derniers ticks"""
+        n = self.count
+        lag = 1.0 - alpha
+        return (((self.x[:n] - self.prev_x[:n]) * lag).tolist(),
+                ((self.y[:n] - self.prev_y[:n]) * lag).tolist())
+
+    def release_dead(self):
+        """Rend aux cases libres les projectiles morts au tick précédent"""
+        n = self.count
+        dead = np.flatnonzero(self.in_use[:n] & ~self.alive[:n])
+        if len(dead):
+            self.in_use[dead] = False
+            self.free.extend(dead.tolist())
+            self.releases += len(dead)
+
+    def update(self, player, world, enemy_store=None):
+        """Avance tous les projectiles d'un tick"""
+        self.release_dead()
+        n = self.count
+        rows = np.flatnonzero(self.alive[:n])
+        if len(rows) == 0:
+            return
+
+        # Durée de vie écoulée
+        current_time = self.clock.now
+        expired = current_time - self.creation_time[rows] >= self.lifetime[rows]
+        if expired.any():
+            self.alive[rows[expired]] = False
+            self.live -= int(np.count_nonzero(expired))
+            rows = rows[~expired]
+
+        x = self.x[rows]
+        y = self.y[rows]
+        vx = self.vx[rows]
+        vy = self.vy[rows]
+        width = self.width[rows]
+        height = self.height[rows]
+        kind = self.kind[rows]
+
+        # Missiles qui suivent le joueur : 80% ancienne direction, 20% nouvelle
+        homing = self.homing[rows]
+        if homing.any():
+            dx = player.x + player.width/2 - (x + width/2)
+            dy = player.y + player.height/2 - (y + height/2)
+            distance = np.sqrt(dx*dx + dy*dy)
+            steer = homing & (distance > 0)
+            speed = self.speed[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                vx = np.where(steer, vx * 0.8 + (dx / distance) * speed * 0.2, vx)
+                vy = np.where(steer, vy * 0.8 + (dy / distance) * speed * 0.2, vy)
+            self.vx[rows] = vx
+            self.vy[rows] = vy
+
+        # Traînées des projectiles de boss : position avant déplacement, écrite à la tête
+        # du tampon circulaire de la case (le point le plus ancien est écrasé)
+        boss = kind == BOSS
+        if boss.any():
+            boss_rows = rows[boss]
+            head = self.trail_head[boss_rows]
+            self.trail[boss_rows, head, 0] = x[boss]
+            self.trail[boss_rows, head, 1] = y[boss]
+            self.trail_head[boss_rows] = (head + 1) % TRAIL_LENGTH
+            self.trail_length[boss_rows] = np.minimum(self.trail_length[boss_rows] + 1, TRAIL_LENGTH)
+
+        new_x = x + vx * FIXED_DT
+        new_y = y + vy * FIXED_DT
+
+        # Portée max (flèches), puis murs
+        dead = (np.sqrt((new_x - self.start_x[rows])**2 + (new_y - self.start_y[rows])**2) >
+                self.max_range[rows])
+        # Les projectiles qui avancent de plus d'une tuile par tick pourraient sauter un
+        # mur fin : on balaie leur trajet ; les autres ne testent que leur destination
+        fast = np.maximum(np.abs(vx), np.abs(vy)) * FIXED_DT > world.tile_size
+        if fast.any():
+            slow = ~fast
+            dead[slow] |= world.rects_hit_wall(new_x[slow], new_y[slow], width[slow], height[slow])
+            for i in np.flatnonzero(fast).tolist():
+                if world.sweep_box(x[i], y[i], width[i], height[i],
+                                   vx[i] * FIXED_DT, vy[i] * FIXED_DT) is not None:
+                    dead[i] = True
+        else:
+            dead |= world.rects_hit_wall(new_x, new_y, width, height)
+        if dead.any():
+            self.alive[rows[dead]] = False
+            self.live -= int(np.count_nonzero(dead))
+
+        moved = rows[~dead]
+        self.x[moved] = new_x[~dead]
+        self.y[moved] = new_y[~dead]
+
+        if enemy_store is not None:
+            arrows = moved[kind[~dead] == ARROW]
+            if len(arrows):
+                self.hit_enemies(arrows, enemy_store)
+
+    def hit_enemies(self, arrows, enemy_store):
+        """Chaque flèche touche le premier ennemi vivant (dans l'ordre des ennemis) qu'elle
+        chevauche ; les flèches sont traitées dans l'ordre de tir, donc un ennemi tué par une
+        flèche ne bloque plus les suivantes. Seuls les ennemis des cellules voisines de la
+        flèche (grille de l'EnemyStore) sont testés."""
+        enemy_store.sync_grid()
+        grid = enemy_store.grid
+        rects = enemy_store.rects
+        alive = enemy_store.alive
+        enemies = enemy_store.enemies
+
+        arrows = arrows[np.argsort(self.serial[arrows], kind="stable")]
+        xs = np.trunc(self.x[arrows]).astype(np.int64).tolist()
+        ys = np.trunc(self.y[arrows]).astype(np.int64).tolist()
+        widths = self.width[arrows].tolist()
+        heights = self.height[arrows].tolist()
+        for i, arrow in enumerate(arrows.tolist()):
+            x, y, width, height = xs[i], ys[i], widths[i], heights[i]
+            target = -1
+            for row in grid.query(x, y, width, height):
+                if target != -1 and row > target:
+                    continue
+                rect = rects[row]
+                if (alive[row] and x < rect.right and rect.left < x + width and
+                        y < rect.bottom and rect.top < y + height):
+                    target = row
+            if target != -1:
+                damage = int(self.damage[arrow])
+                enemies[target].take_damage(damage)
+                log.debug("Flèche touche ennemi : %s dégâts", damage)
+                self.kill(arrow)
+
+    def hits_against(self, kind, rects):
+        """Test groupé d'un type de projectile contre quelques cibles (les boss) :
+        liste (vue, indices des rects touchés) dans l'ordre de tir"""
+        n = self.count
+        rows = np.flatnonzero(self.alive[:n] & (self.kind[:n] == kind))
+        if len(rows) == 0 or not rects:
+            return []
+        x = np.trunc(self.x[rows])[:, None]
+        y = np.trunc(self.y[rows])[:, None]
+        left = np.array([rect.left for rect in rects])
+        top = np.array([rect.top for rect in rects])
+        right = np.array([rect.right for rect in rects])
+        bottom = np.array([rect.bottom for rect in rects])
+        overlap = ((x < right) & (left < x + self.width[rows][:, None]) &
+                   (y < bottom) & (top < y + self.height[rows][:, None]))
+        hit = overlap.any(axis=1)
+        rows = rows[hit]
+        overlap = overlap[hit]
+        order = np.argsort(self.serial[rows], kind="stable")
+        slot_views = self.slot_views
+        return [(slot_views[row], np.flatnonzero(targets).tolist())
+                for row, targets in zip(rows[order].tolist(), overlap[order])]
+
+    def live_views(self, kind):
+        """Vues des projectiles vivants d'un type, dans l'ordre de tir"""
+        n = self.count
+        rows = np.flatnonzero(self.alive[:n] & (self.kind[:n] == kind))
+        rows = rows[np.argsort(self.serial[rows], kind="stable")]
+        slot_views = self.slot_views
+        return [slot_views[row] for row in rows.tolist()]
+
+    def trail_points(self, rows):
+        """Points de traînée des cases `rows`, à plat et dans l'ordre (case, plus ancien → plus récent).
+        Retourne (rang du point, longueur de sa traînée, positions (N, 2))."""
+        lengths = self.trail_length[rows].astype(np.intp)
+        owner = np.repeat(rows, lengths)
+        length = np.repeat(lengths, lengths)
+        rank = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        index = (self.trail_head[owner].astype(np.intp) - length + rank) % TRAIL_LENGTH
+        return rank, length, self.trail[owner, index]
+
+    def overlapping(self, kind, rect):
+        """Projectiles vivants d'un type qui chevauchent `rect`, dans l'ordre de tir"""
+        n = self.count
+        rows = np.flatnonzero(self.alive[:n] & (self.kind[:n] == kind))
+        x = np.trunc(self.x[rows])
+        y = np.trunc(self.y[rows])
+        hit = ((x < rect.right) & (rect.left < x + self.width[rows]) &
+               (y < rect.bottom) & (rect.top < y + self.height[rows]))
+        rows = rows[hit]
+        rows = rows[np.argsort(self.serial[rows], kind="stable")]
+        slot_views = self.slot_views
+        return [slot_views[row] for row in rows.tolist()]
+
+    def stats(self):
+        return {"allocations": self.allocations, "reuses": self.reuses,
+                "releases": self.releases, "live": self.live, "peak_live": self.peak_live,
+                "capacity": self.capacity}
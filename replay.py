@@ -0,0 +1,150 @@
+# replay.py - Enregistrement des entrées tick par tick et rejeu exact sans affichage
+import argparse
+import logging
+import struct
+import zlib
+from controls import WATCHED_KEYS, InputFrame, ScriptedInput
+from timing import FIXED_DT
+from eventlog import setup
+from statehash import StateHasher
+
+MAGIC = b"TUSR"
+VERSION = 1
+# En-tête : magic, version, graine (signée, comme --seed), durée d'un tick, nombre de ticks,
+# nombre de touches surveillées
+HEADER = struct.Struct("<4sHqdII")
+# Événement : tick, touches maintenues (un bit par touche de WATCHED_KEYS), nombre d'appuis
+EVENT = struct.Struct("<IHB")
+
+
+def encode_keys(keys, watched=WATCHED_KEYS):
+    """Touches maintenues -> masque de bits (ordre de `watched`)"""
+    mask = 0
+    for bit, key in enumerate(watched):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def decode_keys(mask, watched=WATCHED_KEYS):
+    return [key for bit, key in enumerate(watched) if mask >> bit & 1]
+
+
+class Replay:
+    """Session enregistrée : graine de la partie, nombre de ticks et liste d'événements
+    (tick, masque des touches maintenues, appuis). Un événement n'est écrit que lorsque
+    les touches maintenues changent ou qu'une touche est appuyée."""
+    def __init__(self, seed=0, ticks=0, events=None, dt=FIXED_DT, watched=WATCHED_KEYS):
+        self.seed = seed
+        self.ticks = ticks
+        self.events = events if events is not None else []
+        self.dt = dt
+        self.watched = tuple(watched)
+
+    def save(self, path):
+        body = bytearray()
+        for tick, mask, presses in self.events:
+            body += EVENT.pack(tick, mask, len(presses))
+            body += struct.pack(f"<{len(presses)}I", *presses)
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.dt, self.ticks, len(self.watched)))
+            file.write(struct.pack(f"<{len(self.watched)}I", *self.watched))
+            file.write(zlib.compress(bytes(body)))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, seed, dt, ticks, key_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un replay")
+        if version != VERSION:
+            raise ValueError(f"{path} : version de replay {version} non prise en charge (attendue : {VERSION})")
+        watched = struct.unpack_from(f"<{key_count}I", data, HEADER.size)
+        body = zlib.decompress(data[HEADER.size + 4 * key_count:])
+
+        events = []
+        offset = 0
+        while offset < len(body):
+            tick, mask, count = EVENT.unpack_from(body, offset)
+            offset += EVENT.size
+            presses = struct.unpack_from(f"<{count}I", body, offset)
+            offset += 4 * count
+            events.append((tick, mask, presses))
+        return cls(seed, ticks, events, dt, watched)
+
+    def script(self):
+        """Script pour ScriptedInput : reconstitue l'InputFrame de chaque tick, dans l'ordre"""
+        events = iter(self.events)
+        pending = next(events, None)
+        state = {"held": ()}
+
+        def frame(tick):
+            nonlocal pending
+            presses = ()
+            if pending is not None and pending[0] == tick:
+                state["held"] = decode_keys(pending[1], self.watched)
+                presses = pending[2]
+                pending = next(events, None)
+            return InputFrame(state["held"], presses)
+
+        return frame
+
+
+class Recorder:
+    """Source d'entrées qui enregistre celle qu'elle enveloppe (clavier, script) :
+    Game(screen, Recorder(KeyboardInput(), seed)) puis recorder.replay.save(chemin)"""
+    def __init__(self, source, seed=0):
+        self.source = source
+        self.replay = Replay(seed)
+        self.mask = 0
+
+    def press(self, key):
+        self.source.press(key)
+
+    def advance(self):
+        presses = self.source.advance()
+        mask = encode_keys(self.source.keys())
+        if mask != self.mask or presses:
+            self.replay.events.append((self.replay.ticks, mask, tuple(presses)))
+            self.mask = mask
+        self.replay.ticks += 1
+        return presses
+
+    def keys(self):
+        return self.source.keys()
+
+
+def play(replay, hasher=None):
+    """Rejoue une session sans affichage, aussi vite que possible ; retourne (jeu, débit)"""
+    # Import tardif : headless force le pilote vidéo factice, main.py importe ce module
+    from headless import create_game, run
+    game = create_game(ScriptedInput(replay.script()), replay.seed)
+    return game, run(game, replay.ticks, hasher)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue une session enregistrée (python main.py --record)")
+    parser.add_argument("replay", help="fichier de replay")
+    parser.add_argument("--verbose", action="store_true", help="afficher le journal du jeu")
+    parser.add_argument("--hash-every", type=int, default=60, metavar="N",
+                        help="empreinte de l'état toutes les N ticks (0 : désactivée)")
+    args = parser.parse_args()
+
+    setup(logging.INFO if args.verbose else logging.WARNING)
+    replay = Replay.load(args.replay)
+    hasher = StateHasher(args.hash_every) if args.hash_every else None
+    game, result = play(replay, hasher)
+
+    print(f"{args.replay} : {replay.ticks} ticks ({replay.ticks * replay.dt:.0f} s de jeu), "
+          f"{len(replay.events)} événements, graine {replay.seed}")
+    print(f"rejoué en {result['seconds']:.2f} s : {result['ticks_per_second']:.0f} ticks/s "
+          f"(x{result['speedup']:.1f} temps réel)")
+    print(f"joueur : {game.player.hp:.0f}/{game.player.max_hp} HP en ({game.player.x:.1f}, {game.player.y:.1f}), "
+          f"ennemis vivants : {sum(1 for enemy in game.enemies if enemy.alive)}/{len(game.enemies)}")
+    if hasher is not None and hasher.history:
+        print(f"empreinte au tick {hasher.history[-1][0]} : {hasher.history[-1][1]}")
+
+
+if __name__ == "__main__":
+    main()
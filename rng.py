@@ -0,0 +1,30 @@
+# rng.py - Générateurs aléatoires de la simulation : un flux indépendant par sous-système
+import hashlib
+import random
+
+# Flux de la partie ; tirer plus ou moins dans l'un (particules, tremblement de caméra)
+# ne décale pas les tirages des autres (IA, combat)
+STREAMS = ("enemies", "bosses", "combat", "camera", "particles")
+
+
+def derive_seed(seed, *key):
+    """Graine dérivée de la graine de la partie et d'une clé (nom de flux, coffre...)"""
+    text = ":".join(str(part) for part in (seed, *key))
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class RandomStreams:
+    """Un random.Random par sous-système, tous dérivés de la graine de la partie
+    (Game.rng ; chaque sous-système reçoit son flux à la création)"""
+    def __init__(self, seed=0):
+        self.reseed(seed)
+
+    def reseed(self, seed):
+        self.seed = seed
+        for name in STREAMS:
+            setattr(self, name, random.Random(derive_seed(seed, name)))
+
+    def fork(self, *key):
+        """Générateur à usage unique, fonction de la graine et de `key` seulement
+        (loot d'un coffre : le même coffre ouvert au même tick donne le même objet)"""
+        return random.Random(derive_seed(self.seed, *key))
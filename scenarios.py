@@ -0,0 +1,200 @@
+# scenarios.py - Scénarios de performance nommés, joués sur le jeu complet sans affichage
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import random
+import time
+import tracemalloc
+import numpy as np
+import pygame
+from controls import ScriptedInput
+from headless import create_game
+from loot import Weapon
+from timing import FIXED_DT
+from eventlog import setup
+
+
+def place_player(game, room_name):
+    """Joueur au centre d'une salle déverrouillée, rendu invulnérable pour la mesure"""
+    game.world.unlock_room(room_name)
+    room = game.world.rooms[room_name]
+    player = game.player
+    player.x = (room["x"] + room["w"] // 2) * game.world.tile_size
+    player.y = (room["y"] + room["h"] // 2) * game.world.tile_size
+    player.rect.topleft = (int(player.x), int(player.y))
+    player.hp = player.max_hp = 10**9
+
+
+def central_aggro(game):
+    """Salle centrale : ses 19 ennemis poursuivent, tirent et frappent le joueur"""
+    place_player(game, "central")
+
+
+def boss_enraged_special(game):
+    """Boss principal en rage : ondes de choc (3 anneaux, 48 projectiles) toutes les 30 ticks"""
+    place_player(game, "boss")
+    game.spawn_boss_if_needed("boss")
+    boss = game.bosses[-1]
+    boss.hp = boss.max_hp = 10**9
+    boss.enter_rage_mode()
+
+    def tick(index):
+        if index % 30 == 0:
+            boss.main_boss_special(game.player, game.boss_projectiles)
+    return tick
+
+
+def secret_spiral_wall(game):
+    """Boss secret : spirale toutes les 20 ticks et mur balayant toutes les 60"""
+    place_player(game, "secret")
+    game.spawn_boss_if_needed("secret")
+    boss = game.bosses[-1]
+    boss.hp = boss.max_hp = 10**9
+
+    def tick(index):
+        if index % 20 == 0:
+            boss.secret_boss_attack(game.player, game.boss_projectiles)
+        if index % 60 == 0:
+            boss.secret_boss_special(game.player, game.boss_projectiles)
+    return tick
+
+
+def big_room_volleys(game):
+    """Grande salle : salve de 8 flèches toutes les 10 ticks au milieu de ses 23 ennemis"""
+    place_player(game, "big")
+    bow = Weapon("Arc Elfique", "bow", damage_bonus=10, range_bonus=100)
+
+    def tick(index):
+        if index % 10 == 0:
+            game.player.shoot_arrow(bow, game.player_projectiles)
+    return tick
+
+
+def horde_5k(game, count=5000):
+    """Horde synthétique : 5000 ennemis de tous types répartis sur le sol de toutes les salles
+    (plus d'ennemis que de tuiles : plusieurs par tuile, décalés au hasard)"""
+    world = game.world
+    for room_name in world.rooms:
+        world.unlock_room(room_name)
+    place_player(game, "big")
+    rng = random.Random(5000)
+    floor_y, floor_x = np.nonzero((world.map == 0) & (world.room_grid >= 0))
+    spawns = []
+    for _ in range(count):
+        tile = rng.randrange(len(floor_x))
+        room_name = world.room_names[world.room_grid[floor_y[tile], floor_x[tile]]]
+        x = int(floor_x[tile]) * world.tile_size + rng.uniform(0, world.tile_size - 24)
+        y = int(floor_y[tile]) * world.tile_size + rng.uniform(0, world.tile_size - 24)
+        spawns.append((room_name, x, y, rng.choice(("normal", "patrol", "stationary"))))
+    game.create_enemies(spawns)
+
+
+SCENARIOS = {
+    "central_aggro": central_aggro,
+    "boss_enraged_special": boss_enraged_special,
+    "secret_spiral_wall": secret_spiral_wall,
+    "big_room_volleys": big_room_volleys,
+    "horde_5k": horde_5k,
+}
+
+
+def run_scenario(name, ticks=600, warmup=60, memory_ticks=120, seed=0):
+    """Joue un scénario : chauffe, mesure du temps par tick, puis passe tracemalloc.
+    Le pic par tick est la mémoire Python tracée au plus haut pendant le tick, au-dessus du
+    niveau de départ du tick (tracemalloc.reset_peak), en KiB. Ce n'est pas un nombre
+    d'allocations : mille petits objets libérés au fur et à mesure pèsent moins qu'un gros tableau."""
+    game = create_game(ScriptedInput(()), seed)
+    hook = SCENARIOS[name](game)
+
+    def step(index):
+        if hook is not None:
+            hook(index)
+        game.update()
+
+    for index in range(warmup):
+        step(index)
+
+    gc.collect()
+    gc_start = gc.get_stats()[0]["collections"]
+    durations = np.empty(ticks)
+    for index in range(ticks):
+        start = time.perf_counter()
+        step(warmup + index)
+        durations[index] = time.perf_counter() - start
+    gc_gen0 = gc.get_stats()[0]["collections"] - gc_start
+
+    tracemalloc.start()
+    peaks = np.empty(memory_ticks)
+    retained_start = tracemalloc.get_traced_memory()[0]
+    for index in range(memory_ticks):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(warmup + ticks + index)
+        peaks[index] = tracemalloc.get_traced_memory()[1] - before
+    retained = tracemalloc.get_traced_memory()[0] - retained_start
+    tracemalloc.stop()
+
+    total = durations.sum()
+    return {
+        "scenario": name,
+        "ticks": ticks,
+        "ticks_per_second": ticks / total,
+        "realtime_factor": ticks * FIXED_DT / total,
+        "mean_ms": durations.mean() * 1000,
+        "p50_ms": float(np.percentile(durations, 50)) * 1000,
+        "p99_ms": float(np.percentile(durations, 99)) * 1000,
+        "max_ms": durations.max() * 1000,
+        "peak_kib_per_tick": peaks.mean() / 1024,
+        "retained_kib": retained / 1024,
+        "gc_gen0": gc_gen0,
+        "enemies": len(game.enemies),
+        "projectiles": len(game.enemy_projectiles) + len(game.player_projectiles) + len(game.boss_projectiles),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scénarios de performance (ticks/s, p50/p99, pic mémoire par tick)")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"scénarios à jouer parmi {', '.join(SCENARIOS)} (tous par défaut)")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="fichier où écrire les résultats")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"scénario inconnu : {', '.join(unknown)}")
+
+    setup(logging.WARNING)
+    results = []
+    for name in args.scenarios or list(SCENARIOS):
+        result = run_scenario(name, args.ticks, args.warmup, seed=args.seed)
+        results.append(result)
+        print(f"{name:22s} {result['ticks_per_second']:8.0f} ticks/s  p50 {result['p50_ms']:6.2f} ms  "
+              f"p99 {result['p99_ms']:6.2f} ms  {result['peak_kib_per_tick']:7.1f} KiB pic/tick  "
+              f"{result['gc_gen0']:4d} GC")
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "ticks": args.ticks,
+            "seed": args.seed,
+            "results": results,
+        }
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
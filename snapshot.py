@@ -0,0 +1,500 @@
+# snapshot.py - Sauvegarde et chargement binaires de l'état complet d'une partie
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+import numpy as np
+from boss import Boss, BossProjectile
+from enemy import Projectile, EnemyStore
+from level import ENEMY_TYPES
+from loot import Chest, Skill, Weapon
+from player import PlayerProjectile
+from projectiles import BULLET, ARROW, BOSS, TRAIL_LENGTH
+from activity import RoomActivity
+from rng import STREAMS
+from eventlog import get_logger
+
+log = get_logger("snapshot")
+
+MAGIC = b"TUSS"
+VERSION = 2  # 2 : état du menu (inventaire, loot en attente)
+HEADER = struct.Struct("<4sHqq")  # magic, version, graine (signée, comme --seed), tick
+QUICKSAVE_PATH = "quicksave.tus"
+CRASH_PATH = "crash.tus"
+
+# Champs scalaires sauvegardés par nom. Les attributs du dash sont recréés par
+# Game.apply_passive_effects ; les stats sont quand même restaurées telles quelles (un joueur
+# sans équipement n'a pas les valeurs de base de apply_passive_effects). Les bornes de salle
+# du boss et les caches sont reconstruits au chargement.
+PLAYER_FIELDS = ("x", "y", "hp", "max_hp", "stamina", "max_stamina", "speed", "attack_damage",
+                 "attack_range", "alive", "last_attack_time", "last_damage_time",
+                 "last_dash_time", "is_dashing", "dash_start_time")
+BOSS_FIELDS = ("x", "y", "hp", "max_hp", "alive", "phase", "is_enraged", "attack_pattern",
+               "last_attack_time", "attack_cooldown", "last_special_time", "special_cooldown",
+               "target_x", "target_y", "movement_timer", "last_damage_time", "pulse_timer",
+               "teleport_cooldown", "last_teleport_time", "is_teleporting", "teleport_alpha")
+# Colonnes du magasin d'ennemis ; la grille spatiale est reconstruite par sync_grid() et les
+# positions du tick précédent (rendu seulement) par remember_positions()
+ENEMY_COLUMNS = tuple(name for name in EnemyStore.COLUMNS
+                      if name not in ("grid_x", "grid_y", "in_grid", "prev_x", "prev_y"))
+PROJECTILE_COLUMNS = ("x", "y", "vx", "vy", "width", "height", "kind", "style", "creation_time", "lifetime",
+                      "speed", "damage", "start_x", "start_y", "max_range", "homing",
+                      "trail_length", "trail_head")
+PROJECTILE_CLASSES = {BULLET: Projectile, ARROW: PlayerProjectile, BOSS: BossProjectile}
+
+
+class Writer:
+    """Tampon binaire petit-boutiste : nombres typés, chaînes, tableaux NumPy"""
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, fmt, *values):
+        self.buffer += struct.pack("<" + fmt, *values)
+
+    def string(self, text):
+        data = text.encode()
+        self.pack("H", len(data))
+        self.buffer += data
+
+    def value(self, value):
+        """Scalaire avec son type (None, bool, int, float, str), relu à l'identique"""
+        if value is None:
+            self.pack("c", b"n")
+        elif isinstance(value, (bool, np.bool_)):
+            self.pack("c?", b"b", bool(value))
+        elif isinstance(value, (int, np.integer)):
+            self.pack("cq", b"i", int(value))
+        elif isinstance(value, str):
+            self.pack("c", b"s")
+            self.string(value)
+        else:
+            self.pack("cd", b"f", float(value))
+
+    def fields(self, obj, names):
+        """Attributs présents de `obj` parmi `names`, par nom"""
+        present = [name for name in names if hasattr(obj, name)]
+        self.pack("H", len(present))
+        for name in present:
+            self.string(name)
+            self.value(getattr(obj, name))
+
+    def array(self, name, array):
+        self.string(name)
+        self.string(array.dtype.str)
+        self.pack("I", array.nbytes)
+        self.buffer += np.ascontiguousarray(array).tobytes()
+
+
+class Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt):
+        values = struct.unpack_from("<" + fmt, self.data, self.offset)
+        self.offset += struct.calcsize("<" + fmt)
+        return values
+
+    def take(self, length):
+        if self.offset + length > len(self.data):
+            raise ValueError("fichier tronqué")
+        self.offset += length
+        return self.data[self.offset - length:self.offset]
+
+    def string(self):
+        length, = self.unpack("H")
+        return bytes(self.take(length)).decode()
+
+    def value(self):
+        kind, = self.unpack("c")
+        if kind == b"n":
+            return None
+        if kind == b"b":
+            return self.unpack("?")[0]
+        if kind == b"i":
+            return self.unpack("q")[0]
+        if kind == b"s":
+            return self.string()
+        if kind == b"f":
+            return self.unpack("d")[0]
+        raise ValueError(f"type de valeur inconnu {kind!r}")
+
+    def fields(self, names):
+        """Attributs lus, par nom ; un nom inconnu (sauvegarde plus récente) est ignoré"""
+        fields = {}
+        for _ in range(self.unpack("H")[0]):
+            name = self.string()
+            value = self.value()
+            if name in names:
+                fields[name] = value
+        return fields
+
+    def array(self):
+        name = self.string()
+        dtype = np.dtype(self.string())
+        nbytes, = self.unpack("I")
+        return name, np.frombuffer(self.take(nbytes), dtype=dtype)
+
+    def columns(self, count, required):
+        """Section de tableaux nommés : toutes les colonnes `required`, de longueur `count`"""
+        columns = dict(self.array() for _ in range(self.unpack("H")[0]))
+        missing = set(required) - set(columns)
+        if missing:
+            raise ValueError(f"colonnes manquantes : {', '.join(sorted(missing))}")
+        if any(len(column) != count for name, column in columns.items() if name != "trail"):
+            raise ValueError("colonnes de longueurs différentes")
+        return columns
+
+
+def write_item(out, item):
+    """Compétence, arme, potion (nom) ou case vide"""
+    if item is None:
+        out.pack("c", b"-")
+    elif isinstance(item, Skill):
+        out.pack("c", b"S")
+        for value in (item.name, item.description, item.effect_type, item.effect_value,
+                      item.key_binding, item.equipped):
+            out.value(value)
+    elif isinstance(item, Weapon):
+        out.pack("c", b"W")
+        for value in (item.name, item.weapon_type, item.damage_bonus, item.range_bonus):
+            out.value(value)
+    else:
+        out.pack("c", b"P")
+        out.value(item)
+
+
+def read_item(data):
+    kind, = data.unpack("c")
+    if kind == b"-":
+        return None
+    if kind == b"S":
+        name, description, effect_type, effect_value, key_binding, equipped = (data.value() for _ in range(6))
+        skill = Skill(name, description, effect_type, effect_value, key_binding)
+        skill.equipped = equipped
+        return skill
+    if kind == b"W":
+        return Weapon(*(data.value() for _ in range(4)))
+    if kind == b"P":
+        return data.value()
+    raise ValueError(f"objet inconnu {kind!r}")
+
+
+def save_game(game, path):
+    """Écrit l'état de la partie dans `path` ; retourne la taille du fichier"""
+    out = Writer()
+    out.buffer += HEADER.pack(MAGIC, VERSION, game.seed, game.clock.ticks)
+
+    # Flux aléatoires : la partie rechargée tire exactement les mêmes valeurs
+    for name in STREAMS:
+        version, state, gauss = getattr(game.rng, name).getstate()
+        out.pack(f"{len(state)}I", *state)
+        out.value(gauss)
+
+    # Salles, boss déjà apparus, équipement (recrée les attributs du dash au chargement)
+    out.pack("H", len(game.world.rooms))
+    for name, room in game.world.rooms.items():
+        out.string(name)
+        out.pack("?", room["unlocked"])
+    out.pack("??", game.spawned_bosses["boss"], game.spawned_bosses["secret"])
+    for item in game.equipped_skills:
+        write_item(out, item)
+    write_item(out, game.player_weapon)
+    out.value(getattr(game, "last_dead_count", 0))
+
+    out.fields(game.player, PLAYER_FIELDS)
+    direction = getattr(game.player, "dash_direction", None)
+    out.pack("?", direction is not None)
+    if direction is not None:
+        out.pack("dd", *direction)
+
+    # Ennemis : salle de chaque ennemi puis colonnes du magasin
+    store = game.enemy_store
+    room_of = {id(enemy): index for index, name in enumerate(game.world.rooms)
+               for enemy in game.room_enemies[name]}
+    out.pack("I", store.count)
+    out.pack(f"{store.count}H", *(room_of[id(enemy)] for enemy in game.enemies))
+    out.pack("H", len(ENEMY_COLUMNS))
+    for name in ENEMY_COLUMNS:
+        out.array(name, getattr(store, name)[:store.count])
+
+    out.pack("H", len(game.bosses))
+    for boss in game.bosses:
+        out.string(boss.boss_type)
+        out.pack("dd", boss.start_x, boss.start_y)
+        out.fields(boss, BOSS_FIELDS)
+
+    # Projectiles vivants, dans l'ordre de tir
+    engine = game.projectiles
+    rows = np.flatnonzero(engine.alive[:engine.count])
+    rows = rows[np.argsort(engine.serial[rows], kind="stable")]
+    out.pack("I", len(rows))
+    out.pack("H", len(PROJECTILE_COLUMNS) + 1)
+    for name in PROJECTILE_COLUMNS:
+        out.array(name, getattr(engine, name)[rows])
+    out.array("trail", engine.trail[rows])
+
+    out.pack("H", len(game.chests))
+    for chest in game.chests:
+        out.pack("dd??", chest.x, chest.y, chest.opened, chest.loot_generated)
+        write_item(out, chest.contents)
+
+    # Menu : un coffre ouvert avant le choix du loot garde son objet, et les touches
+    # sont routées pareil (handle_key_press passe d'abord par l'inventaire et le loot)
+    menu = game.menu
+    out.pack("??B", menu.is_open, menu.showing_loot, menu.selected_slot)
+    write_item(out, menu.new_loot)
+
+    with open(path, "wb") as file:
+        file.write(out.buffer)
+    return len(out.buffer)
+
+
+class Snapshot:
+    """Contenu d'une sauvegarde, entièrement lu et vérifié avant d'être appliqué à une partie"""
+
+
+def read_snapshot(path):
+    """Lit et vérifie `path` sans toucher au jeu ; ValueError si le fichier est illisible"""
+    with open(path, "rb") as file:
+        data = Reader(file.read())
+    try:
+        return read_sections(data)
+    except (ValueError, struct.error, TypeError, KeyError, IndexError) as error:
+        raise ValueError(f"{path} : {error}") from error
+
+
+def read_sections(data):
+    snapshot = Snapshot()
+    magic, version, snapshot.seed, snapshot.ticks = data.unpack(HEADER.format[1:])
+    if magic != MAGIC:
+        raise ValueError("ce n'est pas une sauvegarde")
+    if version != VERSION:
+        raise ValueError(f"version de sauvegarde {version} non prise en charge (attendue : {VERSION})")
+
+    snapshot.random_states = []
+    for name in STREAMS:
+        state = (3, data.unpack("625I"), data.value())
+        random.Random().setstate(state)  # Un état invalide est refusé ici, pas en cours de chargement
+        snapshot.random_states.append((name, state))
+
+    snapshot.rooms = [(data.string(), data.unpack("?")[0]) for _ in range(data.unpack("H")[0])]
+    snapshot.spawned_bosses = data.unpack("??")
+    snapshot.equipped_skills = [read_item(data) for _ in range(4)]
+    snapshot.player_weapon = read_item(data)
+    snapshot.last_dead_count = data.value()
+    snapshot.player = data.fields(PLAYER_FIELDS)
+    snapshot.dash_direction = data.unpack("dd") if data.unpack("?")[0] else None
+
+    count, = data.unpack("I")
+    snapshot.enemy_rooms = data.unpack(f"{count}H")
+    snapshot.enemies = data.columns(count, ENEMY_COLUMNS)
+    if any(room >= len(snapshot.rooms) for room in snapshot.enemy_rooms):
+        raise ValueError("ennemi dans une salle inconnue")
+    if np.any(snapshot.enemies["kind"] >= len(ENEMY_TYPES)):
+        raise ValueError("type d'ennemi inconnu")
+
+    snapshot.bosses = []
+    for _ in range(data.unpack("H")[0]):
+        boss_type = data.string()
+        if boss_type not in ("main", "secret"):
+            raise ValueError(f"boss inconnu {boss_type!r}")
+        snapshot.bosses.append((boss_type, data.unpack("dd"), data.fields(BOSS_FIELDS)))
+
+    count, = data.unpack("I")
+    snapshot.projectiles = data.columns(count, PROJECTILE_COLUMNS + ("trail",))
+    snapshot.trail = snapshot.projectiles.pop("trail").reshape(count, TRAIL_LENGTH, 2)
+    if not set(snapshot.projectiles["kind"].tolist()) <= set(PROJECTILE_CLASSES):
+        raise ValueError("type de projectile inconnu")
+
+    snapshot.chests = []
+    for _ in range(data.unpack("H")[0]):
+        snapshot.chests.append((data.unpack("dd??"), read_item(data)))
+
+    snapshot.menu = data.unpack("??B")
+    snapshot.new_loot = read_item(data)
+    if snapshot.menu[2] >= 4:
+        raise ValueError(f"case d'équipement {snapshot.menu[2]} inconnue")
+    if data.offset != len(data.data):
+        raise ValueError("données en trop après la dernière section")
+    return snapshot
+
+
+def load_game(game, path):
+    """Remplace l'état de `game` par celui sauvegardé dans `path`. Le fichier est lu et
+    vérifié en entier d'abord : une sauvegarde illisible laisse la partie intacte."""
+    snapshot = read_snapshot(path)
+    if sorted(name for name, _ in snapshot.rooms) != sorted(game.world.rooms):
+        raise ValueError(f"{path} : sauvegarde d'un autre niveau")
+    apply_snapshot(game, snapshot)
+
+
+def apply_snapshot(game, snapshot):
+    """Remplace l'état de `game` par une sauvegarde déjà vérifiée (read_snapshot)"""
+    world = game.world
+    room_names = [name for name, _ in snapshot.rooms]
+    for name, unlocked in snapshot.rooms:
+        world.rooms[name]["unlocked"] = unlocked
+    world.update_doors()
+    game.room_activity = RoomActivity(world, game.clock)
+    game.spawned_bosses["boss"], game.spawned_bosses["secret"] = snapshot.spawned_bosses
+    game.equipped_skills = snapshot.equipped_skills
+    game.player_weapon = snapshot.player_weapon
+    game.last_dead_count = snapshot.last_dead_count
+
+    # Attributs du dash recréés depuis l'équipement, puis état courant du joueur
+    player = game.player
+    game.apply_passive_effects()
+    for name, value in snapshot.player.items():
+        setattr(player, name, value)
+    if snapshot.dash_direction is not None:
+        player.dash_direction = snapshot.dash_direction
+    player.rect.topleft = (int(player.x), int(player.y))
+    game.previous_player_position = (player.x, player.y)
+
+    # Ennemis recréés dans le même ordre et les mêmes salles, puis colonnes recopiées
+    columns = snapshot.enemies
+    game.create_enemies([(room_names[room], float(columns["start_x"][row]), float(columns["start_y"][row]),
+                          ENEMY_TYPES[columns["kind"][row]]) for row, room in enumerate(snapshot.enemy_rooms)])
+    store = game.enemy_store
+    for name, column in columns.items():
+        if name in store.COLUMNS:
+            getattr(store, name)[:store.count] = column
+    for row, rect in enumerate(store.rects):
+        rect.topleft = (int(store.x[row]), int(store.y[row]))
+    store.sync_grid()
+    store.remember_positions()
+
+    game.bosses = []
+    for boss_type, (x, y), fields in snapshot.bosses:
+        boss = Boss(x, y, game.clock, game.rng.bosses, boss_type, world)
+        for name, value in fields.items():
+            setattr(boss, name, value)
+        boss.rect.topleft = (int(boss.x), int(boss.y))
+        boss.remember_position()
+        game.bosses.append(boss)
+
+    # Projectiles : une case par projectile, dans l'ordre de tir, puis colonnes recopiées
+    engine = game.projectiles
+    engine.clear()
+    columns = snapshot.projectiles
+    for row in range(len(snapshot.trail)):
+        kind = int(columns["kind"][row])
+        slot = engine.add(PROJECTILE_CLASSES[kind], kind, 0.0, 0.0, 0.0, 0.0, 0, 0, 0.0).slot
+        for name, column in columns.items():
+            if name in PROJECTILE_COLUMNS:
+                getattr(engine, name)[slot] = column[row]
+        engine.trail[slot] = snapshot.trail[row]
+    engine.remember_positions()
+
+    game.chests = []
+    for (x, y, opened, loot_generated), contents in snapshot.chests:
+        chest = Chest(int(x), int(y))
+        chest.opened = opened
+        chest.loot_generated = loot_generated
+        chest.contents = contents
+        game.chests.append(chest)
+
+    menu = game.menu
+    menu.is_open, menu.showing_loot, menu.selected_slot = snapshot.menu
+    menu.new_loot = snapshot.new_loot
+
+    # Horloge et flux aléatoires en dernier : recréer les ennemis a tiré dans le flux des ennemis
+    game.seed = snapshot.seed
+    game.clock.ticks = snapshot.ticks
+    game.clock.now = snapshot.ticks * game.clock.dt
+    game.rng.seed = snapshot.seed
+    for name, state in snapshot.random_states:
+        getattr(game.rng, name).setstate(state)
+    game.particles.clear()
+    game.near_door = None
+    game.camera.follow_player(player, world)
+    game.camera.remember_position()
+
+
+def quicksave(game, path=QUICKSAVE_PATH):
+    start = time.perf_counter()
+    size = save_game(game, path)
+    log.info("Partie sauvegardée dans %s (%d octets, %.1f ms)", path, size, (time.perf_counter() - start) * 1000)
+
+
+def quickload(game, path=QUICKSAVE_PATH):
+    """Recharge la sauvegarde rapide ; retourne False (partie inchangée) si elle manque ou est illisible"""
+    start = time.perf_counter()
+    try:
+        load_game(game, path)
+    except FileNotFoundError:
+        log.warning("Aucune sauvegarde rapide (%s)", path)
+        return False
+    except (ValueError, struct.error, OSError) as error:
+        log.error("Chargement impossible, partie conservée : %s", error)
+        return False
+    log.info("Partie chargée depuis %s (%.1f ms)", path, (time.perf_counter() - start) * 1000)
+    return True
+
+
+def check_resume(save_ticks=(400, 401, 402, 403), after=302, seed=3):
+    """Sauvegarde puis recharge une partie immobile (toutes salles ouvertes, donc salles lointaines
+    à fréquence réduite) à chaque tick de `save_ticks` : la suite doit donner la même empreinte
+    que la partie jouée sans interruption. Retourne [(tick, identique)]"""
+    # Import tardif : headless force le pilote vidéo factice
+    from headless import create_game
+    from controls import ScriptedInput
+    from statehash import state_digest
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "check.tus")
+        for save_tick in save_ticks:
+            straight = create_game(ScriptedInput(()), seed)
+            for name in straight.world.rooms:
+                straight.world.unlock_room(name)
+            for _ in range(save_tick):
+                straight.step()
+            save_game(straight, path)
+            for _ in range(after):
+                straight.step()
+
+            resumed = create_game(ScriptedInput(()), seed)
+            load_game(resumed, path)
+            for _ in range(after):
+                resumed.step()
+            results.append((save_tick, state_digest(straight) == state_digest(resumed)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contenu d'une sauvegarde")
+    parser.add_argument("snapshot", nargs="?", help="fichier de sauvegarde")
+    parser.add_argument("--check", action="store_true",
+                        help="vérifier qu'une partie rechargée continue comme sans interruption")
+    args = parser.parse_args()
+    if args.check:
+        results = check_resume()
+        for save_tick, same in results:
+            print(f"sauvegarde au tick {save_tick} : {'identique' if same else 'DIVERGE'}")
+        raise SystemExit(0 if all(same for _, same in results) else 1)
+    if args.snapshot is None:
+        parser.error("fichier de sauvegarde manquant")
+
+    # Import tardif : headless force le pilote vidéo factice
+    from headless import create_game
+    from controls import ScriptedInput
+    game = create_game(ScriptedInput(()))
+    start = time.perf_counter()
+    load_game(game, args.snapshot)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{args.snapshot} : graine {game.seed}, tick {game.clock.ticks} ({game.clock.now:.0f} s), "
+          f"chargée en {elapsed:.1f} ms")
+    print(f"joueur : {game.player.hp:.0f}/{game.player.max_hp} HP en ({game.player.x:.1f}, {game.player.y:.1f}), "
+          f"ennemis vivants : {sum(1 for enemy in game.enemies if enemy.alive)}/{len(game.enemies)}, "
+          f"projectiles : {len(game.enemy_projectiles) + len(game.player_projectiles) + len(game.boss_projectiles)}")
+    for boss in game.bosses:
+        print(f"{boss.name} : {boss.hp}/{boss.max_hp} HP, phase {boss.phase}")
+    print("salles ouvertes : " + ", ".join(name for name, room in game.world.rooms.items() if room["unlocked"]))
+
+
+if __name__ == "__main__":
+    main()
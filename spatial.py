@@ -0,0 +1,81 @@
+# spatial.py - Grille de hachage spatial pour les requêtes de voisinage
+class SpatialHash:
+    """Grille uniforme : chaque cellule (cx, cy) contient les éléments dont la boîte
+    la recouvre. Une boîte recouvre toutes les cellules qu'elle touche, donc deux
+    boîtes qui se chevauchent partagent toujours au moins une cellule."""
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> set d'éléments
+        self.spans = {}  # élément -> (cx0, cy0, cx1, cy1) des cellules occupées
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, item):
+        return item in self.spans
+
+    def span(self, x, y, width, height):
+        """Cellules couvertes par les pixels [x, x+width) x [y, y+height)"""
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + width - 1) // size), int((y + height - 1) // size))
+
+    def insert(self, item, x, y, width, height):
+        span = self.span(x, y, width, height)
+        self.spans[item] = span
+        self.add_to_cells(item, span)
+
+    def remove(self, item):
+        span = self.spans.pop(item, None)
+        if span is not None:
+            self.remove_from_cells(item, span)
+
+    def move(self, item, x, y, width, height):
+        """Met à jour la boîte d'un élément ; ne touche aux cellules que s'il en change"""
+        span = self.span(x, y, width, height)
+        old_span = self.spans.get(item)
+        if span == old_span:
+            return
+        if old_span is not None:
+            self.remove_from_cells(item, old_span)
+        self.spans[item] = span
+        self.add_to_cells(item, span)
+
+    def query(self, x, y, width, height):
+        """Éléments dont une cellule recouvre la boîte (candidats à tester ensuite)"""
+        cx0, cy0, cx1, cy1 = self.span(x, y, width, height)
+        cells = self.cells
+        if cx0 == cx1 and cy0 == cy1:
+            return cells.get((cx0, cy0), ())
+        found = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found |= cell
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self.spans.clear()
+
+    def add_to_cells(self, item, span):
+        cx0, cy0, cx1, cy1 = span
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = {item}
+                else:
+                    cell.add(item)
+
+    def remove_from_cells(self, item, span):
+        cx0, cy0, cx1, cy1 = span
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = cells[(cx, cy)]
+                cell.discard(item)
+                if not cell:
+                    del cells[(cx, cy)]
@@ -0,0 +1,85 @@
+# statehash.py - Empreinte de l'état de la simulation, chaînée de point de contrôle en point de contrôle
+import hashlib
+import struct
+import numpy as np
+
+# Champs de jeu hachés ; les caches (grille spatiale, salle d'origine, cases libres,
+# traînées) en sont exclus : deux moteurs équivalents peuvent les ranger différemment
+ENEMY_FIELDS = ("x", "y", "hp", "max_hp", "kind", "alive", "aggressive", "patrol_dx", "patrol_dy",
+                "patrol_distance", "max_patrol_distance", "last_attack_time", "last_shoot_time",
+                "last_damage_time")
+PROJECTILE_FIELDS = ("x", "y", "vx", "vy", "width", "height", "kind", "style", "creation_time",
+                     "lifetime", "speed", "damage", "start_x", "start_y", "max_range", "homing")
+PLAYER_FIELDS = ("x", "y", "hp", "max_hp", "stamina", "max_stamina", "speed", "attack_damage",
+                 "attack_range", "alive", "is_dashing", "last_attack_time", "last_damage_time",
+                 "last_dash_time", "dash_start_time")
+BOSS_FIELDS = ("x", "y", "hp", "max_hp", "alive", "phase", "is_enraged", "target_x", "target_y",
+               "movement_timer", "last_attack_time", "last_special_time", "last_damage_time",
+               "last_teleport_time")
+
+
+def pack_fields(obj, fields):
+    """Champs scalaires d'un objet en float64 (attributs absents : NaN)"""
+    return struct.pack(f"<{len(fields)}d", *(float(getattr(obj, name, float("nan"))) for name in fields))
+
+
+def feed_state(digest, game):
+    """Ajoute l'état de la simulation de `game` à l'objet hashlib `digest`"""
+    digest.update(struct.pack("<q", game.clock.ticks))
+    digest.update(pack_fields(game.player, PLAYER_FIELDS))
+
+    store = game.enemy_store
+    for name in ENEMY_FIELDS:
+        digest.update(getattr(store, name)[:store.count].tobytes())
+
+    # Projectiles vivants dans l'ordre de tir, quelle que soit la case qu'ils occupent
+    engine = game.projectiles
+    rows = np.flatnonzero(engine.alive[:engine.count])
+    rows = rows[np.argsort(engine.serial[rows], kind="stable")]
+    for name in PROJECTILE_FIELDS:
+        digest.update(getattr(engine, name)[rows].tobytes())
+
+    for boss in game.bosses:
+        digest.update(boss.boss_type.encode())
+        digest.update(pack_fields(boss, BOSS_FIELDS))
+    digest.update(bytes(room["unlocked"] for room in game.world.rooms.values()))
+    for chest in game.chests:
+        digest.update(struct.pack("<dd?", chest.x, chest.y, chest.opened))
+        digest.update(str(getattr(chest.contents, "name", chest.contents)).encode())
+
+
+def state_digest(game):
+    """Empreinte de l'état courant seul (non chaînée)"""
+    digest = hashlib.blake2b(digest_size=16)
+    feed_state(digest, game)
+    return digest.hexdigest()
+
+
+class StateHasher:
+    """Empreinte blake2b de l'état toutes les `every` ticks, chaînée avec la précédente :
+    deux parties ont la même empreinte au tick N seulement si leurs états ont coïncidé à
+    chaque point de contrôle jusqu'à N. Sert à vérifier qu'un moteur optimisé (IA
+    vectorisée, pool de projectiles) reproduit exactement le chemin de référence."""
+    def __init__(self, every=60):
+        self.every = every
+        self.chain = bytes(16)
+        self.history = []  # (tick, empreinte hexadécimale)
+
+    def update(self, game):
+        """À appeler après chaque tick ; retourne l'empreinte aux points de contrôle, sinon None"""
+        tick = game.clock.ticks
+        if tick % self.every:
+            return None
+        digest = hashlib.blake2b(self.chain, digest_size=16)
+        feed_state(digest, game)
+        self.chain = digest.digest()
+        self.history.append((tick, digest.hexdigest()))
+        return self.history[-1][1]
+
+
+def first_divergence(history, other):
+    """Premier point de contrôle où deux historiques diffèrent : (tick, a, b), ou None"""
+    for (tick, a), (other_tick, b) in zip(history, other):
+        if tick != other_tick or a != b:
+            return tick, a, b
+    return None
@@ -0,0 +1,60 @@
+# timing.py - Horloge de simulation, pas fixe et interpolation du rendu
+import math
+
+FIXED_DT = 1 / 60  # Durée d'un tick de simulation (secondes)
+NEVER = -math.inf  # Date d'un événement qui n'a jamais eu lieu : tout délai depuis est écoulé
+
+
+def lerp(previous, current, alpha):
+    """Position affichée entre l'état du tick précédent et celui du tick courant"""
+    return previous + (current - previous) * alpha
+
+
+class FixedTimestep:
+    """Accumulateur : le temps réel écoulé est converti en un nombre entier de ticks.
+    Sur une machine lente, plusieurs ticks sont joués par image (au plus `max_steps`,
+    le retard au-delà est abandonné pour ne pas s'enliser) ; sur une machine rapide,
+    certaines images n'ont aucun tick et sont interpolées avec `alpha`."""
+    def __init__(self, dt=FIXED_DT, max_steps=5):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_time = 0.0  # Temps abandonné quand la simulation n'arrive pas à suivre
+
+    def advance(self, frame_time):
+        """Ajoute le temps réel d'une image ; retourne le nombre de ticks à simuler"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            self.accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction du tick suivant déjà écoulée, dans [0, 1)"""
+        return self.accumulator / self.dt
+
+
+class SimClock:
+    """Temps de simulation en secondes, avancé d'un pas fixe à chaque tick.
+    Remplace time.time() pour les délais, durées de vie et effets : la partie se
+    déroule pareil quelle que soit la vitesse réelle (ralentissements, avance rapide).
+    Chaque Game a la sienne et la passe aux sous-systèmes qui lisent l'heure."""
+    def __init__(self, dt=FIXED_DT):
+        self.dt = dt
+        self.ticks = 0
+        self.now = 0.0
+
+    def tick(self):
+        """Avance d'un tick (calculé depuis le nombre de ticks : pas de dérive par cumul)"""
+        self.ticks += 1
+        self.now = self.ticks * self.dt
+
+    def reset(self):
+        self.ticks = 0
+        self.now = 0.0
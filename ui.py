@@ -1,9 +1,9 @@
 import pygame
-import time
 import math
 
 class UI:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, clock):
+        self.clock = clock  # Horloge de simulation (clignotements)
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.font = pygame.font.Font(None, 24)
@@ -89,7 +89,9 @@ class UI:
             "ZQSD or KEYS: Move",
             "Shift: Sprint", 
             "Space: Attack",
-            "I: Inventaire"
+            "I: Inventaire",
+            "F3: Profiler",
+            "F5/F9: Save/Load"
         ]
         
         for i, control in enumerate(controls):
@@ -98,7 +100,7 @@ class UI:
     
     def draw_boss_status(self, screen, bosses, player):
         """Affiche le statut des boss vivants en style Elden Ring (en bas de l'écran)"""
-        current_time = time.time()
+        current_time = self.clock.now
         boss_count = 0
         
         for boss in bosses:
@@ -1,152 +1,360 @@
-# world.py - Couloir right→boss corrigé pour hitbox plus précise
+# world.py - Monde chargé depuis un niveau compilé (voir level.py)
 import pygame
 import random
+import math
+import numpy as np
+
+from level import load_level
+from eventlog import get_logger
+
+log = get_logger("world")
 
 class World:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.tile_size = 32
-        self.map = [[0 for _ in range(width)] for _ in range(height)]
-        
-        # Système de salles avec coordonnées CORRIGÉES pour connectivité
-        self.rooms = {
-            "spawn": {"x": 5, "y": 5, "w": 15, "h": 12, "unlocked": True},
-            "room1": {"x": 22, "y": 8, "w": 20, "h": 18, "unlocked": False},
-            "room2": {"x": 45, "y": 5, "w": 18, "h": 15, "unlocked": False},
-            "central": {"x": 15, "y": 30, "w": 25, "h": 20, "unlocked": False},
-            "right": {"x": 42, "y": 25, "w": 20, "h": 15, "unlocked": False},
-            "big": {"x": 65, "y": 20, "w": 25, "h": 25, "unlocked": False},
-            "bottom": {"x": 10, "y": 55, "w": 20, "h": 15, "unlocked": False},
-            "boss": {"x": 40, "y": 50, "w": 30, "h": 20, "unlocked": False},
-            "secret": {"x": 72, "y": 50, "w": 20, "h": 20, "unlocked": False}
-        }
-        
-        # Portes CORRIGÉES avec couloir right→boss plus précis
-        self.doors = [
-            {"from": "spawn", "to": "room1", "corridor": (20, 11, 2, 3)},
-            {"from": "room1", "to": "room2", "corridor": (42, 14, 3, 2)},
-            {"from": "room1", "to": "central", "corridor": (32, 26, 2, 4)},
-            {"from": "central", "to": "right", "corridor": (40, 37, 2, 3)},
-            {"from": "right", "to": "big", "corridor": (62, 32, 3, 2)},
-            {"from": "central", "to": "bottom", "corridor": (27, 50, 2, 5)},
-            {"from": "right", "to": "boss", "corridor": (52, 40, 2, 10)},  # CORRIGÉ: couloir plus court, porte plus proche
-            {"from": "boss", "to": "secret", "corridor": (70, 60, 2, 2)}
-        ]
+    def __init__(self, level=None):
+        # Le niveau (salles, portes, tuiles de base) vient d'un fichier compilé
+        self.level = level if level is not None else load_level()
+        self.width = self.level.width
+        self.height = self.level.height
+        self.tile_size = self.level.tile_size
+        
+        # Grille compacte : 0 = sol, 1 = mur (indexée map[y, x])
+        self.map = np.zeros((self.height, self.width), dtype=np.uint8)
+        # Vue à plat partagée avec self.map, pour les requêtes unitaires rapides
+        self.tiles = memoryview(self.map).cast("B")
+        
+        # Cache de rendu : les murs sont pré-rendus par blocs de tuiles
+        self.chunk_tiles = 16
+        self.wall_color = (100, 100, 100)
+        self.floor_color = (30, 30, 30)
+        self.tile_chunks = {}
+        self.overlay_surfaces = {}
+        self.door_font = None
+        
+        # Abonnés aux modifications de tuiles : appelés avec la liste des tuiles changées
+        self.tile_listeners = []
+        self.tile_version = 0
+        
+        # Salles et portes : copies modifiables des tables du niveau
+        self.rooms = self.level.create_rooms()
+        self.doors = self.level.create_doors()
+        
+        # Tables de correspondance tuile → salle et tuile → couloir de porte (-1 = aucun)
+        self.room_names = list(self.rooms)
+        self.room_grid = np.full((self.height, self.width), -1, dtype=np.int16)
+        self.door_grid = np.full((self.height, self.width), -1, dtype=np.int16)
+        self.room_cells = memoryview(self.room_grid).cast("B").cast("h")
+        self.door_cells = memoryview(self.door_grid).cast("B").cast("h")
+        # Rectangle (x0, y0, x1, y1) en tuiles de chaque salle, dans l'ordre de room_names
+        self.room_bounds = np.zeros((len(self.room_names), 4), dtype=np.int32)
+        self.build_lookup_tables()
         
         self.generate_world()
     
-    def generate_world(self):
-        # Créer le terrain plein de murs
-        for x in range(self.width):
-            for y in range(self.height):
-                self.map[y][x] = 1
-        
-        # Créer toutes les salles
-        for room_name, room_data in self.rooms.items():
-            self.create_open_room(room_data["x"], room_data["y"], 
-                                room_data["w"], room_data["h"])
+    def build_lookup_tables(self):
+        """Remplit les grilles salle/couloir ; en cas de chevauchement, le premier déclaré l'emporte"""
+        self.room_grid.fill(-1)
+        for index in reversed(range(len(self.room_names))):
+            room_data = self.rooms[self.room_names[index]]
+            area = self.tile_area(room_data["x"], room_data["y"], room_data["w"], room_data["h"])
+            self.room_grid[area] = index
+            self.room_bounds[index] = (room_data["x"], room_data["y"],
+                                       room_data["x"] + room_data["w"], room_data["y"] + room_data["h"])
         
-        # TOUJOURS créer le couloir spawn → room1 (ouvert dès le début)
-        self.create_corridor(20, 11, 2, 3)
+        self.door_grid.fill(-1)
+        for index in reversed(range(len(self.doors))):
+            corridor = self.doors[index]["corridor"]
+            self.door_grid[self.tile_area(*corridor)] = index
+    
+    def generate_world(self):
+        # Tuiles de base du niveau : salles creusées, piliers posés, couloirs murés
+        # (copie dans la grille existante pour garder les vues à plat valides)
+        self.map[...] = self.level.tiles
         
-        # Créer les autres couloirs selon les salles déverrouillées
+        # Tous les couloirs sont murés : les portes partent fermées, puis
+        # update_doors ouvre celles des salles déverrouillées (et spawn → room1)
+        for door in self.doors:
+            door["open"] = False
         self.update_doors()
-        self.add_obstacles()
-    
-    def create_open_room(self, start_x, start_y, width, height):
-        for x in range(start_x, start_x + width):
-            for y in range(start_y, start_y + height):
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.map[y][x] = 0
+        
+        # La carte a été entièrement régénérée : vider le cache de rendu
+        self.tile_chunks.clear()
     
-    def create_corridor(self, start_x, start_y, width, height):
-        for x in range(start_x, start_x + width):
-            for y in range(start_y, start_y + height):
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.map[y][x] = 0
+    def tile_area(self, start_x, start_y, width, height):
+        """Convertit une zone de tuiles en tranches de la grille, rognées aux bords de la carte"""
+        x0 = max(0, start_x)
+        y0 = max(0, start_y)
+        x1 = max(x0, min(self.width, start_x + width))
+        y1 = max(y0, min(self.height, start_y + height))
+        return slice(y0, y1), slice(x0, x1)
     
     def update_doors(self):
-        """Ouvre ou ferme les portes selon les salles déverrouillées"""
+        """Ouvre ou ferme les portes dont l'état a changé.
+        Retourne le diff minimal : la liste des tuiles (x, y) réellement modifiées."""
+        changes = []
         for door in self.doors:
-            # Skip le couloir spawn → room1 (géré dans generate_world)
-            if door["from"] == "spawn" and door["to"] == "room1":
-                continue
-            
             from_room = self.rooms[door["from"]]
             to_room = self.rooms[door["to"]]
-            corridor = door["corridor"]
             
             # Ouvrir le couloir si AU MOINS UNE des salles est déverrouillée
-            if from_room["unlocked"] or to_room["unlocked"]:
-                self.create_corridor(corridor[0], corridor[1], corridor[2], corridor[3])
+            # (le couloir spawn → room1 est toujours ouvert)
+            should_open = (door.get("always_open", False) or
+                           from_room["unlocked"] or to_room["unlocked"])
+            if should_open == door["open"]:
+                continue  # Porte inchangée : aucune tuile à réécrire
+            
+            door["open"] = should_open
+            changes.extend(self.set_tiles(*door["corridor"], 0 if should_open else 1))
+        
+        if changes:
+            self.apply_tile_changes(changes)
+        return changes
+    
+    def set_tiles(self, start_x, start_y, width, height, tile):
+        """Remplit une zone de tuiles et retourne les tuiles (x, y) dont la valeur a changé"""
+        area = self.tile_area(start_x, start_y, width, height)
+        region = self.map[area]
+        changed = np.argwhere(region != tile)
+        if len(changed) == 0:
+            return []
+        
+        region[...] = tile
+        origin_y, origin_x = area[0].start, area[1].start
+        return [(origin_x + x, origin_y + y) for y, x in changed.tolist()]
+    
+    def apply_tile_changes(self, changes):
+        """Propage un diff de tuiles : blocs de rendu concernés et abonnés (grilles dérivées, minimap...)"""
+        for x, y in changes:
+            self.tile_chunks.pop((x // self.chunk_tiles, y // self.chunk_tiles), None)
+        
+        self.tile_version += 1
+        for listener in self.tile_listeners:
+            listener(changes)
+    
+    def get_tile_chunk(self, cx, cy):
+        """Retourne la surface pré-rendue d'un bloc de tuiles (construite au besoin)"""
+        chunk = self.tile_chunks.get((cx, cy))
+        if chunk is not None:
+            return chunk
+        
+        start_x = cx * self.chunk_tiles
+        start_y = cy * self.chunk_tiles
+        end_x = min(self.width, start_x + self.chunk_tiles)
+        end_y = min(self.height, start_y + self.chunk_tiles)
+        
+        chunk = pygame.Surface(((end_x - start_x) * self.tile_size,
+                                (end_y - start_y) * self.tile_size))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        chunk.fill(self.floor_color)
+        
+        walls = np.argwhere(self.map[start_y:end_y, start_x:end_x] == 1)
+        for y, x in walls.tolist():
+            chunk.fill(self.wall_color,
+                       (x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size))
+        
+        self.tile_chunks[(cx, cy)] = chunk
+        return chunk
+    
+    def rect_hits_wall(self, x, y, width, height):
+        """Vrai si la boîte (bords droit et bas inclus) recouvre au moins une tuile de mur.
+        Hors de la carte, rien n'est solide."""
+        size = self.tile_size
+        x0 = int(x // size)
+        y0 = int(y // size)
+        x1 = int((x + width) // size)
+        y1 = int((y + height) // size)
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 >= self.width:
+            x1 = self.width - 1
+        if y1 >= self.height:
+            y1 = self.height - 1
+        
+        tiles = self.tiles
+        stride = self.width
+        for grid_y in range(y0, y1 + 1):
+            row = grid_y * stride
+            for grid_x in range(x0, x1 + 1):
+                if tiles[row + grid_x]:
+                    return True
+        return False
+    
+    def first_wall(self, x0, y0, x1, y1):
+        """Première tuile de mur (grid_x, grid_y) dans le rectangle de tuiles [x0..x1] x [y0..y1], ou None"""
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self.width - 1)
+        y1 = min(y1, self.height - 1)
+        tiles = self.tiles
+        stride = self.width
+        for grid_y in range(y0, y1 + 1):
+            row = grid_y * stride
+            for grid_x in range(x0, x1 + 1):
+                if tiles[row + grid_x]:
+                    return grid_x, grid_y
+        return None
+    
+    def sweep_box(self, x, y, width, height, dx, dy):
+        """Balayage de la boîte (mêmes règles que rect_hits_wall) le long de (dx, dy).
+        Parcours DDA : on ne teste que la colonne ou la ligne de tuiles qui entre sous
+        le bord avant de la boîte, dans l'ordre où elles sont franchies.
+        Retourne (t, (grid_x, grid_y)) pour le premier mur touché, t dans [0, 1], ou None."""
+        size = self.tile_size
+        col0 = int(x // size)
+        row0 = int(y // size)
+        col1 = int((x + width) // size)
+        row1 = int((y + height) // size)
+        cell = self.first_wall(col0, row0, col1, row1)
+        if cell is not None:
+            return 0.0, cell
+    
+        # Temps du prochain franchissement de colonne / ligne par le bord avant, et pas entre deux
+        if dx > 0:
+            col = col1
+            next_x = ((col + 1) * size - x - width) / dx
+            delta_x = size / dx
+        elif dx < 0:
+            col = col0
+            next_x = (col * size - x) / dx
+            delta_x = -size / dx
+        else:
+            col = col0
+            next_x = delta_x = math.inf
+        if dy > 0:
+            row = row1
+            next_y = ((row + 1) * size - y - height) / dy
+            delta_y = size / dy
+        elif dy < 0:
+            row = row0
+            next_y = (row * size - y) / dy
+            delta_y = -size / dy
+        else:
+            row = row0
+            next_y = delta_y = math.inf
+    
+        while True:
+            if next_x <= next_y:
+                t = next_x
+                if t > 1.0:
+                    return None
+                col += 1 if dx > 0 else -1
+                # Lignes couvertes à cet instant (la ligne avant déjà entrée est incluse)
+                top = y + dy * t
+                if dy > 0:
+                    cell = self.first_wall(col, int(top // size), col, row)
+                elif dy < 0:
+                    cell = self.first_wall(col, row, col, int((top + height) // size))
+                else:
+                    cell = self.first_wall(col, row0, col, row1)
+                next_x += delta_x
             else:
-                # Fermer le couloir (remettre des murs)
-                for x in range(corridor[0], corridor[0] + corridor[2]):
-                    for y in range(corridor[1], corridor[1] + corridor[3]):
-                        if 0 <= x < self.width and 0 <= y < self.height:
-                            self.map[y][x] = 1
+                t = next_y
+                if t > 1.0:
+                    return None
+                row += 1 if dy > 0 else -1
+                left = x + dx * t
+                if dx > 0:
+                    cell = self.first_wall(int(left // size), row, col, row)
+                elif dx < 0:
+                    cell = self.first_wall(col, row, int((left + width) // size), row)
+                else:
+                    cell = self.first_wall(col0, row, col1, row)
+                next_y += delta_y
+            if cell is not None:
+                return t, cell
+    
+    def points_hit_wall(self, xs, ys):
+        """Masque booléen des positions (tableaux en pixels) qui tombent dans un mur"""
+        grid_x = np.floor_divide(xs, self.tile_size).astype(np.intp)
+        grid_y = np.floor_divide(ys, self.tile_size).astype(np.intp)
+        inside = (grid_x >= 0) & (grid_x < self.width) & (grid_y >= 0) & (grid_y < self.height)
+        tiles = self.map[np.clip(grid_y, 0, self.height - 1), np.clip(grid_x, 0, self.width - 1)]
+        return (tiles == 1) & inside
+    
+    def rects_hit_wall(self, xs, ys, widths, heights):
+        """Version vectorisée de rect_hits_wall pour N boîtes en un seul appel.
+        Les coins sont testés, plus des points intermédiaires espacés d'une tuile
+        pour les boîtes plus grandes qu'une tuile."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        widths = np.broadcast_to(np.asarray(widths, dtype=np.float64), xs.shape)
+        heights = np.broadcast_to(np.asarray(heights, dtype=np.float64), xs.shape)
+        hit = np.zeros(xs.shape, dtype=bool)
+        if xs.size == 0:
+            return hit
+        
+        steps_x = max(1, int(np.ceil(widths.max() / self.tile_size)))
+        steps_y = max(1, int(np.ceil(heights.max() / self.tile_size)))
+        for i in range(steps_x + 1):
+            px = xs + widths * (i / steps_x)
+            for j in range(steps_y + 1):
+                hit |= self.points_hit_wall(px, ys + heights * (j / steps_y))
+        return hit
     
     def unlock_room(self, room_name):
-        """Déverrouille une salle et met à jour les portes"""
+        """Déverrouille une salle et met à jour les portes (retourne les tuiles modifiées)"""
         if room_name in self.rooms:
-            print(f"Salle {room_name} déverrouillée !")
+            log.info("Salle %s déverrouillée !", room_name)
             self.rooms[room_name]["unlocked"] = True
-            self.update_doors()
+            return self.update_doors()
+        return []
+    
+    def get_room_index(self, x, y):
+        """Indice de la salle sous une position en pixels (-1 si aucune)"""
+        tile_x = int(x // self.tile_size)
+        tile_y = int(y // self.tile_size)
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.room_cells[tile_y * self.width + tile_x]
+        return -1
     
     def get_player_room(self, player_x, player_y):
         """Retourne le nom de la salle où se trouve le joueur"""
-        player_tile_x = int(player_x // self.tile_size)
-        player_tile_y = int(player_y // self.tile_size)
-        
-        for room_name, room_data in self.rooms.items():
-            if (room_data["x"] <= player_tile_x < room_data["x"] + room_data["w"] and
-                room_data["y"] <= player_tile_y < room_data["y"] + room_data["h"]):
-                return room_name
+        index = self.get_room_index(player_x, player_y)
+        return self.room_names[index] if index >= 0 else None
+    
+    def get_door_at(self, x, y):
+        """Retourne la porte dont le couloir contient la position (None si aucune)"""
+        tile_x = int(x // self.tile_size)
+        tile_y = int(y // self.tile_size)
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            index = self.door_cells[tile_y * self.width + tile_x]
+            if index >= 0:
+                return self.doors[index]
         return None
     
+    def room_indices_at(self, xs, ys):
+        """Version vectorisée de get_room_index pour des tableaux de positions"""
+        tile_x = np.floor_divide(xs, self.tile_size).astype(np.intp)
+        tile_y = np.floor_divide(ys, self.tile_size).astype(np.intp)
+        inside = (tile_x >= 0) & (tile_x < self.width) & (tile_y >= 0) & (tile_y < self.height)
+        rooms = self.room_grid[np.clip(tile_y, 0, self.height - 1), np.clip(tile_x, 0, self.width - 1)]
+        return np.where(inside, rooms, -1)
+    
     def is_door_locked(self, player_x, player_y):
         """NOUVEAU: Vérifie si le joueur est dans un couloir de porte fermée"""
-        player_tile_x = int(player_x // self.tile_size)
-        player_tile_y = int(player_y // self.tile_size)
+        door = self.get_door_at(player_x, player_y)
+        if door is None:
+            return False
         
-        for door in self.doors:
-            corridor = door["corridor"]
-            
-            # Vérifier si le joueur est dans ce couloir
-            if (corridor[0] <= player_tile_x < corridor[0] + corridor[2] and
-                corridor[1] <= player_tile_y < corridor[1] + corridor[3]):
-                
-                from_room = self.rooms[door["from"]]
-                to_room = self.rooms[door["to"]]
-                
-                # Si AUCUNE des deux salles n'est déverrouillée, bloquer
-                if not from_room["unlocked"] and not to_room["unlocked"]:
-                    return True
-        
-        return False
-    
-    def add_obstacles(self):
-        # Piliers dans la grande salle (ajustés pour nouvelle position)
-        obstacles = [(72, 25), (80, 25), (72, 35), (80, 35)]
-        for x, y in obstacles:
-            if 0 <= x < self.width and 0 <= y < self.height:
-                self.map[y][x] = 1
+        # Si AUCUNE des deux salles n'est déverrouillée, bloquer
+        return not self.rooms[door["from"]]["unlocked"] and not self.rooms[door["to"]]["unlocked"]
     
     def draw_world(self, screen, camera):
-        start_x = max(0, int(camera.x // self.tile_size))
-        end_x = min(self.width, int((camera.x + screen.get_width()) // self.tile_size + 1))
-        start_y = max(0, int(camera.y // self.tile_size))
-        end_y = min(self.height, int((camera.y + screen.get_height()) // self.tile_size + 1))
-        
-        # Dessiner les murs
-        for x in range(start_x, end_x):
-            for y in range(start_y, end_y):
-                if self.map[y][x] == 1:
-                    screen_x = x * self.tile_size - camera.x
-                    screen_y = y * self.tile_size - camera.y
-                    pygame.draw.rect(screen, (100, 100, 100), 
-                                (screen_x, screen_y, self.tile_size, self.tile_size))
+        chunk_size = self.chunk_tiles * self.tile_size
+        chunks_x = (self.width + self.chunk_tiles - 1) // self.chunk_tiles
+        chunks_y = (self.height + self.chunk_tiles - 1) // self.chunk_tiles
+        start_cx = max(0, int(camera.x // chunk_size))
+        end_cx = min(chunks_x, int((camera.x + screen.get_width()) // chunk_size + 1))
+        start_cy = max(0, int(camera.y // chunk_size))
+        end_cy = min(chunks_y, int((camera.y + screen.get_height()) // chunk_size + 1))
+        
+        # Dessiner les murs : un blit par bloc visible au lieu d'un rect par tuile
+        for cx in range(start_cx, end_cx):
+            for cy in range(start_cy, end_cy):
+                screen.blit(self.get_tile_chunk(cx, cy),
+                            (cx * chunk_size - camera.x, cy * chunk_size - camera.y))
         
         # Dessiner les portes
         self.draw_doors(screen, camera)
@@ -219,8 +427,9 @@ class World:
             
             # Debug: afficher le statut (optionnel - à retirer en prod)
             if abs(screen_x) < 1200 and abs(screen_y) < 800:  # Seulement si visible
-                font = pygame.font.Font(None, 16)
-                status_text = font.render(f"{door['from']}→{door['to']}", True, (255, 255, 255))
+                if self.door_font is None:
+                    self.door_font = pygame.font.Font(None, 16)
+                status_text = self.door_font.render(f"{door['from']}→{door['to']}", True, (255, 255, 255))
                 screen.blit(status_text, (screen_x - 30, screen_y + 25))
     
     def draw_locked_overlay(self, screen, camera):
@@ -237,8 +446,11 @@ class World:
                 screen_x = room_pixel_x - camera.x
                 screen_y = room_pixel_y - camera.y
                 
-                # Dessiner le voile noir semi-transparent
-                overlay_surface = pygame.Surface((room_pixel_w, room_pixel_h))
-                overlay_surface.fill((0, 0, 0))
-                overlay_surface.set_alpha(180)
+                # Dessiner le voile noir semi-transparent (surface réutilisée d'une frame à l'autre)
+                overlay_surface = self.overlay_surfaces.get(room_name)
+                if overlay_surface is None:
+                    overlay_surface = pygame.Surface((room_pixel_w, room_pixel_h))
+                    overlay_surface.fill((0, 0, 0))
+                    overlay_surface.set_alpha(180)
+                    self.overlay_surfaces[room_name] = overlay_surface
                 screen.blit(overlay_surface, (screen_x, screen_y))
\ No newline at end of file